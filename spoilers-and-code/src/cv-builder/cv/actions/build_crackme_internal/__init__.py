@@ -31,6 +31,12 @@ class BuildCrackmeInternalAction(CvActionBase):
             help="The password that should unlock the flag for the ELF binary" )
         argument_parser.add_argument('-f', '--flag', type=str, required=True,
             help="The flag that is released with the correct password." )
+        argument_parser.add_argument('--mt64', action="store_true",
+            help="Mask hidden strings with the 64-bit (MT19937-64) generator." )
+        argument_parser.add_argument('--wordwise-integrity', action="store_true",
+            help="Hash the binary for integrity checks eight bytes at a time rather than a byte at a time." )
+        argument_parser.add_argument('--annotation-table', action="store_true",
+            help="Record patch annotations in a single annotation table section rather than a section each." )
 
     ## Invokes this action on the provided configuration..
     #  This action replaces strings in the target document.
@@ -42,7 +48,8 @@ class BuildCrackmeInternalAction(CvActionBase):
         self.log.info(f"Building the internal crackme binary at '{self.arguments.out_file}'.")
         
         try:
-            build_step = BuildCrackmeInternal(self.arguments.password, self.arguments.flag, self.arguments.out_file)
+            build_step = BuildCrackmeInternal(self.arguments.password, self.arguments.flag, self.arguments.out_file, self.arguments.mt64, self.arguments.wordwise_integrity,
+                self.arguments.annotation_table)
             if not build_step(): raise RuntimeError(f"Failed to build internal crackme; exit code - {build_step.exit_code}")
             self.log.info(f"Finished building internal crackme binary at '{self.arguments.out_file}'.")       
 
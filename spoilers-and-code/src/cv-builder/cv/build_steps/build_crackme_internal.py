@@ -25,10 +25,17 @@ class BuildCrackmeInternal(BuildStep):
     #  @param password the password that the user is expected to enter to unlock the flag.
     #  @param flag the flag that the user should be rewarded with for the correct password.
     #  @param build_output the location to place the partial build binary.
-    def __init__(self, password:str, flag:str, build_output:Path=DefaultOutputPath):
+    #  @param mt64 mask hidden strings with the 64-bit (MT19937-64) generator rather than MT19937.
+    #  @param wordwise_integrity hash the binary for integrity checks eight bytes at a time rather than a byte at a time.
+    #  @param annotation_table record patch annotations in a single annotation table section rather than a section each.
+    def __init__(self, password:str, flag:str, build_output:Path=DefaultOutputPath, mt64:bool=False, wordwise_integrity:bool=False,
+            annotation_table:bool=False):
         self.build_output = Path(build_output).resolve()
         self.password = password
         self.flag = flag
+        self.mt64 = mt64
+        self.wordwise_integrity = wordwise_integrity
+        self.annotation_table = annotation_table
 
     ## Gets the patcher manifest path for the binary we are building.
     #  Dubious who should have responsibility for nuking the old manifest - but this is the start action of most build processes so seems a good spot.
@@ -44,8 +51,7 @@ class BuildCrackmeInternal(BuildStep):
     #  @returns the environment that was configured.
     def build_environment(self) -> Environment:
 
-        password = HiddenString(self.password)
-        flag = HiddenString(self.flag)
+        password, flag = HiddenString.batch([ self.password, self.flag ], mt64=self.mt64)
 
         return Environment(
             
@@ -69,6 +75,18 @@ class BuildCrackmeInternal(BuildStep):
             # to generate the CLI requested flag.
             FLAG_RAW_VALUE = E.GccString(flag.raw),
 
+            # C definition passed into GCC via -D argument in build.sh, selects the 64-bit generator used to
+            # unmask hidden strings (must match the generator the masks above were made with).
+            HIDDEN_STRING_MT64 = "1" if self.mt64 else "",
+
+            # C definition passed into GCC via -D argument in build.sh, selects the wordwise integrity hash; the
+            # hash-patch tool reads the choice back out of the generators annotation.
+            INTEGRITY_HASH_WORDS = "1" if self.wordwise_integrity else "",
+
+            # C definition passed into GCC via -D argument in build.sh, places the annotations the patch tools read
+            # in a single `.annotation-table` section; the patch tools look for this section before any others.
+            ANNOTATION_TABLE = "1" if self.annotation_table else "",
+
             # The location of where to build the binary.
             ELF_BUILD_DIRECTORY = E.FileDirectory(self.build_output),
 
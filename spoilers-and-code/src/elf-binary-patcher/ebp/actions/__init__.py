@@ -6,9 +6,8 @@ from .generate_mt_sequence import GenerateMtSequenceAction
 from .generate_hidden_string import GenerateHiddenStringAction
 from .write_payload_header import WritePayloadHeaderAction
 from .strip_binary import StringBinaryAction
-
-# third-party imports
-from pwnlib.elf import ELF
+from .verify_integrity import VerifyIntegrityAction
+from ebp.common.patch_process import Elf
 
 ## A list of actions this tool can perform.
 available_actions = [
@@ -17,19 +16,30 @@ available_actions = [
     PatchProtectedStringsAction,
     HashPatchAction,
     WritePayloadHeaderAction,
-    StringBinaryAction
+    StringBinaryAction,
+    VerifyIntegrityAction
 ]
 
 
 ## Gets a list of regions in the binary that various actions are identifying as volatile
 #  Volatile regions are likely to change; it is also a good idea to ignore data that contains NOP's (0x90).
+#  The regions are cached on the ELF, and only derived again once a write touches an annotation or a volatile region.
 #  @param elf the ELF binary to query for volatile regions.
 #  @returns a list of volatile regions in the binary.
-def get_volatile_regions(elf:ELF) -> VolatileLocationList:
+def get_volatile_regions(elf:Elf) -> VolatileLocationList:
     from .base import InOutPatchActionBase
+
+    if elf.volatile_regions_cache is not None:
+        return elf.volatile_regions_cache
+
     volatile_regions = VolatileLocationList()
+    annotation_regions = VolatileLocationList()
     for cls in available_actions:
         if issubclass(cls, InOutPatchActionBase):
             action_specific_volatility = cls.volatile_locations(elf)
             volatile_regions.extend(action_specific_volatility)
+            annotation_regions.extend(cls.annotation_locations(elf))
+
+    sources = [ (region.start, region.end) for region in (*volatile_regions, *annotation_regions) ]
+    elf.cache_volatile_regions(volatile_regions, sources)
     return volatile_regions
\ No newline at end of file
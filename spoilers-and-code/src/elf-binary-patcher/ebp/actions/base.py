@@ -3,11 +3,12 @@
 from abc import ABC, abstractmethod, abstractproperty, abstractclassmethod
 from argparse import ArgumentParser, Namespace, ArgumentTypeError
 from logging import getLogger
-from typing import TypeVar
+from typing import Iterable, Iterator, TypeVar
 from pathlib import Path
 
 # project imports
 from ebp.common.patch_process import Elf
+from ebp.common.interval_index import IntervalIndex
 
 
 ## The @ref VolatileLocation `Self` type
@@ -47,16 +48,50 @@ class VolatileLocation(object):
 VolatileLocationListType = TypeVar('VolatileLocationListType', bound='VolatileLocationList')
 
 
-## Represents a part of the binary that is likely to "change its form"
-class VolatileLocationList(list[VolatileLocation]):
+## A list of the parts of the binary that are likely to "change their form".
+#  Queries are answered by an @ref IntervalIndex of the locations, which is kept up to date as locations are added.
+class VolatileLocationList(object):
+
+    ## Creates a new instance of the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param locations the initial volatile locations to hold.
+    def __init__(self, locations:Iterable[VolatileLocation]=()) -> VolatileLocationListType:
+        self._locations = []
+        self.index = IntervalIndex()
+        self.extend(locations)
+
+    ## Adds a volatile location to the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param location the volatile location to add.
+    def append(self, location:VolatileLocation) -> None:
+        self._locations.append(location)
+        self.index.add(location.start, location.end)
+
+    ## Adds a number of volatile locations to the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param locations the volatile locations to add.
+    def extend(self, locations:Iterable[VolatileLocation]) -> None:
+        for location in locations:
+            self.append(location)
 
     ## Determine if the query range falls into any of the volatile ranges.
     #  @param self the instance of the object that is invoking this method.
     #  @param length the size of the query range (used so we can default it easily).
     #  @returns True if there is any overlap between regions else False.
     def contains(self, start:int, length:int=1) -> bool:
-        result = any( vl.contains(start, length) for vl in self )
-        return result
+        return self.index.overlaps(start, start + length)
+
+    ## Gets the number of volatile locations in the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the number of volatile locations in the list.
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    ## Gets the volatile locations in the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns an iterator of the volatile locations, in the order they were added.
+    def __iter__(self) -> Iterator[VolatileLocation]:
+        return iter(self._locations)
 
     def __str__(self):
         entry_string = lambda index_vl_t: f"- #{index_vl_t[0]} {index_vl_t[1]}"
@@ -119,6 +154,15 @@ class InPatchActionBase(ActionBase):
     #  @returns the parsed ELF file.
     @staticmethod
     def ElfType(value:str) -> Elf:
+        elf_path = InPatchActionBase.ElfPathType(value)
+        return Elf(elf_path, checksec=False)
+
+
+    ## Converts an argument into the path of an ELF, without loading it.
+    #  @param value the value that was recieved from the command line.
+    #  @returns the path to the ELF file.
+    @staticmethod
+    def ElfPathType(value:str) -> Path:
         
         elf_path = Path(value)
 
@@ -130,7 +174,7 @@ class InPatchActionBase(ActionBase):
             error_message = f'Path is not a file: {elf_path}'
             raise ArgumentTypeError(error_message)
     
-        return Elf(elf_path, checksec=False)
+        return elf_path
 
 
     ## Gets the ELF binary currently being worked on.
@@ -172,4 +216,14 @@ class InOutPatchActionBase(InPatchActionBase):
     #  @returns a list of volatile regions in the binary.
     @abstractclassmethod
     def volatile_locations(cls, elf:Elf) -> VolatileLocationList:
-        pass
\ No newline at end of file
+        pass
+
+
+    ## Returns a list of the locations of the annotations this action reads from the binary.
+    #  The volatile locations are derived from these; a write to them discards the volatile regions cached on the ELF.
+    #  @param cls the type of class invoking this method.
+    #  @param elf the elf to locate annotations in.
+    #  @returns a list of the regions in the binary that hold this actions annotations.
+    @classmethod
+    def annotation_locations(cls, elf:Elf) -> VolatileLocationList:
+        return VolatileLocationList()
\ No newline at end of file
@@ -1,10 +1,15 @@
 
 # python3 imports
 from argparse import ArgumentParser, Namespace
+from pathlib import Path
 from random import randint
+from typing import List, Optional, TextIO, Tuple
+from json import loads
+from sys import stdout
+import re
 
 # project imports
-from ebp.common import HiddenString
+from ebp.common import HiddenString, HiddenStringSeedSearch
 from ebp.actions.base import ActionBase
 
 
@@ -19,6 +24,9 @@ class GenerateHiddenStringAction(ActionBase):
     ## The help string presented on the CLI for this action when `--help` is used.
     cli_help = "Generates values needed to embed a hidden string in the crackme."
 
+    ## Pattern a batch entry name must match; names become the prefix of C definitions.
+    BatchNamePattern = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
 
     ## Determines the seed long value to embed in the software.
     #  If the user sets a long seed this is validated, but otherwise used directly.
@@ -47,7 +55,110 @@ class GenerateHiddenStringAction(ActionBase):
             raise ValueError(f"Seed value {test_seed} provided on CLI was not in valid range for option (0-{max_size}).")
 
         return long_seed
-    
+
+
+    ## Searches for a seed whose mask avoids the bytes the rest of the pipeline steers clear of.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the CLI provided arguments given to the application.
+    #  @returns the hidden string made with the seed that was found.
+    def search_seed(self, arguments:Namespace) -> HiddenString:
+
+        search = HiddenStringSeedSearch(mt64=arguments.mt64, time_limit=arguments.search_time_limit)
+        definitions = search(arguments.hidden_string)
+
+        if definitions is None:
+            raise RuntimeError(f"No suitable seed found after trying {search.tried} candidates in {search.elapsed:.2f}s.")
+
+        self.log.info(f"Found a suitable seed after trying {search.tried} candidates in {search.elapsed:.2f}s.")
+        return definitions
+
+
+    ## Reads the entries of a batch file.
+    #  JSON files (`.json`) hold an object mapping each name to either the hidden string or an object with a `value`
+    #  and optional `long_seed`. Any other file holds one `NAME=hidden string` entry per line; blank lines and lines
+    #  starting with `#` are ignored.
+    #  @param cls the type of class that is invoking this method.
+    #  @param path the batch file to read.
+    #  @returns a list of (name, hidden string, long seed or None) entries, in file order.
+    @classmethod
+    def read_batch_file(cls, path:Path) -> List[Tuple[str, str, Optional[int]]]:
+
+        entries = []
+        content = path.read_text()
+
+        if path.suffix.lower() == ".json":
+            try:
+                for name, entry in loads(content).items():
+                    if isinstance(entry, dict):
+                        entries.append( (name, entry["value"], entry.get("long_seed", None)) )
+                    else:
+                        entries.append( (name, entry, None) )
+            except (ValueError, KeyError, AttributeError) as ex:
+                raise RuntimeError(f"Batch file {path} is not a JSON object of hidden string entries: {ex}")
+        else:
+            for line_number, line in enumerate(content.splitlines(), 1):
+                if not line.strip() or line.lstrip().startswith("#"):
+                    continue
+                name, separator, value = line.partition("=")
+                if not separator:
+                    raise RuntimeError(f"Batch file {path} line {line_number} is not a `NAME=hidden string` entry.")
+                entries.append( (name.strip(), value, None) )
+
+        for name, value, long_seed in entries:
+            if not cls.BatchNamePattern.match(name):
+                raise RuntimeError(f"Batch entry name '{name}' is not a valid C identifier.")
+            if not isinstance(value, str):
+                raise RuntimeError(f"Batch entry '{name}' does not have a string value.")
+            if long_seed is not None and (not isinstance(long_seed, int) or long_seed != long_seed & 0xffffffffffffffff):
+                raise RuntimeError(f"Batch entry '{name}' long seed is not in valid range for option (0-{0xffffffffffffffff}).")
+
+        return entries
+
+
+    ## Writes a C header defining the seed and mask of each hidden string in a batch.
+    #  For each entry `NAME` this defines `NAME_MT_SEED_QWORD` and `NAME_MASK_STRING`; as consumed by `crackme.c`.
+    #  @param cls the type of class that is invoking this method.
+    #  @param stream the stream to write the header to.
+    #  @param names the name of each hidden string.
+    #  @param definitions the hidden strings, in the same order as @p names.
+    #  @param mt64 if the masks were made with the 64-bit (MT19937-64) generator.
+    @classmethod
+    def write_batch_header(cls, stream:TextIO, names:List[str], definitions:List[HiddenString], mt64:bool) -> None:
+
+        stream.write(f"// hidden string definitions generated by `ebp {cls.cli_command}`.\n")
+        stream.write(f"#pragma once\n\n")
+
+        if mt64:
+            stream.write(f"// masks were made with MT19937-64; the crackme must unmask using the same generator.\n")
+            stream.write(f"#define HIDDEN_STRING_MT64 1\n\n")
+
+        for name, definition in zip(names, definitions):
+            stream.write(f"#define {name}_MT_SEED_QWORD 0x{definition.long_seed:016x}UL\n")
+            stream.write(f"#define {name}_MASK_STRING \"{definition.mask_c_string}\"\n\n")
+
+
+    ## Generates the hidden strings listed in a batch file and writes them as a C header.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the CLI provided arguments given to the application.
+    def generate_batch(self, arguments:Namespace) -> None:
+
+        if arguments.hidden_string is not None:
+            raise RuntimeError("A hidden string cannot be given on the CLI when using --batch.")
+        if arguments.seed is not None or arguments.long_seed is not None or arguments.search_seed:
+            raise RuntimeError("Seeds cannot be given on the CLI when using --batch; set `long_seed` in the batch file instead.")
+
+        entries = self.read_batch_file(arguments.batch)
+        names = [ name for name, _, _ in entries ]
+        definitions = HiddenString.batch([ value for _, value, _ in entries ], [ seed for _, _, seed in entries ], arguments.mt64)
+
+        self.log.info(f"Generated {len(definitions)} hidden strings from {arguments.batch}.")
+
+        if arguments.out_file is None:
+            self.write_batch_header(stdout, names, definitions, arguments.mt64)
+        else:
+            with arguments.out_file.open("w") as stream:
+                self.write_batch_header(stream, names, definitions, arguments.mt64)
+
 
     ## Optional method derived classes can use to customise arguments for their specific action.
     #  This method is invoked by `ElfBinaryPatcherArgs` when it is building an instance of itself.
@@ -55,12 +166,19 @@ class GenerateHiddenStringAction(ActionBase):
     @classmethod
     def configure_cli_parser(cls, argument_parser:ArgumentParser) -> None:
 
-        argument_parser.add_argument("hidden_string", metavar="hidden-string", type=str, help="The hidden string that you want to embed.")
+        argument_parser.add_argument("hidden_string", metavar="hidden-string", type=str, nargs="?", default=None, help="The hidden string that you want to embed.")
+        argument_parser.add_argument("--batch", "-b", type=Path, default=None, help="Generate every hidden string listed in this file (`NAME=hidden string` lines, or a JSON object of names to strings) as a C header.")
+        argument_parser.add_argument("--out-file", "-o", type=Path, default=None, help="Where to write the C header generated by --batch (defaults to stdout).")
 
         seed_group = argument_parser.add_mutually_exclusive_group()
         seed_group.add_argument("--seed", "-s", type=int, help="The literal seed used to initialise the PRNG which disguises the embedded hidden string (usually should be omitted to be random).")
         seed_group.add_argument("--long-seed", "-ls", type=int, help="The fragmented seed used to initialised the PRNG which disguises the embedded hidden string (usually should be omitted to be random).")    
 
+        seed_group.add_argument("--search-seed", action="store_true", help="Search for a random seed whose mask avoids prohibited bytes (0x00, 0x90) and NOP runs.")
+        argument_parser.add_argument("--search-time-limit", type=float, default=10.0, help="The number of seconds to spend on --search-seed before giving up.")
+
+        argument_parser.add_argument("--mt64", action="store_true", help="Use the 64-bit (MT19937-64) generator seeded with the full long seed; the crackme must be built with `HIDDEN_STRING_MT64`.")
+
 
     ## Invokes this action on an ELF file.
     #  This action will take protected strings from the binary and inject code to build the required strings.
@@ -73,14 +191,23 @@ class GenerateHiddenStringAction(ActionBase):
         
         try:
 
+            if self.arguments.batch is not None:
+                self.generate_batch(self.arguments)
+                return exit_code
+
+            if self.arguments.hidden_string is None:
+                raise RuntimeError("A hidden string (or --batch file) is required.")
 
-            long_seed = self.determine_long_seed(self.arguments)
-            definitions = HiddenString(self.arguments.hidden_string, long_seed)
+            if self.arguments.search_seed:
+                definitions = self.search_seed(self.arguments)
+            else:
+                long_seed = self.determine_long_seed(self.arguments)
+                definitions = HiddenString(self.arguments.hidden_string, long_seed, self.arguments.mt64)
 
             to_hex_array = lambda b: f"0x{b:02x}"
             to_c_string = lambda b: f"\\x{b:02x}"
 
-            print(f"      Seed (Literal): {definitions.short_seed} / 0x{definitions.short_seed:08x}")
+            if not definitions.mt64: print(f"      Seed (Literal): {definitions.short_seed} / 0x{definitions.short_seed:08x}")
             print(f"     Seed (Fragment): {definitions.long_seed} / 0x{definitions.long_seed:016x}")
             print(f"    Mask [hex-array]: {', '.join(map(to_hex_array, definitions.xor_bytes))}")
             print(f"         [ c-string]: {''.join(map(to_c_string, definitions.xor_bytes))}")
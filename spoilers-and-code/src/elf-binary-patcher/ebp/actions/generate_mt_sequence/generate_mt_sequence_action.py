@@ -7,7 +7,7 @@ from pathlib import Path
 # project imports
 from ebp.common import Elf
 from ebp.actions.base import ActionBase
-from ebp.common.algorithm import MersenneTwister
+from ebp.common.algorithm import MersenneTwister, MersenneTwister64
 from .mt_sequence_encoders import MtSequenceCliEncoders
 
 
@@ -47,9 +47,13 @@ class GenerateMtSequenceAction(ActionBase):
     def configure_cli_parser(cls, argument_parser:ArgumentParser) -> None:
         argument_parser.add_argument("seed", type=int, help="The seed to use to initialised the PRNG")
         argument_parser.add_argument("--count", "-c", type=int, default=100, help="The number of values to emit.")
-        argument_parser.add_argument("--skip", "-s", type=int, default=0, help="The number of values in the sequence to jump over.")
+        argument_parser.add_argument("--skip", "-s", type=int, default=0, help="The number of values in the sequence to jump over (large skips are jumped directly, not generated).")
         argument_parser.add_argument("--encode", "-e", action=DictAction, choices=cls.encoders, default=cls.encoders.one_per_line_hex,
             help="The encoder to use to output values")
+        argument_parser.add_argument("--out-file", "-o", type=Path, default=None,
+            help="The file to write the encoded sequence to (defaults to stdout; required by memory mapped encoders).")
+        argument_parser.add_argument("--mt64", action="store_true",
+            help="Use the 64-bit (MT19937-64) generator; each value is then a 64-bit word.")
 
 
     ## Invokes this action on an ELF file.
@@ -59,12 +63,15 @@ class GenerateMtSequenceAction(ActionBase):
 
         exit_code = self.__class__.ExitSuccess
 
-        self.log.info(f"Generating the Mersenne Twister sequence - {self.arguments.count} 32-bit integers after skipping {self.arguments.skip} for seed {self.arguments.seed}.")
+        generator = MersenneTwister64 if self.arguments.mt64 else MersenneTwister
+
+        self.log.info(f"Generating the Mersenne Twister sequence - {self.arguments.count} {generator.WORD_SIZE}-bit integers after skipping {self.arguments.skip} for seed {self.arguments.seed}.")
         
         try:
 
-            values = MersenneTwister.generate(self.arguments.seed, self.arguments.skip, self.arguments.count)
-            if values: self.arguments.encode(self.arguments, values)
+            if self.arguments.count > 0:
+                blocks = generator.sequence_blocks(self.arguments.seed, self.arguments.skip, self.arguments.count)
+                self.arguments.encode(self.arguments, blocks)
 
         except RuntimeError as ex:
             self.log.error(ex)
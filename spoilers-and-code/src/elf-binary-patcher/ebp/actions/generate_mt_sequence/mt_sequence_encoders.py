@@ -1,13 +1,17 @@
 
 # python imports
 from argparse import Namespace
-from struct import pack
-from typing import Iterator
+from contextlib import contextmanager
+from itertools import chain
+from typing import Iterator, Sequence, IO
+import sys
 
 from ebp.common.algorithm.mersenne_twister import MtSequenceEncoders
 
 
 ### Encoders to take the MT sequence and present the value in a defined manner.
+#  Each encoder is given a generator of value blocks (see `MersenneTwister.sequence_blocks`) and writes its
+#  output to `arguments.out_file` (or stdout) as it is generated.
 class MtSequenceCliEncoders(dict):
 
 
@@ -21,50 +25,146 @@ class MtSequenceCliEncoders(dict):
         self['c-char-array-le'] = self.c_char_array_le
         self['c-char-array-be'] = self.c_char_array_be
         self['c-uint-array'] = self.c_uint_array
+        self['raw-words-le'] = self.raw_words_le
+        self['raw-words-be'] = self.raw_words_be
+        self['npy'] = self.npy
+        self['mmap-words-le'] = self.mmap_words_le
 
 
-    ## Prints the given sequence, one value at a time as a decimal value.
+    ## Gets the size (in bytes) of each value in the sequence.
     #  @param self the instance of the object that is invoking this method.
     #  @param arguments the arguments the arguments provided by the user on the CLI.
-    #  @param generator the generator that will yield the sequence values.
-    def one_per_line_dec(self, arguments:Namespace, generator:Iterator[int]) -> None:
-        print( MtSequenceEncoders.one_per_line_dec(generator) )
+    #  @returns 8 if the 64-bit generator is in use, else 4.
+    def word_size(self, arguments:Namespace) -> int:
+        return 8 if arguments.mt64 else 4
 
 
-    ## Prints the given sequence, one value at a time as a hexadecimal value.
+    ## Gets the name of the C variable a sequence is written to.
     #  @param self the instance of the object that is invoking this method.
     #  @param arguments the arguments the arguments provided by the user on the CLI.
-    #  @param generator the generator that will yield the sequence values.
-    def one_per_line_hex(self, arguments:Namespace, generator:Iterator[int]) -> None:
-        print( MtSequenceEncoders.one_per_line_hex(generator) )
+    #  @returns the name of the C variable.
+    def variable_name(self, arguments:Namespace) -> str:
+        if arguments.mt64: return f"mt64_seed_{arguments.seed:016x}_values"
+        return f"mt_seed_{arguments.seed:08x}_values"
 
 
+    ## Opens the output the user requested for writing.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param binary if the output is to be opened in binary mode.
+    #  @returns context manager yielding the output stream.
+    @contextmanager
+    def open_output(self, arguments:Namespace, binary:bool=False) -> Iterator[IO]:
+        if arguments.out_file is None:
+            stream = sys.stdout.buffer if binary else sys.stdout
+            yield stream
+            stream.flush()
+        else:
+            with arguments.out_file.open("wb" if binary else "w") as stream:
+                yield stream
+
+
+    ## Flattens blocks of sequence values into a generator of individual values.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param blocks the generator that will yield blocks of sequence values.
+    #  @returns a generator yielding each value in turn.
+    def values(self, blocks:Iterator[Sequence[int]]) -> Iterator[int]:
+        return chain.from_iterable( block.tolist() for block in blocks )
+
+
+    ## Writes the comment block that precedes C encoded sequences.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param encoding description of how values are encoded (if any).
+    #  @param stream the stream to write the preamble to.
+    def write_preamble(self, arguments:Namespace, encoding:str, stream:IO) -> None:
+        encoding = f" ({encoding})" if encoding else ""
+        generator = "mersenne-twister (64-bit)" if arguments.mt64 else "mersenne-twister"
+        stream.write(f"/// {generator} sequence for seed {arguments.seed}{encoding}\n")
+        if(arguments.skip): stream.write(f"//  @note: {arguments.skip} initial values skipped/discarded.\n")
+
+
+    ## Writes the given sequence, one value at a time as a decimal value.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def one_per_line_dec(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments) as stream:
+            MtSequenceEncoders.one_per_line_dec(stream, self.values(blocks))
+
+
+    ## Writes the given sequence, one value at a time as a hexadecimal value.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def one_per_line_hex(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments) as stream:
+            MtSequenceEncoders.one_per_line_hex(stream, self.values(blocks), self.word_size(arguments))
+
+
+
+    ## Writes the given sequence as a C `unsigned int` array.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def c_uint_array(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments) as stream:
+            self.write_preamble(arguments, "", stream)
+            MtSequenceEncoders.c_uint_array(stream, self.variable_name(arguments), self.values(blocks), word_size=self.word_size(arguments))
+
+
+    ## Writes the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a little endian value.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def c_char_array_le(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments) as stream:
+            self.write_preamble(arguments, f"uint{self.word_size(arguments) * 8}, little-endian encoded", stream)
+            MtSequenceEncoders.c_char_array_le(stream, self.variable_name(arguments), self.values(blocks), word_size=self.word_size(arguments))
+
+
+    ## Writes the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a big endian value.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param blocks the generator that will yield blocks of sequence values.    
+    def c_char_array_be(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments) as stream:
+            self.write_preamble(arguments, f"uint{self.word_size(arguments) * 8}, big-endian encoded", stream)
+            MtSequenceEncoders.c_char_array_be(stream, self.variable_name(arguments), self.values(blocks), word_size=self.word_size(arguments))
+
+
+    ## Writes the given sequence as raw little endian words.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param arguments the arguments the arguments provided by the user on the CLI.
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def raw_words_le(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments, binary=True) as stream:
+            MtSequenceEncoders.raw_words(stream, blocks, "little")
+
 
-    ## Prints the given sequence as a C `unsigned int` array.
+    ## Writes the given sequence as raw big endian words.
     #  @param self the instance of the object that is invoking this method.
     #  @param arguments the arguments the arguments provided by the user on the CLI.
-    #  @param generator the generator that will yield the sequence values.
-    def c_uint_array(self, arguments:Namespace, generator:Iterator[int]) -> None:
-        print(f"/// mersenne-twister sequence for seed {arguments.seed}")
-        if(arguments.skip): print(f"//  @note: {arguments.skip} initial values skipped/discarded.")
-        print(MtSequenceEncoders.c_uint_array( f"mt_seed_{arguments.seed:08x}_values", generator ))
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def raw_words_be(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments, binary=True) as stream:
+            MtSequenceEncoders.raw_words(stream, blocks, "big")
 
 
-    ## Prints the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a little endian value.
+    ## Writes the given sequence as a NumPy `.npy` array of unsigned words.
     #  @param self the instance of the object that is invoking this method.
     #  @param arguments the arguments the arguments provided by the user on the CLI.
-    #  @param generator the generator that will yield the sequence values.
-    def c_char_array_le(self, arguments:Namespace, generator:Iterator[int]) -> None:
-        print(f"/// mersenne-twister sequence for seed {arguments.seed} (uint32, little-endian encoded)")
-        if(arguments.skip): print(f"//  @note: {arguments.skip} initial values skipped/discarded.")
-        print(MtSequenceEncoders.c_char_array_le( f"mt_seed_{arguments.seed:08x}_values", generator ))
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def npy(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        with self.open_output(arguments, binary=True) as stream:
+            MtSequenceEncoders.npy(stream, blocks, arguments.count, self.word_size(arguments))
 
 
-    ## Prints the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a big endian value.
+    ## Writes the given sequence as raw little endian words directly into a memory mapped output file.
     #  @param self the instance of the object that is invoking this method.
     #  @param arguments the arguments the arguments provided by the user on the CLI.
-    #  @param generator the generator that will yield the sequence values.    
-    def c_char_array_be(self, arguments:Namespace, generator:Iterator[int]) -> None:
-        print(f"/// mersenne-twister sequence for seed {arguments.seed} (uint32, big-endian encoded)")
-        if(arguments.skip): print(f"//  @note: {arguments.skip} initial values skipped/discarded.")
-        print(MtSequenceEncoders.c_char_array_be( f"mt_seed_{arguments.seed:08x}_values", generator ))
+    #  @param blocks the generator that will yield blocks of sequence values.
+    def mmap_words_le(self, arguments:Namespace, blocks:Iterator[Sequence[int]]) -> None:
+        if arguments.out_file is None:
+            raise RuntimeError("The memory mapped encoder needs a file to map; use `--out-file`.")
+        MtSequenceEncoders.memory_mapped_words(arguments.out_file, blocks, arguments.count, "little", self.word_size(arguments))
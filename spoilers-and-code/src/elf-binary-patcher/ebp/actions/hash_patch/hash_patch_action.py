@@ -4,10 +4,8 @@ from argparse import ArgumentParser
 from typing import List, Type, Any
 from pathlib import Path
 
-# third-party imports
-from pwnlib.elf import ELF
-
 # project imports
+from ebp.common.patch_process import Elf
 from ebp.actions.base import InOutPatchActionBase, VolatileLocation, VolatileLocationList
 from .hash_patch_sections import HashPatchSections
 
@@ -81,7 +79,7 @@ class HashPatchAction(InOutPatchActionBase):
     #  @param elf the elf to locate volatile regions in.
     #  @returns a list of volatile regions in the binary.
     @classmethod
-    def volatile_locations(cls, elf:ELF) -> VolatileLocationList:
+    def volatile_locations(cls, elf:Elf) -> VolatileLocationList:
         
         volatile_locations_list = VolatileLocationList()
         
@@ -91,6 +89,17 @@ class HashPatchAction(InOutPatchActionBase):
         return volatile_locations_list
 
 
+    ## Returns a list of the locations of the annotations this action reads from the binary.
+    #  @param cls the type of class invoking this method.
+    #  @param elf the elf to locate annotations in.
+    #  @returns a list of the regions in the binary that hold this actions annotations.
+    @classmethod
+    def annotation_locations(cls, elf:Elf) -> VolatileLocationList:
+        return VolatileLocationList(
+            VolatileLocation(section.header.sh_addr, section.header.sh_size) for section in HashPatchSections.annotation_sections(elf)
+        )
+
+
     ## Invokes this action on an ELF file.
     #  This action will take protected strings from the binary and inject code to build the required strings.
     #  @param elf the ELF file this action should operate on.
@@ -1,17 +1,18 @@
 # python imports
-from struct import unpack
+from struct import Struct
 from enum import Enum
-from typing import Sequence, TypeVar, Any, List
+from typing import Sequence, TypeVar, Any, List, Iterable
 from re import compile as regex_compile
 from logging import getLogger
 
 # third-party imports
-from pwnlib.elf import ELF
 from elftools.elf.sections import Section
-from elftools.construct import Struct, Container, Array, SLInt64
 
 # project imports
+from ebp.common.patch_process import Elf
+from ebp.common.annotation_table import AnnotationTable, AnnotationTableEntry
 from .sections.base import HashPatchSectionBase
+from .magic_value_index import MagicValueIndex
 from .sections import IncrementalIntegrity, XorToKnownValue, HashGenerator, InsertMurmur
 
 
@@ -41,71 +42,88 @@ class SpecialHashActions(Enum):
     InsertMurmur = -3
 
 
-## A decorator for methods responsible for converting meta data into a meaningful value.
-#  In practise every conversion needs to convert the structure into bytes, and then usually unpack a tuple.
-def meta_converter(func):
+## Object to hang `meta` data converters off.
+#  Each converter unpacks its part of the `meta` union straight out of the buffer the section entry was read
+#  from, using a layout that is compiled once (see @ref HashPatchSections.parseSectionAction).
+class MetaConverter(object):
 
-    ## The actual implementation we are wrapping.
-    #  @param cls the type of class that is invoking this method.
-    #  @param hash_patch_section_entry the section we are converting meta data from.
-    #  @returns the value of the meta data once its been converted.
-    def __implementation__(cls, hash_patch_section_entry:Container) -> Any:
-        bytes_ = bytes(hash_patch_section_entry.meta)
-        return func(cls, bytes_)
+    ## The number of bytes to expect for the meta data field.
+    MetaSize = 256
 
-    # returns the implementation wrapped in a classmethod decorator.
-    return classmethod(__implementation__)
+    ## The layout of `meta` data holding a string.
+    CStringLayout = Struct(f"{MetaSize}s")
 
+    ## The layout of `meta` data holding an unsigned long.
+    UnsignedLongLayout = Struct("<Q")
 
+    ## The layout of `meta` data holding a hash_generator struct.
+    HashGeneratorLayout = Struct("<QQ")
+
+    ## The layout of `meta` data holding a xor_to_known_value struct.
+    XorToKnownLayout = Struct(f"<QQ{MetaSize - (2 * HashPatchSectionBase.SIZE_OF_QWORD)}s")
+
+    ## The layout of `meta` data holding an insert_murmur struct.
+    InsertMurmurLayout = Struct(f"<IQ{MetaSize - HashPatchSectionBase.SIZE_OF_QWORD - HashPatchSectionBase.SIZE_OF_DWORD}s")
 
-## Object to hang `meta` data converters off.
-class MetaConverter(object):
 
     ## Converts `meta` data into a string.
     #  @param cls the type of class that is invoking this method.
-    #  @param meta the bytes that the meta field si composed of.
+    #  @param buffer the buffer the section entry was read from.
+    #  @param offset the offset of the `meta` field in @p buffer.
     #  @returns the value of the `meta` field interpretted as a string.
-    @meta_converter
-    def CString(cls, meta:bytes) -> str:
-        meta_chars = meta.decode("ascii")
-        return meta_chars.replace("\x00", "")
+    @classmethod
+    def CString(cls, buffer:bytes, offset:int) -> str:
+        meta, = cls.CStringLayout.unpack_from(buffer, offset)
+        return meta.decode("ascii").replace("\x00", "")
 
 
     ## Converts `meta` data into a unsigned long.
     #  @param cls the type of class that is invoking this method.
-    #  @param meta the bytes that the meta field si composed of.
+    #  @param buffer the buffer the section entry was read from.
+    #  @param offset the offset of the `meta` field in @p buffer.
     #  @returns the value of the `meta` field interpretted as an unsigned long (8-byte unsigned integer).
-    @meta_converter
-    def UnsignedLong(cls, meta:bytes) -> int:
-        value, = unpack("<Q", meta[:8])
+    @classmethod
+    def UnsignedLong(cls, buffer:bytes, offset:int) -> int:
+        value, = cls.UnsignedLongLayout.unpack_from(buffer, offset)
         return value
 
     
+    ## Converts `meta` data from a HashGenerator struct.
+    #  Generators built before the hash algorithm was recorded only set the volatile QWORD count; the rest of the
+    #  meta data is zero, which reads as @ref HashGenerator.Bytewise.
+    #  @param cls the type of class that is invoking this method.
+    #  @param buffer the buffer the section entry was read from.
+    #  @param offset the offset of the `meta` field in @p buffer.
+    #  @returns the value of the `meta` field interpretted as a hash_generator struct.
+    @classmethod
+    def HashGenerator(cls, buffer:bytes, offset:int) -> tuple[int, int]:
+        volatile_qwords, hash_algorithm = cls.HashGeneratorLayout.unpack_from(buffer, offset)
+        return volatile_qwords, hash_algorithm
+
+
     ## Converts `meta` data from a XorToKnown struct.
     #  @param cls the type of class that is invoking this method.
-    #  @param meta the bytes that the meta field si composed of.
+    #  @param buffer the buffer the section entry was read from.
+    #  @param offset the offset of the `meta` field in @p buffer.
     #  @returns the value of the `meta` field interpretted as an xor_to_known_value struct.
-    @meta_converter
-    def XorToKnown(cls, meta:bytes) -> int:
-        max_string_length = HashPatchSections.META_SIZE - (2 * HashPatchSectionBase.SIZE_OF_QWORD)
-        required_value, order, sequence_bytes = unpack(f"<QQ{max_string_length}s", meta)
-        sequence_string = sequence_bytes.decode("ascii")
-        sequence = sequence_string.replace("\x00", "")
+    @classmethod
+    def XorToKnown(cls, buffer:bytes, offset:int) -> tuple[int, str, int]:
+        required_value, order, sequence_bytes = cls.XorToKnownLayout.unpack_from(buffer, offset)
+        sequence = sequence_bytes.decode("ascii").replace("\x00", "")
         return required_value, sequence, order
 
 
     ## Converts `meta` data from a InsertMurmur struct.
     #  @param cls the type of class that is invoking this method.
-    #  @param meta the bytes that the meta field si composed of.
-    #  @returns the value of the `meta` field interpretted as an xor_to_known_value struct.
-    @meta_converter
-    def InsertMurmur(cls, meta:bytes) -> int:
-        max_string_length = HashPatchSections.META_SIZE - HashPatchSectionBase.SIZE_OF_QWORD - HashPatchSectionBase.SIZE_OF_DWORD
-        size_of_buffer, order, buffer_bytes = unpack(f"<IQ{max_string_length}s", meta)
-        size_of_buffer = min(size_of_buffer, max_string_length)
+    #  @param buffer the buffer the section entry was read from.
+    #  @param offset the offset of the `meta` field in @p buffer.
+    #  @returns the value of the `meta` field interpretted as an insert_murmur struct.
+    @classmethod
+    def InsertMurmur(cls, buffer:bytes, offset:int) -> tuple[bytes, str, int]:
+        size_of_buffer, order, buffer_bytes = cls.InsertMurmurLayout.unpack_from(buffer, offset)
+        size_of_buffer = min(size_of_buffer, len(buffer_bytes))
         buffer_value = buffer_bytes[:size_of_buffer]
-        sequence_string = buffer_bytes[size_of_buffer:].decode("ascii")
-        sequence = sequence_string.replace("\x00", "")
+        sequence = buffer_bytes[size_of_buffer:].decode("ascii").replace("\x00", "")
         return buffer_value, sequence, order
 
 
@@ -113,7 +131,17 @@ class MetaConverter(object):
 class HashPatchSections(list[HashPatchSectionBase]):
     
     ## The number of bytes to expect for the meta data field.
-    META_SIZE = 256
+    META_SIZE = MetaConverter.MetaSize
+
+    ## Layouts of the fixed part of a hash patch section entry; keyed by ELF class and endianness.
+    #  This is `start_of_entry` and `end_of_entry` (both `Elf_addr`) followed by the `hash_action` (a 64-bit signed
+    #  integer); the `meta` union follows immediately after.
+    EntryLayouts = {
+        (64, True): Struct("<QQq"),
+        (64, False): Struct(">QQq"),
+        (32, True): Struct("<IIq"),
+        (32, False): Struct(">IIq"),
+    }
 
     ## A regular expression to identify a hash patch section.
     HashActionSectionName = regex_compile(fr"^\.hash-patch\.(?P<filename>.+):(?P<line>[0-9]+)$")
@@ -122,6 +150,28 @@ class HashPatchSections(list[HashPatchSectionBase]):
     Log = getLogger("ebp.action.hash-patch")
 
 
+    ## Creates a new (empty) list of hash patch sections.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param sections initial sections to hold.
+    def __init__(self, sections:Iterable[HashPatchSectionBase]=()) -> SelfType:
+        super().__init__(sections)
+        self.magic_index = None
+
+
+    ## Indexes the magic values in the regions of every section in the list.
+    #  Sections then answer their magic value lookups from this single index (see @ref MagicValueIndex).
+    #  @param self the instance of the object that is invoking this method.
+    #  @param elf the ELF binary the sections describe.
+    #  @returns the index that was built.
+    def build_magic_index(self, elf:Elf) -> MagicValueIndex:
+        magic_values = { magic_value for section in self for magic_value in section.MagicValues }
+        regions = [ (section.start_address, section.end_address) for section in self ]
+        self.magic_index = MagicValueIndex(elf, magic_values, regions)
+        for section in self:
+            section.magic_index = self.magic_index
+        return self.magic_index
+
+
     ## Gets a list of all the volatile offsets in the binary.
     #  @param self the instance of the object that is invoking this method.
     #  @returns a list of volatile offsets in the binary.
@@ -131,75 +181,108 @@ class HashPatchSections(list[HashPatchSectionBase]):
         return sorted(volatile_qwords)
 
 
+    ## Gets the hash the integrity generators walk the binary with.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the @ref MurmurOaat64 type matching the generators hash algorithm.
+    def hash_type(self) -> type:
+        hash_types = set( s.hash_type for s in self if isinstance(s, HashGenerator) )
+        if len(hash_types) > 1:
+            raise RuntimeError(f"integrity generators disagree on the hash algorithm to use ({', '.join(t.__name__ for t in hash_types)}).")
+        return hash_types.pop() if hash_types else HashGenerator.HashTypes[HashGenerator.Bytewise]
+
+
     ## Gets an instance of @ref HashPatchSections from the given @p elf ELF file.
+    #  Entries are read from the binaries annotation table if it has one, else from its `.hash-patch.` sections.
     #  @param elf the ELF binary to generate a @ref HashPatchSections  from.
     #  @returns a @ref HashPatchSections from the given @p elf ELF file.
     @classmethod
-    def fromElf(cls, elf:ELF) -> SelfType:
+    def fromElf(cls, elf:Elf) -> SelfType:
 
         sections = cls()
+        annotation_table = AnnotationTable.fromElf(elf)
 
-        for section in elf.iter_sections():
+        if annotation_table:
+            entries = annotation_table.entries(AnnotationTable.HashPatch)
+        else:
+            entries = cls.annotation_sections(elf)
 
-            if (cls.HashActionSectionName.match(section.name)):
-                try:
-                    descriptor = cls.parseSectionAction(section)
-                    sections.append(descriptor)
-                except RuntimeError as ex:
-                    raise RuntimeError(f"{ex}; specified by {section.name}.") from ex
+        for section in entries:
+            try:
+                descriptor = cls.parseSectionAction(section)
+                sections.append(descriptor)
+            except RuntimeError as ex:
+                raise RuntimeError(f"{ex}; specified by {section.name}.") from ex
 
+        sections.build_magic_index(elf)
         return sections
 
 
-    ## Parses a ".hash-patch." section in to a descriptor object.
-    #  @param section the ELF section to parse a descriptor from.
+    ## Gets the sections of the given @p elf that hold hash patch annotations.
+    #  @param cls the type of class that is invoking this method.
+    #  @param elf the ELF binary to find the sections in.
+    #  @returns a list of the annotation table, if the binary has one, else the `.hash-patch.` sections.
+    @classmethod
+    def annotation_sections(cls, elf:Elf) -> List[Section]:
+        annotation_table = elf.get_section_by_name(AnnotationTable.SectionName)
+        if annotation_table:
+            return [ annotation_table ]
+        return [ section for section in elf.iter_sections() if cls.HashActionSectionName.match(section.name) ]
+
+
+    ## Parses a ".hash-patch." section (or hash patch annotation table entry) in to a descriptor object.
+    #  @param section the ELF section (or @ref AnnotationTableEntry) to parse a descriptor from.
     #  @returns a @ref HashPatchSectionBase object describing the content of the @p section.
     @classmethod
-    def parseSectionAction(cls, section:Section) -> HashPatchSectionBase:
+    def parseSectionAction(cls, section:Section|AnnotationTableEntry) -> HashPatchSectionBase:
         
-        section_data = Struct('hash_patch_section_entry',
-            section.structs.Elf_addr('start_of_entry'),
-            section.structs.Elf_addr('end_of_entry'),
-            SLInt64('hash_action'),
-            Array(cls.META_SIZE, section.structs.Elf_byte('meta'))
-        ).parse( section.data() ) 
-        
-        if section_data.hash_action >= 0:
+        elffile = section.elffile
+        entry_layout = cls.EntryLayouts[(elffile.elfclass, elffile.little_endian)]
+        buffer = section.data()
+
+        if len(buffer) < entry_layout.size + cls.META_SIZE:
+            raise RuntimeError(f"Hash patch section is truncated ({len(buffer)} bytes, expected {entry_layout.size + cls.META_SIZE})")
+
+        start_of_entry, end_of_entry, hash_action = entry_layout.unpack_from(buffer)
+        meta_offset = entry_layout.size
+
+        if hash_action >= 0:
             return IncrementalIntegrity(
                 section=section,
-                start_address=section_data.start_of_entry,
-                end_address=section_data.end_of_entry,
-                sequence=MetaConverter.CString(section_data),
-                order=section_data.hash_action,
+                start_address=start_of_entry,
+                end_address=end_of_entry,
+                sequence=MetaConverter.CString(buffer, meta_offset),
+                order=hash_action,
             )
 
-        elif section_data.hash_action == SpecialHashActions.Generator.value:
+        elif hash_action == SpecialHashActions.Generator.value:
+            volatile_qwords, hash_algorithm = MetaConverter.HashGenerator(buffer, meta_offset)
             return HashGenerator(
                 section=section,
-                start_address=section_data.start_of_entry,
-                end_address=section_data.end_of_entry,
-                volatile_qwords=MetaConverter.UnsignedLong(section_data)
+                start_address=start_of_entry,
+                end_address=end_of_entry,
+                volatile_qwords=volatile_qwords,
+                hash_algorithm=hash_algorithm
             )
-        elif section_data.hash_action == SpecialHashActions.XorToKnownValue.value:
-            required_value, sequence, order = MetaConverter.XorToKnown(section_data)
+        elif hash_action == SpecialHashActions.XorToKnownValue.value:
+            required_value, sequence, order = MetaConverter.XorToKnown(buffer, meta_offset)
             return XorToKnownValue(
                 section=section,
-                start_address=section_data.start_of_entry,
-                end_address=section_data.end_of_entry,
+                start_address=start_of_entry,
+                end_address=end_of_entry,
                 known_value=required_value,
                 sequence=sequence,
                 order=order,
             )
-        elif section_data.hash_action == SpecialHashActions.InsertMurmur.value:
-            buffer, sequence, order = MetaConverter.InsertMurmur(section_data)
+        elif hash_action == SpecialHashActions.InsertMurmur.value:
+            expected_value, sequence, order = MetaConverter.InsertMurmur(buffer, meta_offset)
             return InsertMurmur(
                 section=section,
-                start_address=section_data.start_of_entry,
-                end_address=section_data.end_of_entry,
-                expected_value=buffer,
+                start_address=start_of_entry,
+                end_address=end_of_entry,
+                expected_value=expected_value,
                 sequence=sequence,
                 order=order,
             )
         else:
-            raise RuntimeError(f"Unsupported hash-action identifier ({section_data.hash_action})")
+            raise RuntimeError(f"Unsupported hash-action identifier ({hash_action})")
 
@@ -0,0 +1,89 @@
+# python imports
+from bisect import bisect_left, bisect_right
+from re import compile as regex_compile, escape as regex_escape
+from typing import Iterable, Iterator, List, Tuple, TypeVar
+
+# project imports
+from ebp.common.patch_process import Elf
+
+
+## The @ref MagicValueIndex `Self` type
+SelfType = TypeVar('SelfType', bound='MagicValueIndex')
+
+
+## Index of where magic values appear in the regions annotated by hash patch sections.
+#  Sections look up the magic values in their region many times over (during validation, when listing volatile
+#  and unstable offsets, when configuring and when patching). This scans every region once, for every magic value
+#  at once, and answers those lookups from the index. Occurances are checked as they are returned; any that have
+#  since been overwritten by a patch are dropped from the index.
+class MagicValueIndex(object):
+
+
+    ## Creates a new instance of the index.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param elf the ELF binary the regions are in.
+    #  @param magic_values the magic values to index.
+    #  @param regions the (start, end) virtual address ranges to index.
+    def __init__(self, elf:Elf, magic_values:Iterable[bytes], regions:Iterable[Tuple[int, int]]) -> SelfType:
+        self.elf = elf
+        self.regions = self.merge_regions(regions)
+        self.occurances = { bytes(magic_value): [] for magic_value in magic_values }
+
+        if self.occurances:
+            # the look-ahead lets occurances overlap; as a repeated `find` would.
+            alternatives = b"|".join( regex_escape(magic_value) for magic_value in self.occurances )
+            pattern = regex_compile(b"(?=(" + alternatives + b"))")
+            for start, end in self.regions:
+                for match in pattern.finditer(elf.view(start, end - start)):
+                    self.occurances[match.group(1)].append(start + match.start())
+
+
+    ## Sorts and merges overlapping or adjacent regions.
+    #  @param cls the type of class that is invoking this method.
+    #  @param regions the (start, end) virtual address ranges to merge.
+    #  @returns a sorted list of non-overlapping (start, end) ranges covering the same addresses.
+    @classmethod
+    def merge_regions(cls, regions:Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        merged = []
+        for start, end in sorted(regions):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+
+    ## Determines if a range was covered by the scan.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param start the start of the range.
+    #  @param end the end of the range.
+    #  @returns True if the whole range is within a single indexed region.
+    def covers(self, start:int, end:int) -> bool:
+        index = bisect_right(self.regions, (start, float("inf"))) - 1
+        return index >= 0 and self.regions[index][1] >= end
+
+
+    ## Finds every occurance of a magic value that lies entirely within a range.
+    #  Falls back to searching the binary if the value or range was not indexed.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param magic_value the magic value to look for.
+    #  @param start the start of the range to look in.
+    #  @param end the end of the range to look in.
+    #  @returns an iterator of the virtual addresses the magic value is found at.
+    def find(self, magic_value:bytes, start:int, end:int) -> Iterator[int]:
+
+        magic_value = bytes(magic_value)
+        occurances = self.occurances.get(magic_value, None)
+
+        if occurances is None or not self.covers(start, end):
+            yield from self.elf.find_all(magic_value, start, end - start)
+            return
+
+        index = bisect_left(occurances, start)
+        while index < len(occurances) and occurances[index] + len(magic_value) <= end:
+            address = occurances[index]
+            if self.elf.view(address, len(magic_value)) == magic_value:
+                yield address
+                index += 1
+            else: # a patch has overwritten the magic value.
+                del occurances[index]
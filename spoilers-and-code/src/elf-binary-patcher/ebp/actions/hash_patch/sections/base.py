@@ -5,10 +5,10 @@ from logging import getLogger
 from struct import pack, calcsize
 
 # third-party imports
-from pwnlib.elf import ELF
 from elftools.elf.sections import Section
 
 # project imports
+from ebp.common.patch_process import Elf
 from ebp.common.algorithm import MurmurOaat64
 
 
@@ -46,6 +46,9 @@ class HashPatchSectionBase(ABC):
     #   @remarks defined in C by "integrity.h" as INTEGRITY_SEED
     INTEGRITY_SEED = pack("<Q", 0x1eaf5adca75f00d5)
 
+    ## The magic values this type of section looks for in its region (see @ref MagicValueIndex).
+    MagicValues = [ INTEGRITY_HASH, INTEGRITY_SEED ]
+
     ## Logger used by this class instance.
     #  declared at class scope as its often used by classmethod's.
     Log = getLogger("ebp.action.hash-patch")
@@ -60,22 +63,23 @@ class HashPatchSectionBase(ABC):
         self.section = section
         self.start_address = start_address
         self.end_address = end_address
+        self.magic_index = None
     
 
     ## Gets the ELF file this deescriptor is part of.
     #  @param self the instance of the object that is invoking this method.
     #  @returns the ELF file this section was created from.
     @property
-    def elf(self) -> ELF:
+    def elf(self) -> Elf:
         return self.section.elffile
 
 
-    ## Reads the memory that is scoped by this patch section.
+    ## Gets a view of the memory that is scoped by this patch section.
     #  @param self the instance of the object that is invoking this method.
-    #  @returns the bytes in the memory that are in patch scope.
-    def scoped_memory(self) -> bytearray:
+    #  @returns a read-only view of the bytes in the memory that are in patch scope.
+    def scoped_memory(self) -> memoryview:
         memory_size = self.end_address - self.start_address
-        return self.elf.read(self.start_address, memory_size)
+        return self.elf.view(self.start_address, memory_size)
 
 
     ## Returns an enumerator of all occurances of the given byte sequence in the sections scoped memory.
@@ -84,15 +88,11 @@ class HashPatchSectionBase(ABC):
     #  @returns an enumerator of virtual memory addresses where the sequence can be found.
     def locate_byte_sequence_in_scoped_memory(self, sequence:bytearray) -> Iterator[int]:
 
-        memory = self.scoped_memory()
-        index = memory.find(sequence, 0)
-
-        while(index > 0):
-            yield self.start_address + index
-            index = memory.find(sequence, index+1)
-
-        return
-        yield
+        if self.magic_index is not None:
+            yield from self.magic_index.find(sequence, self.start_address, self.end_address)
+        else:
+            memory_size = self.end_address - self.start_address
+            yield from self.elf.find_all(sequence, self.start_address, memory_size)
 
 
     ## Returns an enumerator of offsets into this region of scoped memory that look like places to inject the current integrity hash.
@@ -176,25 +176,60 @@ class HashPatchSectionBase(ABC):
         return
 
 
+    ## Gets the section that is hashed for integrity checks made in this region.
+    #  @param self the instance of the object that is invokign this method.
+    #  @returns the section containing the start of this region.
+    def hashed_section(self) -> Section:
+        return self.elf.get_section_containing(self.start_address)
+
+
+    ## Gets the parts of the hashed section that are covered by the integrity hash.
+    #  These are slices of a single view of the section; no bytes are copied.
+    #  @param self the instance of the object that is invokign this method.
+    #  @param volatile_qwords a list of offsets to QWORD regions that should be jumped over/skipped when calculating the hash.
+    #  @returns an iterator of read-only views of the runs of bytes between volatile QWORDS, in the order they are hashed.
+    def static_memory(self, volatile_qwords:List[int]) -> Iterator[memoryview]:
+
+        section = self.hashed_section()
+        section_view = self.elf.section_view(section)
+        section_starts = section.header.sh_addr
+        current_offset = 0
+
+        for volatile_qword in volatile_qwords:
+            yield section_view[current_offset:volatile_qword - section_starts]
+            current_offset = volatile_qword - section_starts + self.SIZE_OF_QWORD
+
+        yield section_view[current_offset:]
+
+
     ## Calculates the expected output of the MurmurOAAT64 hash.
     #  @param self the instance of the object that is invokign this method.
     #  @param seed the seed to provide to the hash algorithm.
     #  @param volatile_qwords a list of offsets to QWORD regions that should be jumped over/skipped when calculating the hash.
+    #  @param hash_type the hash the generator walks the binary with (@ref MurmurOaat64 or a variant of it).
     #  @returns the current expected hash of the binary.
-    def calculate_murmuroaat64(self, seed:int, volatile_qwords:int) -> int:
-        
-        murmur = MurmurOaat64(seed)
+    def calculate_murmuroaat64(self, seed:int, volatile_qwords:int, hash_type:type=MurmurOaat64) -> int:
         
-        section = self.elf.get_section_containing(self.start_address)
-        current_offset = section.header.sh_addr
-        section_ends = current_offset + section.header.sh_size
+        murmur = hash_type(seed)
 
-        for volatile_qword in volatile_qwords:
-            static_bytes = self.elf.read(current_offset, volatile_qword - current_offset)
-            current_offset = volatile_qword + self.SIZE_OF_QWORD
-            murmur.consume(static_bytes)
-        
-        static_bytes = self.elf.read(current_offset, section_ends - current_offset)
-        murmur.consume(static_bytes)
+        for static_bytes in self.static_memory(volatile_qwords):
+            murmur.consume_buffer(static_bytes)
+
+        return int(murmur)
+
+
+    ## Calculates the expected output of the MurmurOAAT64 hash for a number of seeds at once.
+    #  All seeds are advanced together over a single pass of the section (see @ref MurmurOaat64.hash_many).
+    #  @param self the instance of the object that is invokign this method.
+    #  @param seeds the seeds to provide to the hash algorithm.
+    #  @param volatile_qwords a list of offsets to QWORD regions that should be jumped over/skipped when calculating the hash.
+    #  @param hash_type the hash the generator walks the binary with (@ref MurmurOaat64 or a variant of it).
+    #  @returns the current expected hash of the binary for each seed, in the order of @p seeds.
+    def calculate_murmuroaat64_many(self, seeds:List[int], volatile_qwords:int, hash_type:type=MurmurOaat64) -> List[int]:
+
+        states = list(seeds)
+
+        for static_bytes in self.static_memory(volatile_qwords):
+            states = hash_type.hash_many(states, static_bytes)
 
-        return int(murmur)
\ No newline at end of file
+        return states
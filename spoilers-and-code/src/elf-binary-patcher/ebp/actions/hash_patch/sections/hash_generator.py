@@ -1,15 +1,18 @@
 # python imports
 from typing import TypeVar, Any, List, Iterator, Tuple
-from re import compile as regex_compile
-from struct import pack
+from re import compile as regex_compile, escape as regex_escape, DOTALL
+from struct import pack, unpack_from
 
 # third-party imports
 from elftools.elf.sections import Section
 
 #project imports
 from .base import HashPatchSectionBase
+from ebp.common.algorithm import MurmurOaat64, MurmurOaat64Wordwise
 from ebp.x64asm import (InstructionList,
     MOV_DWORDPTR_RBX_imm8off_imm32,
+    ADD_RBX_imm8,
+    ADD_RBX_imm32,
     LEA_RBX_ripoff
 )
 
@@ -29,6 +32,45 @@ class HashGenerator(HashPatchSectionBase):
     ## Magic value that will be replaced with the amount of memory required for the unchecked QWORD list.
     INTEGRITY_CHECK_ALLOC_PLACEHOLD = pack(HashPatchSectionBase.QWORD, 0x5adc01dc0ffeebad)
 
+    ## The magic values this type of section looks for in its region (see @ref MagicValueIndex).
+    MagicValues = HashPatchSectionBase.MagicValues + [ INTEGRITY_CHECK_ALLOC_PLACEHOLD ]
+
+    ## Hash algorithm identifier for the byte-at-a-time hash.
+    #  @remarks defined in C by "integrity.h" as INTEGRITY_HASH_BYTEWISE
+    Bytewise = 0
+
+    ## Hash algorithm identifier for the eight-bytes-at-a-time hash.
+    #  @remarks defined in C by "integrity.h" as INTEGRITY_HASH_WORDWISE
+    Wordwise = 1
+
+    ## The hash implementation for each hash algorithm identifier.
+    HashTypes = {
+        Bytewise: MurmurOaat64,
+        Wordwise: MurmurOaat64Wordwise
+    }
+
+    ## The largest offset from RBX an assignment into the skip array can encode (its a signed imm8).
+    SkipOffsetLimit = 0x7f
+
+    ## How far RBX is moved into the skip array before assigning to it, when the array outgrows the imm8 offsets.
+    #  This is the largest imm8 addition; it brings the first 64 entries in reach of the imm8 offsets.
+    SkipArrayRebase = 0x7f
+
+    ## How far RBX is moved to bring the next 64 skip array entries in reach of the imm8 offsets.
+    SkipArrayStride = 0x100
+
+    ## The value of the entry that ends the skip array.
+    SkipArrayStop = 0xffffffff
+
+    ## Matches the instructions written into the reservation to build the skip array and return the start of section memory.
+    #  The look-ahead lets candidates overlap; a stray byte of compiled code that looks like the start of an instruction
+    #  should not hide the real patch.
+    PatchPattern = regex_compile(b"(?=(" +
+        regex_escape(bytes([ 0x48, 0x83, 0xc3 ])) + b".)?((?:" +                   # add  rbx, imm8
+        regex_escape(bytes([ 0xc7, 0x43 ])) + b".{5}|" +                           # mov  DWORD PTR[rbx + imm8], imm32
+        regex_escape(bytes([ 0x48, 0x81, 0xc3 ])) + b".{4})+" +                    # add  rbx, imm32
+        regex_escape(bytes([ 0x48, 0x8d, 0x1d ])) + b".{4}))", DOTALL)             # lea  rbx, [rip + imm32]
+
 
     ## Creates a new instance of the @ref HashGenerator object.
     #  @param self the instance of the object that is invoking this method.
@@ -36,9 +78,22 @@ class HashGenerator(HashPatchSectionBase):
     #  @param start_address start of region that contains the integrity hash generation.
     #  @param end_address end of the region that contains the integrity hash generation.
     #  @param volatile_qwords the number of volatile QWORDs that space was reserved to patching.
-    def __init__(self, section:Section, start_address:int, end_address:int, volatile_qwords:int) -> SelfType:
+    #  @param hash_algorithm identifies the hash the generator walks the binary with (see @ref HashTypes).
+    def __init__(self, section:Section, start_address:int, end_address:int, volatile_qwords:int, hash_algorithm:int=Bytewise) -> SelfType:
         super().__init__(section, start_address, end_address)
         self.volatile_qwords = volatile_qwords
+        self.hash_algorithm = hash_algorithm
+
+        if not hash_algorithm in self.HashTypes:
+            raise RuntimeError(f"Unsupported integrity hash algorithm ({hash_algorithm})")
+
+
+    ## Gets the hash implementation this generator walks the binary with.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the @ref MurmurOaat64 type that matches the generators hash.
+    @property
+    def hash_type(self) -> type:
+        return self.HashTypes[self.hash_algorithm]
 
 
     ## Configures and validates intial state information needed for patching.
@@ -53,22 +108,6 @@ class HashGenerator(HashPatchSectionBase):
         volatile_qwords = sections.volatile_offsets()
         number_of_volatile_qwords = len(volatile_qwords)
 
-        if number_of_volatile_qwords > 30:
-            # The generator is limited to 30 volatile QWORDS. This is due to the opcodes generated to build the list.
-            # It uses instruction c7 43 (MOV RBX+IMM8, IMM32) to assign values into the target buffer. As RBX points 
-            # directly to the target buffer we are limited to offsets within a 0->0x7f range. Two potential fixes if
-            # we need more offsets:
-            #    - would could relocate RBX to point to the target buffer+0x80, then start addressing at offset -0x80
-            #      this allows full use of the IMM8 and extends the generator to 62 QWORDS.
-            #    - we could walk the address (use 32 or 64 offset, if the above fix is also used), then increment RBX
-            #      when we exhaust the IMM8.
-            #    - we could change to use instruction c7 83 (MOV RBX+IMM32, IMM32) which gives more offsets than we 
-            #      could ever hope to exhaust - however this comes at a size cost (10 bytes instead of 7 for each)
-            #      qword in the list.
-            # NOTE: this is 30 rather than 32 because we need to reserve two QWORDs:
-            #   - one takes us to the end of memory and the other is a stop marker 0xffffffff.
-            raise RuntimeError(f"Got {number_of_volatile_qwords} volatile QWORDS, the generator currently does not support more than 32 volatile QWORDS - see source comment for fix")
-
         for generator in sections:
 
             if isinstance(generator, cls):
@@ -93,8 +132,8 @@ class HashGenerator(HashPatchSectionBase):
     #  @returns the location of the space reserved for patching the generator.
     def find_patch_reserved_space(self, volatile_qwords:List[int]) -> int:
         
-        size_of_patch__qword_list = (len(volatile_qwords) + 2) * 7  # space needed for instructions to build list of for all QWORDS, a "virtual" marker for end of section, and a STOP marker (0xffffffff)
-        size_of_patch__vma_start = 7                                # space needed for single LEA instruction to bring VMA start address into RBX.
+        size_of_patch__qword_list = self.skips_array_size(len(volatile_qwords) + 2)     # space needed for instructions to build list of for all QWORDS, a "virtual" marker for end of section, and a STOP marker (0xffffffff)
+        size_of_patch__vma_start = LEA_RBX_ripoff.opcodes_length()                      # space needed for single LEA instruction to bring VMA start address into RBX.
         
         required_patch_size = sum([
             size_of_patch__qword_list,
@@ -105,7 +144,7 @@ class HashGenerator(HashPatchSectionBase):
         reservation_matches = list( reservation_regex.finditer( self.scoped_memory() ) )
 
         if not reservation_matches:
-            raise RuntimeError(f"generator identified by section {self.section.name} needs a reservation of {required_patch_size} bytes, but we failed to find one.")
+            raise RuntimeError(f"generator identified by section {self.section.name} needs a reservation of {required_patch_size} bytes, but we failed to find one. set `#define NUMBER_OF_VOLATILE_QWORDS {len(volatile_qwords)}` and rebuild.")
         elif len(reservation_matches) > 1:
             raise RuntimeError(f"generator identified by section {self.section.name} needs a reservation of {required_patch_size} bytes and we found multiple?")
 
@@ -117,35 +156,111 @@ class HashGenerator(HashPatchSectionBase):
         return reservation_memory, reservation_length
         
 
+    ## Calculates the number of bytes of instructions needed to build a skip array.
+    #  Assignments (c7 43 ib id - 7 bytes each) use RBX plus a signed imm8 offset, this reaches 32 entries. Larger arrays first
+    #  move RBX into the array (48 83 c3 ib - 4 bytes) which reaches 64 entries, then move RBX on again (48 81 c3 id - 7 bytes) 
+    #  each time another 64 entries have been assigned. Assigning with imm32 offsets (c7 83 id id - 10 bytes each) reaches any
+    #  entry, but is never smaller.
+    #  @remarks this must agree with ARRAY_SETUP_SIZE in "integrity.c", which sizes the reservation.
+    #  @param cls the type of class that is invoking this method.
+    #  @param number_of_entries the number of entries in the skip array (including the end of memory and STOP entries).
+    #  @returns the number of bytes the instructions building the skip array need.
+    @classmethod
+    def skips_array_size(cls, number_of_entries:int) -> int:
+        assignments_size = number_of_entries * MOV_DWORDPTR_RBX_imm8off_imm32.opcodes_length()
+        if (number_of_entries - 1) * cls.SIZE_OF_DWORD <= cls.SkipOffsetLimit:
+            return assignments_size
+        number_of_strides = (number_of_entries - 1) * cls.SIZE_OF_DWORD // cls.SkipArrayStride
+        return assignments_size + ADD_RBX_imm8.opcodes_length() + (number_of_strides * ADD_RBX_imm32.opcodes_length())
+
+
     ## Creates x86-64 instructions which build the "skips" array.
     #  The hash mechanism "skips" over "volatile" QWORDS - things we need in the binary, but can't know before hashing (such as the binary hash itself).
     #  This is done by a consulting a list of offsets - at each offset the generator will jump 8-bytes. The offsets define where the volatile QWORDS are.
     #  Two final entries are made in the list - one that will cause a read to end of section memory, and another to indicate to the iterator its finished.
-    #  This function builds the assembly that generates this list.
+    #  This function builds the assembly that generates this list, using the smallest encoding (see @ref skips_array_size).
     #  @NOTE this code builds assemly that expects RBX to point at a memory address which contains sufficient space to build the skip array.
+    #   RBX may be left pointing anywhere within the array.
     #  @param volatile_qwords the list of offsets where volatile QWORDs are located in memory.
     #  @param virtual_memory_start the start address of the sections virtual memory.
     #  @param virtuam_memory_ends the end address of the sections virtual memory.
     #  @returns a list of instructions that will build the required skip array.
     def create_asm__build_skips_array(self, volatile_qwords:List[int], virtual_memory_start:int, virtual_memory_ends:int) -> InstructionList:
         
-        index = 0
-        instructions = InstructionList()
+        skips = []
         current_offset = virtual_memory_start
 
-        for index, qword in enumerate(volatile_qwords):
-            instruction = MOV_DWORDPTR_RBX_imm8off_imm32(index * self.SIZE_OF_DWORD, qword - current_offset)
-            instructions.append(instruction)
+        for qword in volatile_qwords:
+            skips.append(qword - current_offset)
             current_offset = qword + self.SIZE_OF_QWORD
 
-        end_marker = MOV_DWORDPTR_RBX_imm8off_imm32((index + 1) * self.SIZE_OF_DWORD, virtual_memory_ends - current_offset)
-        stop_marker = MOV_DWORDPTR_RBX_imm8off_imm32((index + 2) * self.SIZE_OF_DWORD, 0xffffffff)
-        instructions.append(end_marker)
-        instructions.append(stop_marker)
+        skips.append(virtual_memory_ends - current_offset)  # end marker
+        skips.append(0xffffffff)                            # stop marker
+
+        rbx_offset = 0
+        instructions = InstructionList()
+
+        if (len(skips) - 1) * self.SIZE_OF_DWORD > self.SkipOffsetLimit:
+            instructions.append(ADD_RBX_imm8(self.SkipArrayRebase))
+            rbx_offset = self.SkipArrayRebase
+
+        for index, skip in enumerate(skips):
+            if index * self.SIZE_OF_DWORD - rbx_offset > self.SkipOffsetLimit:
+                instructions.append(ADD_RBX_imm32(self.SkipArrayStride))
+                rbx_offset += self.SkipArrayStride
+            instructions.append(MOV_DWORDPTR_RBX_imm8off_imm32(index * self.SIZE_OF_DWORD - rbx_offset, skip))
         
         return instructions
 
     
+    ## Reads the skip array back out of a patched generator.
+    #  This is the reverse of @ref patch_non_volatile__volatile_qwords_array_and_start_address; the instructions in the reservation
+    #  are replayed to recover the array the generator will build at runtime.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the volatile QWORD addresses the generator skips, and the start and end of the memory it walks.
+    def read_skips_array(self) -> Tuple[List[int], int, int]:
+
+        memory = self.scoped_memory()
+
+        for match in self.PatchPattern.finditer(memory):
+
+            rebase, instructions = match.group(1), match.group(2)
+            rbx_offset = unpack_from("<b", rebase, 3)[0] if rebase else 0
+            skips = {}
+            offset = 0
+
+            while offset < len(instructions) - LEA_RBX_ripoff.opcodes_length():
+                if instructions[offset] == 0xc7:
+                    skip_offset, skip = unpack_from("<bI", instructions, offset + 2)
+                    skips[rbx_offset + skip_offset] = skip
+                    offset += MOV_DWORDPTR_RBX_imm8off_imm32.opcodes_length()
+                else:
+                    rbx_offset += unpack_from("<i", instructions, offset + 3)[0]
+                    offset += ADD_RBX_imm32.opcodes_length()
+
+            skip_offsets = sorted(skips)
+            if skip_offsets != list(range(0, len(skip_offsets) * self.SIZE_OF_DWORD, self.SIZE_OF_DWORD)):
+                continue
+            
+            skips = [ skips[skip_offset] for skip_offset in skip_offsets ]
+            if len(skips) < 2 or skips[-1] != self.SkipArrayStop:
+                continue
+
+            patch_address = self.start_address + match.start(2)
+            lea_displacement, = unpack_from("<i", instructions, len(instructions) - 4)
+            virtual_memory_start = patch_address + len(instructions) + lea_displacement
+
+            volatile_qwords = []
+            current_offset = virtual_memory_start
+            for skip in skips[:-2]:
+                volatile_qwords.append(current_offset + skip)
+                current_offset += skip + self.SIZE_OF_QWORD
+
+            return volatile_qwords, virtual_memory_start, current_offset + skips[-2]
+
+        raise RuntimeError(f"generator identified by section {self.section.name} does not contain a patched skip array.")
+
+
     ## Creates x86-64 instructions which return the start of section memory
     #  The generator needs to know where its section starts, it expects this to be placed into RBX when the patch finishes.
     #  @param self the instance of the object that is invoking this method.
@@ -197,6 +312,8 @@ class HashGenerator(HashPatchSectionBase):
         assert len(opcodes) <= patch_size, \
             "ASM generated to build QWORD array and assign start address for hash generator exceeded space reserved for this purpose."
 
+        self.Log.info(f"generator identified by section {self.section.name} skips {len(volatile_qwords)} volatile qwords; patch uses {len(opcodes)}/{patch_size} reserved bytes.")
+
         self.elf.write(patch_space, opcodes)
         
 
@@ -8,7 +8,6 @@ from struct import pack
 from elftools.elf.sections import Section
 
 #project imports
-from ebp.common.algorithm import MurmurOaat64
 from .incremental_integrity_base import IncrementalIntegrityBase, IncrementalIntegrityChain
 from .xor_to_known_value import XorToKnownValue
 from .insert_murmur import InsertMurmur
@@ -27,18 +26,18 @@ SelfType = TypeVar('SelfType', bound='IncrementalIntegrity')
 class IncrementalIntegrity(IncrementalIntegrityBase):
 
 
-    ## Configures and validates intial state information needed for patching.
+    ## Arranges the incremental integrity components of a binary into their chains.
     #  @param cls the type of class that is invoking this method.
-    #  @param sections a list of sections that can be used during initialisation.
-    #  @returns the state of the initialisation process on success or None if initialisation did not occur / no processing required.
+    #  @param sections a list of sections to build the chains from.
+    #  @returns a map of chain name to the (unvalidated) chain.
     @classmethod
-    def configure_non_volatile(cls, sections:List) -> Any:
-        
+    def build_chains(cls, sections:List) -> Dict[str, IncrementalIntegrityChain]:
+
         chain_map = {}
 
         for chain_name, section_list in cls.group_integrity_checks(sections).items():
             
-            cls.Log.debug(f"finalising integrity chain '{chain_name}'...")
+            cls.Log.debug(f"building incremental integrity chain '{chain_name}'...")
 
             use_order = lambda section: section.order
             
@@ -54,12 +53,27 @@ class IncrementalIntegrity(IncrementalIntegrityBase):
                     elif isinstance(descriptor,XorToKnownValue):        layer.xor_to_known.append(descriptor)
                     elif isinstance(descriptor,InsertMurmur):           layer.insert_hash.append(descriptor)
                     else: cls.Log.warning(f"Unknown incremental integrity component located in {descriptor.section.name}.")
+
+            chain_map[chain.name] = chain
+
+        return chain_map
+
+
+    ## Configures and validates intial state information needed for patching.
+    #  @param cls the type of class that is invoking this method.
+    #  @param sections a list of sections that can be used during initialisation.
+    #  @returns the state of the initialisation process on success or None if initialisation did not occur / no processing required.
+    @classmethod
+    def configure_non_volatile(cls, sections:List) -> Any:
+        
+        chain_map = cls.build_chains(sections)
+
+        for chain in chain_map.values():
             
             chain.validate()
 
-            cls.Log.info(f"Finished configuring incremental integrity chain '{chain.name}' - {len(section_list)} components on {len(chain)} layers.")
-            
-            chain_map[chain.name] = chain
+            components = sum( len(l.entry_points) + len(l.xor_to_known) + len(l.insert_hash) for l in chain )
+            cls.Log.info(f"Finished configuring incremental integrity chain '{chain.name}' - {components} components on {len(chain)} layers.")
             
         return chain_map
             
@@ -98,18 +112,29 @@ class IncrementalIntegrity(IncrementalIntegrityBase):
     def configure_volatile(cls, sections:List, non_volatile_state:Any) -> Any:
         
         volatile_qwords = sections.volatile_offsets()
-
-        for chain in non_volatile_state.values():
-
-            layer_iterator = chain.__iter__()
-
-            root_layer = next(layer_iterator)
-            root_layer.murmur_out = root_layer.entry_points[0].calculate_murmuroaat64(root_layer.murmur_seed, volatile_qwords)
-
-            for previous_layer, layer in enumerate(layer_iterator):  
-
-                layer.murmur_seed = chain[previous_layer].murmur_out
-                layer.murmur_out = layer.entry_points[0].calculate_murmuroaat64(layer.murmur_seed, volatile_qwords)
+        hash_type = sections.hash_type()
+        chains = list(non_volatile_state.values())
+
+        # layers within a chain are seeded by the layer before, but chains are independant of each other; so every
+        # chain is advanced a layer at a time in lockstep, and the layers at each depth hash their section in one
+        # `hash_many` call. That is a single pass over the section only with numpy and at least `MultiSeedThreshold`
+        # (16) layers; with fewer (as in typical binaries) it is quicker to hash each layers seed in turn, which it does.
+        for depth in range(max(map(len, chains), default=0)):
+
+            layers_by_section = {}
+
+            for chain in chains:
+                if depth < len(chain):
+                    layer = chain[depth]
+                    if depth > 0: layer.murmur_seed = chain[depth - 1].murmur_out
+                    section_address = layer.entry_points[0].hashed_section().header.sh_addr
+                    layers_by_section.setdefault(section_address, []).append(layer)
+
+            for layers in layers_by_section.values():
+                seeds = [ layer.murmur_seed for layer in layers ]
+                outputs = layers[0].entry_points[0].calculate_murmuroaat64_many(seeds, volatile_qwords, hash_type)
+                for layer, murmur_out in zip(layers, outputs):
+                    layer.murmur_out = murmur_out
 
         return non_volatile_state
 
@@ -134,16 +159,13 @@ class IncrementalIntegrity(IncrementalIntegrityBase):
                         hash_recalculation.elf.write(offset, murmur_bytes)
 
                 for xor_to_known in layer.xor_to_known:
-                    mask = xor_to_known.known_value ^ layer.murmur_out
-                    mask_bytes = pack("<Q", mask)
+                    mask_bytes = pack("<Q", xor_to_known.xor_mask(layer.murmur_out))
                     for offset in xor_to_known.xor_mask_offsets():
                         cls.Log.debug(f"> injecting XOR mask for chain '{chain.name}' layer #{index} at 0x{offset:016x} ({xor_to_known.section.name})")
                         xor_to_known.elf.write(offset, mask_bytes)
 
                 for insert_hash in layer.insert_hash:
-                    murmur = MurmurOaat64(layer.murmur_out)
-                    murmur.consume(insert_hash.expected_value)
-                    hash_bytes = pack("<Q", int(murmur))
+                    hash_bytes = pack("<Q", insert_hash.expected_hash(layer.murmur_out))
                     for offset in insert_hash.hash_offsets():
                         cls.Log.debug(f"> injecting murmur hash for known value in chain '{chain.name}' layer #{index} at 0x{offset:016x} ({insert_hash.section.name})")
-                        xor_to_known.elf.write(offset, hash_bytes)
\ No newline at end of file
+                        insert_hash.elf.write(offset, hash_bytes)
\ No newline at end of file
@@ -6,6 +6,7 @@ from struct import pack
 from elftools.elf.sections import Section
 
 #project imports
+from ebp.common.algorithm import MurmurOaat64
 from .incremental_integrity_base import IncrementalIntegrityBase
 
 ## The @ref InsertMurmur `Self` type
@@ -24,6 +25,9 @@ class InsertMurmur(IncrementalIntegrityBase):
     ##  This hash QWORD is considered volatile and will be omitted from hash checking.
     EXPECTED_MURMUR_OUTPUT = pack("<Q", 0xfea75ba5e64b10b5)
 
+    ## The magic values this type of section looks for in its region (see @ref MagicValueIndex).
+    MagicValues = IncrementalIntegrityBase.MagicValues + [ EXPECTED_MURMUR_OUTPUT ]
+
 
     ## Creates a new instance of the @ref InsertMurmur object.
     #  @param self the instance of the object that is invoking this method.
@@ -38,6 +42,16 @@ class InsertMurmur(IncrementalIntegrityBase):
         self.expected_value = expected_value
 
 
+    ## Calculates the hash of the expected value when seeded with the integrity hash.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param integrity_hash the integrity hash at this point in the chain.
+    #  @returns the hash to inject in place of EXPECTED_MURMUR_OUTPUT.
+    def expected_hash(self, integrity_hash:int) -> int:
+        murmur = MurmurOaat64(integrity_hash)
+        murmur.consume(self.expected_value)
+        return int(murmur)
+
+
     ## Returns an enumerator of offsets into this region of scoped memory that look like places to inject the expected hash value.
     #  @param self the instance of the object that is invoking this method.
     #  @returns an enumerator of virtual memory addresses which contain the placeholder value.
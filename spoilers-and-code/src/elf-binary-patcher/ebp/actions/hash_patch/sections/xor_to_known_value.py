@@ -22,6 +22,9 @@ class XorToKnownValue(IncrementalIntegrityBase):
     ##  This hash QWORD is considered volatile and will be omitted from hash checking.
     XOR_MASK_FOR_KNOWN_VALUE = pack("<Q", 0x5afe70bec0d3ab1e)
 
+    ## The magic values this type of section looks for in its region (see @ref MagicValueIndex).
+    MagicValues = IncrementalIntegrityBase.MagicValues + [ XOR_MASK_FOR_KNOWN_VALUE ]
+
     ## Creates a new instance of the @ref XorToKnownValue object.
     #  @param self the instance of the object that is invoking this method.
     #  @param section the section this descriptor was built from.
@@ -34,6 +37,14 @@ class XorToKnownValue(IncrementalIntegrityBase):
         super().__init__(section, start_address, end_address, sequence, order)
         self.known_value = known_value
 
+    ## Calculates the XOR mask that converts the integrity hash to the known value.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param integrity_hash the integrity hash at this point in the chain.
+    #  @returns the mask to inject in place of XOR_MASK_FOR_KNOWN_VALUE.
+    def xor_mask(self, integrity_hash:int) -> int:
+        return self.known_value ^ integrity_hash
+
+
     ## Returns an enumerator of offsets into this region of scoped memory that look like places to inject the required XOR mask.
     #  @param self the instance of the object that is invoking this method.
     #  @returns an enumerator of virtual memory addresses which contain the integrity seed placeholder.
@@ -4,6 +4,7 @@ from typing import TypeVar, Optional, List, Iterator
 from random import randint
 
 # project imports
+from ebp.common.patch_process import Elf
 from ebp.x64asm import (
     x64Instruction, InstructionList,
     INC_RBX, DEC_RBX, 
@@ -11,7 +12,6 @@ from ebp.x64asm import (
 )
 
 # third-party imports
-from pwnlib.elf import ELF
 from elftools.elf.sections import Section
 
 
@@ -72,7 +72,7 @@ class PatchState(object):
     #  @param patch_section the section that contains the string we are patching.
     #  @param virtual_memory_address the current virtual memory address where instructions will be inserted.
     #  @param kwargs keyword arguments used as additonal state information.
-    def __init__(self, elf:ELF, patch_section:Section, virtual_memory_address:int, **kwargs) -> PatchStateType:
+    def __init__(self, elf:Elf, patch_section:Section, virtual_memory_address:int, **kwargs) -> PatchStateType:
         self.section = patch_section
         self.elf = elf
         self.meta = kwargs
@@ -112,7 +112,7 @@ class GadgetList(list[GadgetBase]):
     #  @param elf the elf binary which we are patching.
     #  @param virtual_memory_address the virtual memory address of the first gadget.
     #  @returns iterator which yields an instruction list for each gadget in the list.
-    def compile_blocks_iter(self, elf:ELF, virtual_memory_address:int) -> Iterator[InstructionList]:
+    def compile_blocks_iter(self, elf:Elf, virtual_memory_address:int) -> Iterator[InstructionList]:
 
         parent_section = elf.get_section_containing(virtual_memory_address)
         patch_state = PatchState(elf, parent_section, virtual_memory_address)
@@ -128,7 +128,7 @@ class GadgetList(list[GadgetBase]):
     #  @param elf the elf binary which we are patching.
     #  @param virtual_memory_address the virtual memory address of the first gadget.
     #  @returns a list of @ref InstructionList objects.
-    def compile_blocks(self, elf:ELF, virtual_memory_address:int) -> list[InstructionList]:
+    def compile_blocks(self, elf:Elf, virtual_memory_address:int) -> list[InstructionList]:
         return [ asm for asm in self.compile_blocks_iter(elf, virtual_memory_address) ]
 
 
@@ -137,7 +137,7 @@ class GadgetList(list[GadgetBase]):
     #  @param elf the elf binary which we are patching.
     #  @param virtual_memory_address the virtual memory address of the first gadget.
     #  @returns iterator which yields instructions for the contained gadgets.
-    def compile_flat_iter(self, elf:ELF, virtual_memory_address:int) -> Iterator[x64Instruction]:
+    def compile_flat_iter(self, elf:Elf, virtual_memory_address:int) -> Iterator[x64Instruction]:
         for asm_block in self.compile_blocks_iter(elf, virtual_memory_address):
             yield from asm_block
         return
@@ -149,7 +149,7 @@ class GadgetList(list[GadgetBase]):
     #  @param elf the elf binary which we are patching.
     #  @param virtual_memory_address the virtual memory address of the first gadget.
     #  @returns list of instructions representing the contained gadgets.
-    def compile_flat(self, elf:ELF, virtual_memory_address:int) -> InstructionList:
+    def compile_flat(self, elf:Elf, virtual_memory_address:int) -> InstructionList:
         return InstructionList(self.compile_flat_iter(elf, virtual_memory_address))
 
 
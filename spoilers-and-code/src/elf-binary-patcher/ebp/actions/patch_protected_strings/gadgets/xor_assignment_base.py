@@ -9,6 +9,7 @@ from logging import getLogger
 from elftools.elf.sections import Section
 
 # project imports
+from ebp.common.prohibited_values import ProhibitedXorValues
 from .base import AssignmentGadgetBase, PatchState, StringCharacter
 from ebp.x64asm import (
     InstructionList,
@@ -34,12 +35,8 @@ SelfType = TypeVar('SelfType', bound='XorAssignmentBase')
 class XorAssignmentBase(AssignmentGadgetBase):
     
 
-    ## List of values we generally steer clear of for this type of assignment.
-    ProhibitedValues = [
-        0x00, # Really not useful for XOR operations - leaves the remainder to define the value - might was well be direct assignment.
-        0x90, # :kludge: 0x90 _could_ be an ASM NOP instruction, ASM NOPs are used to reserve space for patching so this value may change later.
-              #    ideal world we would track area's we've identified for patching, for now though its just easier to steer clear.
-    ]
+    ## List of values we generally steer clear of for this type of assignment (see @ref ProhibitedXorValues).
+    ProhibitedValues = ProhibitedXorValues
 
     ## The size of the assignment in bytes.
     # @remarks this must be set by derived class types appropriatly.
@@ -122,7 +119,7 @@ class XorAssignmentBase(AssignmentGadgetBase):
         current_offset = 0
         byte_validity = lambda byte_: byte_ not in self.ProhibitedValues
 
-        for does_not_contain_prohibited_values, bytes_iter in groupby(section.data(), key=byte_validity):
+        for does_not_contain_prohibited_values, bytes_iter in groupby(section.elffile.section_bytes(section), key=byte_validity):
             
             byte_list = list(bytes_iter)
             bytes_length = len(byte_list)
@@ -160,7 +157,7 @@ class XorAssignmentBase(AssignmentGadgetBase):
             offset_index = randint(0, len(valid_byte_source_offsets) - 1)
             selected_offset = valid_byte_source_offsets.pop(offset_index)
             virtual_address = section.header.sh_addr + selected_offset
-            selected_bytes = section.data()[selected_offset: selected_offset + size]
+            selected_bytes = section.elffile.section_bytes(section)[selected_offset: selected_offset + size]
             
             self.log.debug(f"Selected byte sequence 0x{selected_bytes.hex()} located at 0x{virtual_address:08x} (base+0x{selected_offset}) for XOR base.")
 
@@ -191,7 +188,7 @@ class XorAssignmentBase(AssignmentGadgetBase):
         volatile_regions = get_volatile_regions(section.elffile)
         
         offsets = []
-        section_data = section.data()
+        section_data = section.elffile.section_bytes(section)
         index = section_data.find(byte_)
 
         while index >= 0:
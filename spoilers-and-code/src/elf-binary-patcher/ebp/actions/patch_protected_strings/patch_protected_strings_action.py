@@ -4,10 +4,8 @@ from random import shuffle
 from typing import List
 from pathlib import Path
 
-# third-party imports
-from pwnlib.elf import ELF
-
 # project imports
+from ebp.common.patch_process import Elf
 from ebp.actions.base import InOutPatchActionBase, VolatileLocation, VolatileLocationList
 from .protected_string import ProtectedString
 from .gadgets import available_assignment_gadgets, available_junk_gadgets, StringCharacter
@@ -148,7 +146,7 @@ class PatchProtectedStringsAction(InOutPatchActionBase):
     #  @param elf the elf to locate volatile regions in.
     #  @returns a list of volatile regions in the binary.
     @classmethod
-    def volatile_locations(cls, elf:ELF) -> VolatileLocationList:
+    def volatile_locations(cls, elf:Elf) -> VolatileLocationList:
         
         protected_string_volatiles = []
         protected_string_list = list( ProtectedString.fromElf(elf) )
@@ -167,6 +165,17 @@ class PatchProtectedStringsAction(InOutPatchActionBase):
         
 
 
+    ## Returns a list of the locations of the annotations this action reads from the binary.
+    #  @param cls the type of class invoking this method.
+    #  @param elf the elf to locate annotations in.
+    #  @returns a list of the regions in the binary that hold this actions annotations.
+    @classmethod
+    def annotation_locations(cls, elf:Elf) -> VolatileLocationList:
+        return VolatileLocationList(
+            VolatileLocation(section.header.sh_addr, section.header.sh_size) for section in ProtectedString.annotation_sections(elf)
+        )
+
+
     ## Invokes this action on an ELF file.
     #  This action will take protected strings from the binary and inject code to build the required strings.
     #  @param elf the ELF file this action should operate on.
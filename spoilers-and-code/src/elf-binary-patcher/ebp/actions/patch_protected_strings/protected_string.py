@@ -2,12 +2,15 @@
 from typing import Iterable, Iterator
 
 # python imports
-from typing import TypeVar
+from struct import Struct
+from typing import List, TypeVar
 
 # third-party imports
-from pwnlib.elf import ELF
 from elftools.elf.sections import Section
-from elftools.construct import Struct, Container, Array
+
+# project imports
+from ebp.common.patch_process import Elf
+from ebp.common.annotation_table import AnnotationTable, AnnotationTableEntry
 
 
 ## The @ref ProtectedString `Self` type
@@ -29,16 +32,54 @@ class ProtectedString(object):
     MaximumAsmPreamble:int = 0x10
 
 
+    ## Layouts of the fixed part of a protected string section entry; keyed by ELF class and endianness.
+    #  This is the `reservation_virtual_memory_address` (an `Elf_addr`) followed by the `reservation_size` (an 
+    #  `Elf_word`); the expected string follows immediately after.
+    EntryLayouts = {
+        (64, True): Struct("<QI"),
+        (64, False): Struct(">QI"),
+        (32, True): Struct("<II"),
+        (32, False): Struct(">II"),
+    }
+
+
+    ## Layouts of the fixed part of a protected string annotation table entry; keyed by endianness.
+    #  This is the `reservation_virtual_memory_address`, the `reservation_size` and the `expected_string_size`; the
+    #  expected string follows immediately after (padded to fill the record). Annotation tables are only used in
+    #  64-bit binaries.
+    TableEntryLayouts = {
+        True: Struct("<QII"),
+        False: Struct(">QII"),
+    }
+
+
     ## Gets an iterator of @ref ProtectedString sections from the give @p elf.
+    #  Entries are read from the binaries annotation table if it has one, else from its `.protected-string-entry` sections.
     #  @param elf the ELF binary to extract @ref ProtectedString sections from.
     #  @returns an iterator of sections extracted from the ELF file.
     @classmethod
-    def fromElf(cls, elf:ELF) -> Iterator[SelfType]:
-        for section in elf.iter_sections():
-            if section.name.startswith(cls.SectionNamePrefix):
-                yield cls.fromSection(section)
+    def fromElf(cls, elf:Elf) -> Iterator[SelfType]:
+        annotation_table = AnnotationTable.fromElf(elf)
+        if annotation_table:
+            for entry in annotation_table.entries(AnnotationTable.ProtectedString):
+                yield cls.fromTableEntry(entry)
+            return
+        for section in cls.annotation_sections(elf):
+            yield cls.fromSection(section)
         return
         yield
+
+
+    ## Gets the sections of the give @p elf that hold protected string annotations.
+    #  @param cls the type of class that is invoking this method.
+    #  @param elf the ELF binary to find the sections in.
+    #  @returns a list of the annotation table, if the binary has one, else the `.protected-string-entry` sections.
+    @classmethod
+    def annotation_sections(cls, elf:Elf) -> List[Section]:
+        annotation_table = elf.get_section_by_name(AnnotationTable.SectionName)
+        if annotation_table:
+            return [ annotation_table ]
+        return [ section for section in elf.iter_sections() if section.name.startswith(cls.SectionNamePrefix) ]
         
 
     ## Converts a `elftools.elf.sections.Section` into an @ref ProtectedString.
@@ -49,17 +90,29 @@ class ProtectedString(object):
     @classmethod
     def fromSection(cls, section:Section) -> SelfType:
 
-        section_struct = Struct('protected_string_section_entry',
-            section.structs.Elf_addr('reservation_virtual_memory_address'),
-            section.structs.Elf_word('reservation_size')
-        )
-
+        elffile = section.elffile
+        entry_layout = cls.EntryLayouts[(elffile.elfclass, elffile.little_endian)]
         section_data = section.data()
-        header_size = section_struct.sizeof()
-        section_header = section_struct.parse( section.data() ) 
 
+        reservation_virtual_memory_address, reservation_size = entry_layout.unpack_from(section_data)
+
+        return cls(section, reservation_virtual_memory_address, reservation_size, section_data[entry_layout.size:])
+
+
+    ## Converts a protected string @ref AnnotationTableEntry into an @ref ProtectedString.
+    #  As with @ref fromSection there is no error handling here; beyond discarding the padding after the string.
+    #  @param entry the annotation table entry to convert into a @ref ProtectedString.
+    #  @returns ProtectedString interpretation of the data.
+    @classmethod
+    def fromTableEntry(cls, entry:AnnotationTableEntry) -> SelfType:
+
+        entry_layout = cls.TableEntryLayouts[entry.elffile.little_endian]
+        entry_data = entry.data()
+
+        reservation_virtual_memory_address, reservation_size, expected_string_size = entry_layout.unpack_from(entry_data)
+        expected_string = entry_data[entry_layout.size : entry_layout.size + expected_string_size]
 
-        return cls(section, section_header, section_data[header_size:])
+        return cls(entry, reservation_virtual_memory_address, reservation_size, expected_string)
 
 
     ## Locates and verifies the virtual memory address for the protected string.
@@ -102,11 +155,14 @@ class ProtectedString(object):
 
     ## Instanciates a new @ref ProtectedString object.
     #  @param self the instance of the object that is invoking this method.
-    #  @param section the `elftools.elf.sections.Section` object the data was read from.
-    #  @param data the data that was extracted from this section.
-    def __init__(self, section:Section, data:Container, expected_string:bytes) -> SelfType:
+    #  @param section the `elftools.elf.sections.Section` (or @ref AnnotationTableEntry) object the data was read from.
+    #  @param reservation_virtual_memory_address the address of the label recorded before the reservation.
+    #  @param reservation_size the number of bytes that were reserved for the string.
+    #  @param expected_string the string that should be built in the reservation.
+    def __init__(self, section:Section, reservation_virtual_memory_address:int, reservation_size:int, expected_string:bytes) -> SelfType:
         self._section = section
-        self._data = data
+        self._reservation_virtual_memory_address = reservation_virtual_memory_address
+        self._reservation_size = reservation_size
         self.expected_string = expected_string
         self.virtual_memory_address = self.locate_virtual_memory_address()
 
@@ -118,7 +174,7 @@ class ProtectedString(object):
 
     ## The ELF file that contained this objects source section.
     @property
-    def elf(self) -> ELF:
+    def elf(self) -> Elf:
         return self._section.elffile
 
 
@@ -134,10 +190,10 @@ class ProtectedString(object):
     #  This is where the label was inserted.
     @property
     def virtual_memory_address_label(self) -> int:
-        return self._data.reservation_virtual_memory_address
+        return self._reservation_virtual_memory_address
 
 
     ## The size of the reserved space. Used for validation purposes.
     @property
     def reservation_size(self) -> int:
-        return self._data.reservation_size
\ No newline at end of file
+        return self._reservation_size
\ No newline at end of file
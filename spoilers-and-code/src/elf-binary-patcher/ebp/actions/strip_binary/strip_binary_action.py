@@ -6,10 +6,10 @@ from typing import List
 from pathlib import Path
 
 # third-party imports
-from pwnlib.elf import ELF
 from elftools.elf.sections import Section
 
 # project imports
+from ebp.common.patch_process import Elf
 from ebp.actions.base import InOutPatchActionBase, VolatileLocationList
 
 
@@ -33,7 +33,7 @@ class StringBinaryAction(InOutPatchActionBase):
     #  @param elf the elf to locate volatile regions in.
     #  @returns a list of volatile regions in the binary.
     @classmethod
-    def volatile_locations(cls, elf:ELF) -> VolatileLocationList:        
+    def volatile_locations(cls, elf:Elf) -> VolatileLocationList:        
         # @tdb don't current need to worry about this - its done after any active patching.
         protected_string_volatiles = []
         return protected_string_volatiles
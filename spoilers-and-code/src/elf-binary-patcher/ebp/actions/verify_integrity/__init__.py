@@ -0,0 +1,10 @@
+# project imports
+from .verify_integrity_action import VerifyIntegrityAction
+from .integrity_verifier import IntegrityVerifier, IntegrityReport
+
+## `ebp.actions.verify_integrity` module wildcard imports
+__all__ = [
+    "VerifyIntegrityAction",
+    "IntegrityVerifier",
+    "IntegrityReport"
+]
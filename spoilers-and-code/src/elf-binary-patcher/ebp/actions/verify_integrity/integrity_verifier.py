@@ -0,0 +1,281 @@
+# python imports
+from struct import unpack_from
+from time import monotonic
+from typing import Callable, Dict, List, Tuple, TypeVar
+from pathlib import Path
+
+# project imports
+from ebp.common.patch_process import Elf
+from ebp.actions.hash_patch.hash_patch_sections import HashPatchSections
+from ebp.actions.hash_patch.sections import IncrementalIntegrity, HashGenerator
+from ebp.actions.hash_patch.sections.base import HashPatchSectionBase
+from ebp.actions.hash_patch.sections.incremental_integrity_base import IncrementalIntegrityChain, IncrementalIntegrityLayer
+
+
+## The @ref IntegrityReport `Self` type
+ReportType = TypeVar('ReportType', bound='IntegrityReport')
+
+## The @ref IntegrityVerifier `Self` type
+SelfType = TypeVar('SelfType', bound='IntegrityVerifier')
+
+
+## The outcome of verifying a single binary.
+#  This is returned from worker processes, so only holds plain values.
+class IntegrityReport(object):
+
+    ## Creates a new (empty) report.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param path the path of the binary that was verified.
+    def __init__(self, path:Path) -> ReportType:
+        self.path = path
+        self.checks = 0
+        self.failures = []
+        self.notes = []
+        self.elapsed = 0.0
+
+    ## Determines if the binary passed verification.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns True if every check passed, else False.
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    ## Computes the informal name of this object.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns a one line summary of the report.
+    def __str__(self) -> str:
+        outcome = "OK" if self.passed else f"FAILED ({len(self.failures)} problems)"
+        return f"{self.path}: {outcome} - {self.checks} checks in {self.elapsed * 1000:.1f}ms"
+
+
+
+## Verifies a binary that has been through the `hash-patch` action without running it.
+#
+# The skip array is read back out of the generator, and the hashed section is walked with it exactly as
+# "integrity.c" does at runtime. Each chain is then replayed a layer at a time; every volatile QWORD in a layers
+# regions is checked against the value that the chains hash requires there (an INTEGRITY_HASH, an XOR mask or
+# an inserted murmur).
+#
+# The seed of each chain is part of the hashed (but not volatile) code, so its location can't be recovered once
+# it has been patched; instead every QWORD in the root regions is tried as a seed, and candidates are dropped as
+# soon as a layer disagrees with them.
+class IntegrityVerifier(object):
+
+
+    ## Creates a new instance of the verifier.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param elf the patched binary to verify.
+    #  @param report the report to record results in.
+    def __init__(self, elf:Elf, report:IntegrityReport) -> SelfType:
+        self.elf = elf
+        self.report = report
+
+
+    ## Verifies the binary at the given path.
+    #  Used as the unit of work when verifying many files in parallel.
+    #  @param cls the type of class that is invoking this method.
+    #  @param path the path of the binary to verify.
+    #  @returns the report for the binary.
+    @classmethod
+    def verify_file(cls, path:Path) -> IntegrityReport:
+
+        started = monotonic()
+        report = IntegrityReport(path)
+
+        try:
+            verifier = cls(Elf(path, checksec=False), report)
+            verifier()
+        except RuntimeError as ex:
+            report.failures.append(str(ex))
+        finally:
+            report.elapsed = monotonic() - started
+
+        return report
+
+
+    ## Records the outcome of a check.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param passed whether the check passed.
+    #  @param failure the message to record if it did not.
+    def check(self, passed:bool, failure:str) -> bool:
+        self.report.checks += 1
+        if not passed:
+            self.report.failures.append(failure)
+        return passed
+
+
+    ## Reads a QWORD from the binary.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address to read from.
+    #  @returns the value of the QWORD.
+    def read_qword(self, address:int) -> int:
+        value, = unpack_from(HashPatchSectionBase.QWORD, self.elf.view(address, HashPatchSectionBase.SIZE_OF_QWORD))
+        return value
+
+
+    ## Reads the skip array every generator in the binary builds, and checks they agree.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param generators the generators in the binary.
+    #  @returns the volatile QWORDS, and the start and end of the memory that is walked.
+    def read_skips_array(self, generators:List[HashGenerator]) -> Tuple[List[int], int, int]:
+
+        if not generators:
+            raise RuntimeError("binary does not contain an integrity generator.")
+
+        skips_arrays = [ generator.read_skips_array() for generator in generators ]
+        volatile_qwords, virtual_memory_start, virtual_memory_ends = skips_arrays[0]
+
+        for generator, skips_array in zip(generators[1:], skips_arrays[1:]):
+            self.check(skips_array == skips_arrays[0], f"generator identified by section {generator.section.name} skips different memory to {generators[0].section.name}.")
+
+        section = self.elf.get_section_containing(virtual_memory_start)
+        self.check(section is not None and section.header.sh_addr == virtual_memory_start and section.header.sh_addr + section.header.sh_size == virtual_memory_ends,
+            f"generator walks 0x{virtual_memory_start:016x}-0x{virtual_memory_ends:016x} which is not a whole section.")
+
+        return volatile_qwords, virtual_memory_start, virtual_memory_ends
+
+
+    ## Attributes each volatile QWORD to the innermost region that contains it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param sections the sections in the binary.
+    #  @param volatile_qwords the volatile QWORDS the generator skips.
+    #  @returns a map of section to the volatile QWORDS in its region.
+    def attribute_volatile_qwords(self, sections:HashPatchSections, volatile_qwords:List[int]) -> Dict[HashPatchSectionBase, List[int]]:
+
+        attributed = { section: [] for section in sections }
+        region_size = lambda section: section.end_address - section.start_address
+
+        for volatile_qword in volatile_qwords:
+            owners = [ s for s in sections if s.start_address <= volatile_qword and volatile_qword + s.SIZE_OF_QWORD <= s.end_address ]
+            if self.check(bool(owners), f"volatile QWORD at 0x{volatile_qword:016x} is not in any integrity region."):
+                attributed[min(owners, key=region_size)].append(volatile_qword)
+
+        return attributed
+
+
+    ## Hashes the walked memory for a number of seeds, skipping the volatile QWORDS.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param seeds the seeds to hash with.
+    #  @param runs the (address, length) runs of memory the generator hashes.
+    #  @param hash_type the hash the generator walks memory with.
+    #  @returns the hash for each seed.
+    def hash_runs(self, seeds:List[int], runs:List[Tuple[int, int]], hash_type:type) -> List[int]:
+        states = list(seeds)
+        for address, length in runs:
+            states = hash_type.hash_many(states, self.elf.view(address, length))
+        return states
+
+
+    ## Gets every QWORD in the root regions of a chain that could be its seed.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param layer the root layer of the chain.
+    #  @param volatile_qwords the volatile QWORDS (these can't hold the seed).
+    #  @returns the candidate seeds.
+    def candidate_seeds(self, layer:IncrementalIntegrityLayer, volatile_qwords:List[int]) -> List[int]:
+
+        candidates = {}
+        size = HashPatchSectionBase.SIZE_OF_QWORD
+
+        for entry_point in layer.entry_points:
+            memory = entry_point.scoped_memory()
+            for offset in range(len(memory) - size + 1):
+                address = entry_point.start_address + offset
+                if not any( address < q + size and q < address + size for q in volatile_qwords ):
+                    candidates.setdefault(unpack_from(HashPatchSectionBase.QWORD, memory, offset)[0], None)
+
+        return list(candidates)
+
+
+    ## Gets the checks a layer makes of its hash.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param layer the layer to get the checks of.
+    #  @param attributed the volatile QWORDS in each sections region.
+    #  @returns a list of (description, predicate) for each patched value; the predicate takes the layers hash.
+    def layer_checks(self, layer:IncrementalIntegrityLayer, attributed:Dict[HashPatchSectionBase, List[int]]) -> List[Tuple[str, Callable[[int], bool]]]:
+
+        checks = []
+
+        for entry_point in layer.entry_points:
+            for address in attributed[entry_point]:
+                value = self.read_qword(address)
+                checks.append((f"integrity hash at 0x{address:016x} ({entry_point.section.name})", lambda h, v=value: h == v))
+
+        for xor_to_known in layer.xor_to_known:
+            self.check(bool(attributed[xor_to_known]), f"no XOR mask was found in {xor_to_known.section.name}.")
+            for address in attributed[xor_to_known]:
+                value = self.read_qword(address)
+                checks.append((f"XOR mask at 0x{address:016x} ({xor_to_known.section.name})", lambda h, v=value, s=xor_to_known: s.xor_mask(h) == v))
+
+        for insert_hash in layer.insert_hash:
+            self.check(bool(attributed[insert_hash]), f"no murmur hash was found in {insert_hash.section.name}.")
+            for address in attributed[insert_hash]:
+                value = self.read_qword(address)
+                checks.append((f"murmur hash at 0x{address:016x} ({insert_hash.section.name})", lambda h, v=value, s=insert_hash: s.expected_hash(h) == v))
+
+        return checks
+
+
+    ## Replays a chain, checking every value patched in to it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param chain the chain to replay.
+    #  @param attributed the volatile QWORDS in each sections region.
+    #  @param volatile_qwords the volatile QWORDS the generator skips.
+    #  @param runs the (address, length) runs of memory the generator hashes.
+    #  @param hash_type the hash the generator walks memory with.
+    def verify_chain(self, chain:IncrementalIntegrityChain, attributed:Dict[HashPatchSectionBase, List[int]], volatile_qwords:List[int],
+            runs:List[Tuple[int, int]], hash_type:type) -> None:
+
+        for index, layer in enumerate(chain):
+            if not self.check(bool(layer.entry_points), f"layer #{index} of chain '{chain.name}' contains no integrity hash."):
+                return
+
+        seeds = self.candidate_seeds(chain[0], volatile_qwords)
+        checked = 0
+
+        for index, layer in enumerate(chain):
+
+            hashes = self.hash_runs(seeds, runs, hash_type)
+            checks = self.layer_checks(layer, attributed)
+            surviving = [ (seed, h) for seed, h in zip(seeds, hashes) if all( predicate(h) for _, predicate in checks ) ]
+
+            if not surviving:
+                failed = sorted({ description for h in hashes for description, predicate in checks if not predicate(h) })
+                self.check(False, f"layer #{index} of chain '{chain.name}' is inconsistent with every candidate seed; " + "; ".join(failed))
+                return
+
+            self.report.checks += len(checks)
+            checked += len(checks)
+            seeds = [ h for _, h in surviving ]
+
+        if not checked:
+            self.report.notes.append(f"chain '{chain.name}' patches no values; there was nothing to check.")
+        elif len(seeds) > 1:
+            self.report.notes.append(f"chain '{chain.name}' is consistent with {len(seeds)} candidate seeds.")
+
+
+    ## Verifies the binary.
+    #  Results are recorded in the verifiers report.
+    #  @param self the instance of the object that is invoking this method.
+    def __call__(self) -> None:
+
+        sections = HashPatchSections.fromElf(self.elf)
+        generators = [ section for section in sections if isinstance(section, HashGenerator) ]
+        volatile_qwords, virtual_memory_start, virtual_memory_ends = self.read_skips_array(generators)
+
+        for section in sections:
+            for magic_value in section.MagicValues:
+                for address in section.locate_byte_sequence_in_scoped_memory(magic_value):
+                    self.check(False, f"unpatched placeholder 0x{magic_value[::-1].hex()} at 0x{address:016x} ({section.section.name}).")
+
+        runs = []
+        current_offset = virtual_memory_start
+        for volatile_qword in volatile_qwords:
+            runs.append((current_offset, volatile_qword - current_offset))
+            current_offset = volatile_qword + HashPatchSectionBase.SIZE_OF_QWORD
+        runs.append((current_offset, virtual_memory_ends - current_offset))
+
+        attributed = self.attribute_volatile_qwords(sections, volatile_qwords)
+        hash_type = sections.hash_type()
+
+        for chain in IncrementalIntegrity.build_chains(sections).values():
+            self.verify_chain(chain, attributed, volatile_qwords, runs, hash_type)
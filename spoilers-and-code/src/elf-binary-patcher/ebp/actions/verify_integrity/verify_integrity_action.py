@@ -0,0 +1,62 @@
+# python3 imports
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+
+# project imports
+from ebp.actions.base import ActionBase, InPatchActionBase
+from .integrity_verifier import IntegrityVerifier
+
+
+## "Verify Integrity" action.
+#  Checks that the integrity mechanisms of binaries that have been through `hash-patch` are consistent; without running them.
+#  The hash walk the binary will make at runtime is replayed from its patched bytes (see @ref IntegrityVerifier).
+class VerifyIntegrityAction(ActionBase):
+
+
+    ## The string entered on the CLI to invoke this action.
+    cli_command = "verify-integrity"
+
+    ## The help string presented on the CLI for this action when `--help` is used.
+    cli_help = "checks the integrity mechanisms of hash-patched binaries are consistent without running them."
+
+
+    ## Customises arguments for this specific action.
+    #  This method is invoked by `ElfBinaryPatcherArgs` when it is building an instance of itself.
+    #  @param argument_parser to subparser created for this commands arguments.
+    @classmethod
+    def configure_cli_parser(cls, argument_parser:ArgumentParser) -> None:
+        argument_parser.add_argument("elf", metavar="ELF", nargs="+", type=InPatchActionBase.ElfPathType,
+            help="The hash-patched ELF files to verify.")
+        argument_parser.add_argument("-j", "--jobs", type=int, default=cpu_count() or 1,
+            help="The number of files to verify in parallel.")
+
+
+    ## Invokes this action.
+    #  Verifies each ELF file given, in parallel if more than one job is allowed.
+    #  @returns patch process exit code.
+    def __call__(self) -> int:
+
+        exit_code = self.__class__.ExitSuccess
+        jobs = max(1, min(self.arguments.jobs, len(self.arguments.elf)))
+
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                reports = list(executor.map(IntegrityVerifier.verify_file, self.arguments.elf))
+        else:
+            reports = [ IntegrityVerifier.verify_file(path) for path in self.arguments.elf ]
+
+        for report in reports:
+            
+            for note in report.notes:
+                self.log.warning(f"{report.path}: {note}")
+            
+            if report.passed:
+                self.log.info(report)
+            else:
+                self.log.error(report)
+                for failure in report.failures:
+                    self.log.error(f"- {failure}")
+                exit_code = self.__class__.ExitRuntimeError
+
+        return exit_code
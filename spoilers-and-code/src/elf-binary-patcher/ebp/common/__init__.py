@@ -1,3 +1,7 @@
 # project imports
 from .patch_process import Elf
-from .hidden_string import HiddenString
\ No newline at end of file
+from .hidden_string import HiddenString
+from .hidden_string_seed_search import HiddenStringSeedSearch
+from .annotation_table import AnnotationTable, AnnotationTableEntry
+from .interval_index import IntervalIndex
+from .prohibited_values import ProhibitedXorValues
\ No newline at end of file
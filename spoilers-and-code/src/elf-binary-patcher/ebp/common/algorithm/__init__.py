@@ -1,9 +1,15 @@
 # ptoject imports
-from .mersenne_twister import MersenneTwister
-from .mumur_oaat import MurmurOaat64
+from .mersenne_twister import MersenneTwister, MersenneTwisterBase
+from .mersenne_twister_64 import MersenneTwister64
+from .mersenne_twister_cache import MersenneTwisterStateCache
+from .mumur_oaat import MurmurOaat64, MurmurOaat64Wordwise
 
 # wildcard imports for the `ebp.common.algorithm` module
 __all__ = [
     "MersenneTwister",
-    "MurmurOaat64"
+    "MersenneTwister64",
+    "MersenneTwisterBase",
+    "MersenneTwisterStateCache",
+    "MurmurOaat64",
+    "MurmurOaat64Wordwise"
 ]
\ No newline at end of file
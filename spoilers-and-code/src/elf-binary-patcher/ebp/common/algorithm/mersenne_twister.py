@@ -1,13 +1,23 @@
 # python imports
-from typing import TypeVar, Iterator
-from struct import pack
+from typing import TypeVar, Iterator, Sequence, TextIO, BinaryIO, List, Any, Callable, Optional
+from itertools import islice
+from struct import pack, unpack
+from array import array
+from mmap import mmap
+from pathlib import Path
+from sys import byteorder
 
+# project imports
+from .mersenne_twister_engine import DefaultTwisterEngine
+from .mersenne_twister_jump import MersenneTwisterJump
+from .mersenne_twister_cache import MersenneTwisterStateCache
 
-## The @ref MersenneTwister `Self` type
-SelfType = TypeVar('SelfType', bound='MersenneTwister')
 
+## The @ref MersenneTwisterBase `Self` type
+SelfType = TypeVar('SelfType', bound='MersenneTwisterBase')
 
-## Mersenne Twister PRNG
+
+## Mersenne Twister PRNG (common base)
 #
 # Simple PRNG used for predictable random number generation. We could have relied on an open 
 # source implementation but they usually come with features we don't need and may use 
@@ -15,16 +25,27 @@ SelfType = TypeVar('SelfType', bound='MersenneTwister')
 # generator in the binary, so it helps to be in full control of things.
 #
 # Base on; [Wikipedia's documentation for MT19937](https://en.wikipedia.org/wiki/Mersenne_Twister)
-class MersenneTwister(object):
+#
+# The state is twisted, and its outputs tempered, a whole block at a time by a block engine (see 
+# `mersenne_twister_engine.py`) - NumPy is used where it is installed, else a pure-python fallback.
+# Large skips are made with @ref jump; which takes time logarithmic in the distance (see @ref MersenneTwisterJump).
+# Seeded states are taken from @ref state_cache where possible, rather than re-running the initialisation.
+#
+# Carries the MT19937 parameters, but yields values only as words (@ref next_word); use @ref MersenneTwister
+# for `next_uint32` or @ref MersenneTwister64 for `next_uint64`. Code that takes either generator should type
+# against this class, and so only reach the word-sized interface.
+class MersenneTwisterBase(object):
 
 
+    ## Instance members - slotted as we can create a lot of these.
+    __slots__ = ( "engine", "state", "outputs", "index" )
+
     ## The size of the internal PRNG's state 
     #  "n: degree of recurrence" in documentation.
     MT19937_STATE_SIZE = 624
 
     ## The size of a word in bits
-    #  @remarks could consider using 64 in future - see MT19937-64 on wikipedia.
-    #     to relevant parameters - would also need to change internal data types.
+    #  @remarks see @ref MersenneTwister64 for the MT19937-64 variant.
     WORD_SIZE = 32
 
     ## Masks to ensure generated values fit in word size.
@@ -37,6 +58,15 @@ class MersenneTwister(object):
     ## All the other bits of the word
     BITMASK_32B_317LSB = ~BITMASK_32B_MSB
 
+    ## The bits of word `i` that are combined with the @ref TWIST_LOWER_MASK bits of word `i + 1` during a twist.
+    TWIST_UPPER_MASK = BITMASK_32B_MSB
+
+    ## The bits of word `i + 1` that are combined with the @ref TWIST_UPPER_MASK bits of word `i` during a twist.
+    TWIST_LOWER_MASK = WORD_MASK ^ BITMASK_32B_MSB
+
+    ## The engine used to twist/temper the state when one is not given.
+    DefaultEngine = DefaultTwisterEngine
+
 
 
     ## MT19937 'a' component
@@ -51,6 +81,10 @@ class MersenneTwister(object):
     #  TGFSR(R) tempering bitmasks
     MT19937_C = 0xefc60000
 
+    ## MT19937 'd' component
+    #  Additional Mersenne Twister tempering bitmask (all ones for MT19937).
+    MT19937_D = 0xffffffff
+
     ## MT19937 'f' component
     #  The constant f forms another parameter to the generator, though not part of the algorithm proper.
     #  @remarks The value for f for MT19937 is 1812433253
@@ -77,6 +111,24 @@ class MersenneTwister(object):
     MT19937_U = 0x0000000b
 
 
+    ## Skips shorter than this (in values) are made by twisting through the sequence rather than jumping.
+    #  A jump costs roughly the same as twisting ~50 blocks; so there is nothing to gain below that.
+    JUMP_THRESHOLD = 64 * MT19937_STATE_SIZE
+
+    ## Shared @ref MersenneTwisterJump helper - created on first use as building it takes a moment.
+    _jump_helper = None
+
+    ## The size of a word in bytes.
+    WORD_BYTES = WORD_SIZE // 8
+
+    ## The size of a serialised state (see @ref to_bytes) - N little-endian words followed by a uint16 index.
+    SerialisedSize = MT19937_STATE_SIZE * WORD_BYTES + 2
+
+    ## Cache of post-initialisation (and first twist) states, keyed by seed - or None to always seed from scratch.
+    #  Replace with a @ref MersenneTwisterStateCache that has a `directory` to persist states between runs.
+    state_cache = MersenneTwisterStateCache()
+
+
     ## Shortcut for generating a predefined sequence.
     #  @param cls the type of class that is invoking this method.
     #  @param seed the value to seed the generator with.
@@ -84,176 +136,517 @@ class MersenneTwister(object):
     #  @param count the number of values to generate.
     @classmethod 
     def generate(cls, seed:int, skip:int, count:int) -> list[int]:
-        mt = cls(seed)        
-        for _ in range(skip):  mt.next_uint32()
-        values = [ mt.next_uint32() for _ in range(count) ]
+        mt = cls(seed)
+        mt.jump(skip)
+        values = mt.next_block(count).tolist()
         return values
 
 
-    ## Instanciates a new @ref MersenneTwister object.
-    #  @param cls the type of object that is invoking this method.
+    ## Shortcut for lazily generating a predefined sequence.
+    #  Values are generated a block at a time as they are consumed; so memory use does not depend on @p count.
+    #  @param cls the type of class that is invoking this method.
+    #  @param seed the value to seed the generator with.
+    #  @param skip the number of values to skip.
+    #  @param count the number of values to generate.
+    #  @returns a generator that yields the values of the sequence.
+    @classmethod
+    def sequence(cls, seed:int, skip:int, count:int) -> Iterator[int]:
+        for block in cls.sequence_blocks(seed, skip, count):
+            yield from block.tolist()
+
+
+    ## Shortcut for lazily generating a predefined sequence a block at a time.
+    #  @param cls the type of class that is invoking this method.
+    #  @param seed the value to seed the generator with.
+    #  @param skip the number of values to skip.
+    #  @param count the number of values to generate.
+    #  @param block_size the (maximum) number of values in each block.
+    #  @returns a generator that yields buffers of 32-bit unsigned values (see @ref next_block).
+    @classmethod
+    def sequence_blocks(cls, seed:int, skip:int, count:int, block_size:int=0x4000) -> Iterator[Sequence[int]]:
+        mt = cls(seed)
+        mt.jump(skip)
+        while count > 0:
+            block = mt.next_block(min(count, block_size))
+            count -= len(block)
+            yield block
+
+
+    ## Generates the first @p count values of the sequence for each of a number of seeds.
+    #  Where the engine supports it the generators for all seeds are run in lockstep; each twist and temper
+    #  being a single operation over a 2-D array (one row per seed). Otherwise each seed is run in turn.
+    #  @param cls the type of class that is invoking this method.
+    #  @param seeds the values to seed the generators with.
+    #  @param count the number of values to generate for each seed.
+    #  @param engine the block engine to use (defaults to @ref DefaultEngine).
+    #  @returns a list holding a buffer of @p count values for each seed, in the order of @p seeds.
+    @classmethod
+    def generate_many(cls, seeds:Sequence[int], count:int, engine:Optional[type]=None) -> List[Sequence[int]]:
+
+        engine = engine or cls.DefaultEngine
+
+        if not engine.multi_state or not seeds:
+            return [ cls(seed, engine).next_block(count) for seed in seeds ]
+
+        states, blocks = engine.initial_states(cls, seeds), []
+        for _ in range(0, count, cls.MT19937_STATE_SIZE):
+            states = engine.twist(cls, states)
+            blocks.append( engine.temper(cls, states) )
+
+        values = engine.concatenate(blocks) if blocks else engine.empty().reshape(len(seeds), 0)
+        return list(values[:, :count])
+
+
+    ## Instanciates a new Mersenne Twister object.
+    #  @remarks the seed is truncated to 32-bits; matching the `unsigned int` seed taken by `twister.c`.
+    #  @param self the instance of the object that is invoking this method.
     #  @param seed the value used to intialise the PRNG state
-    def __init__(cls, seed:int=0) -> SelfType:
+    #  @param engine the block engine used to twist/temper the state (defaults to @ref DefaultEngine).
+    def __init__(self, seed:int=0, engine:Optional[type]=None) -> SelfType:
+        self.engine = engine = engine or self.DefaultEngine
+        if self.state_cache is None:
+            self.state = engine.buffer(self.initial_state(seed))
+            self.outputs = None
+            self.index = self.MT19937_STATE_SIZE
+        else:
+            self.set_bytes( self.state_cache.twisted_state(self.__class__, seed & self.WORD_MASK) )
+
+
+    ## Creates a Mersenne Twister from a serialised state.
+    #  @param cls the type of class that is invoking this method.
+    #  @param data the serialised state - as produced by @ref to_bytes.
+    #  @param engine the block engine used to twist/temper the state (defaults to @ref DefaultEngine).
+    #  @returns a generator that will continue the sequence from the serialised state.
+    @classmethod
+    def fromBytes(cls, data:bytes, engine:Optional[type]=None) -> SelfType:
+        mt = cls.__new__(cls)
+        mt.engine = engine or cls.DefaultEngine
+        mt.set_bytes(data)
+        return mt
+
+
+    ## Packs a state block and index into the compact serialised form.
+    #  @param cls the type of class that is invoking this method.
+    #  @param engine the engine that owns @p state.
+    #  @param state the N state words.
+    #  @param index the index of the next value to be consumed from the block.
+    #  @returns the serialised state (see @ref SerialisedSize).
+    @classmethod
+    def pack_state(cls, engine:type, state:Sequence[int], index:int) -> bytes:
+        return engine.to_bytes(state) + pack("<H", index)
 
-        cls.index = 1
-        cls.state = [ seed ] * cls.__class__.MT19937_STATE_SIZE
 
-        while(cls.index < cls.__class__.MT19937_STATE_SIZE):
-            
-            v = cls.state[cls.index -1]
+    ## Serialises the current state of the generator.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the compact serialised state - N little-endian words followed by a uint16 index.
+    def to_bytes(self) -> bytes:
+        return self.pack_state(self.engine, self.state, self.index)
 
-            cls.state[cls.index] = (cls.__class__.MT19937_F * (
-                v ^ (v >> (cls.__class__.WORD_SIZE - 2))
-            ) + cls.index) & cls.__class__.WORD_MASK
 
-            cls.index += 1
+    ## Restores a serialised state (see @ref to_bytes).
+    #  @param self the instance of the object that is invoking this method.
+    #  @param data the serialised state.
+    def set_bytes(self, data:bytes) -> None:
 
+        if len(data) != self.SerialisedSize:
+            raise RuntimeError(f"Serialised {self.__class__.__name__} state should be {self.SerialisedSize} bytes, got {len(data)}.")
 
-    ## "Twist" internal state
-    #  Progresses the internal state when all current values have been consumed.
-    #  @param cls the type of object that is invoking this method.
-    def _twist(cls) -> None:
+        state_size = self.MT19937_STATE_SIZE * self.WORD_BYTES
+        self.setstate( (self.engine.from_bytes(data[:state_size]), unpack("<H", data[state_size:])[0]) )
 
-        for index in range(0, cls.__class__.MT19937_STATE_SIZE):
-            next_index = (index + 1) % cls.__class__.MT19937_STATE_SIZE
-            take_index = (index + cls.__class__.MT19937_M) % cls.__class__.MT19937_STATE_SIZE
 
-            x = (cls.state[index] & cls.__class__.BITMASK_32B_MSB) | \
-                (cls.state[next_index] & cls.__class__.BITMASK_32B_317LSB)
+    ## Gets the current state of the generator.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns a tuple of the N state words, and the index of the next value to consume from them.
+    def getstate(self) -> tuple[tuple[int, ...], int]:
+        return tuple(self.state.tolist()), self.index
 
-            xA = x >> 1
 
-            cls.state[index] = cls.state[take_index] ^ (
-                xA ^ cls.__class__.MT19937_A if x % 2 == 1 else xA
-            )
-        
-        cls.index = 0
+    ## Restores a state returned by @ref getstate.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param state a tuple of the N state words, and the index of the next value to consume from them.
+    def setstate(self, state:tuple[Sequence[int], int]) -> None:
 
-    ## Generates the next unsigned 32bit number in the PRNGs sequence.
-    #  @param cls the type of object that is invoking this method.
+        words, index = state
+
+        if len(words) != self.MT19937_STATE_SIZE or not 0 <= index <= self.MT19937_STATE_SIZE:
+            raise RuntimeError(f"Invalid {self.__class__.__name__} state; expected {self.MT19937_STATE_SIZE} words and an index in range.")
+
+        self.state = self.engine.buffer(words)
+        self.index = index
+        self.outputs = self.engine.temper(self.__class__, self.state) if index < self.MT19937_STATE_SIZE else None
+
+
+    ## Calculates the initial (untwisted) state for a given seed.
+    #  @param cls the type of class that is invoking this method.
+    #  @param seed the value used to intialise the PRNG state
+    #  @returns a list of the N words that make up the initial state.
+    @classmethod
+    def initial_state(cls, seed:int) -> list[int]:
+
+        f, shift, mask = cls.MT19937_F, cls.WORD_SIZE - 2, cls.WORD_MASK
+
+        v = seed & mask
+        state = [ v ]
+
+        for index in range(1, cls.MT19937_STATE_SIZE):
+            v = (f * (v ^ (v >> shift)) + index) & mask
+            state.append(v)
+
+        return state
+
+
+    ## "Twist" internal state
+    #  Progresses the internal state when all current values have been consumed, and tempers the 
+    #  whole block of outputs the new state will yield.
+    #  @param self the instance of the object that is invoking this method.
+    def _twist(self) -> None:
+        self.state = self.engine.twist(self.__class__, self.state)
+        self.outputs = self.engine.temper(self.__class__, self.state)
+        self.index = 0
+
+
+    ## Generates the next word (unsigned 32bit number for MT19937) in the PRNGs sequence.
+    #  @param self the instance of the object that is invoking this method.
     #  @returns the next number from the PRNG's random sequence.
-    def next_uint32(cls) -> int:
+    def next_word(self) -> int:
         
-        if cls.index >= cls.__class__.MT19937_STATE_SIZE:
-            cls._twist()
+        if self.index >= self.MT19937_STATE_SIZE:
+            self._twist()
+
+        y = self.outputs[self.index]
+        self.index += 1
+
+        return int(y)
+
+
+    ## Generates the next @p count words in the PRNGs sequence.
+    #  Whole blocks are twisted and tempered at once; the values are identical to calling @ref next_word 
+    #  @p count times.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param count the number of values to generate.
+    #  @returns a buffer of unsigned words (a NumPy array or `array` depending on engine).
+    def next_block(self, count:int) -> Sequence[int]:
+
+        blocks = []
+
+        while count > 0:
+
+            if self.index >= self.MT19937_STATE_SIZE:
+                self._twist()
+
+            take = min(count, self.MT19937_STATE_SIZE - self.index)
+            blocks.append(self.outputs[self.index:self.index + take])
+            self.index += take
+            count -= take
+
+        return self.engine.concatenate(blocks)
+
+
+    ## Discards the next @p count values in the PRNGs sequence.
+    #  Discarded blocks are twisted, but are never tempered.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param count the number of values to skip over.
+    def discard(self, count:int) -> None:
+
+        index = self.index + count
+
+        if index > self.MT19937_STATE_SIZE:
+
+            twists, index = divmod(index, self.MT19937_STATE_SIZE)
+
+            # leave the final block untwisted if we land on its boundary - `next_word` will twist it when needed.
+            if index == 0:
+                twists, index = twists - 1, self.MT19937_STATE_SIZE
 
-        y = cls.state[cls.index]
-        y = y ^ ((y >> cls.__class__.MT19937_U) & cls.__class__.WORD_MASK)
-        y = y ^ ((y << cls.__class__.MT19937_S) & cls.__class__.MT19937_B)
-        y = y ^ ((y << cls.__class__.MT19937_T) & cls.__class__.MT19937_C)
-        y = y ^ (y >> cls.__class__.MT19937_L)
+            for _ in range(twists - 1):
+                self.state = self.engine.twist(self.__class__, self.state)
+            self._twist()
 
-        cls.index += 1
+        self.index = index
+
+
+    ## Gets the (shared) jump-ahead helper for this generator type.
+    #  @param cls the type of class that is invoking this method.
+    #  @returns the @ref MersenneTwisterJump helper.
+    @classmethod
+    def jump_helper(cls) -> MersenneTwisterJump:
+        # looked up on the class itself; as each generator type has its own recurrence.
+        if cls.__dict__.get("_jump_helper", None) is None:
+            cls._jump_helper = MersenneTwisterJump(cls)
+        return cls._jump_helper
+
+
+    ## Moves the generator forward by @p count values.
+    #  Has the same effect as @ref discard, but long distances are covered in O(log count) time by jumping
+    #  directly to the target block rather than twisting through every block in between.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param count the number of values to skip over.
+    def jump(self, count:int) -> None:
+
+        if count < self.JUMP_THRESHOLD:
+            return self.discard(count)
+
+        # jumping is only valid from a twisted block; the initial state does not follow the recurrence.
+        if self.index >= self.MT19937_STATE_SIZE:
+            self.state = self.engine.twist(self.__class__, self.state)
+            self.index = 0
+
+        distance, index = divmod(self.index + count, self.MT19937_STATE_SIZE)
+
+        self.state = self.jump_helper().jump_state(self.engine, self.state, distance * self.MT19937_STATE_SIZE)
+        self.outputs = self.engine.temper(self.__class__, self.state)
+        self.index = index
 
-        return y & cls.__class__.WORD_MASK
-    
 
 
 
 ### Encoders to take the MT sequence and present the value in a defined manner.
+#  Encoders consume the sequence lazily and write their output to a stream in fixed-size chunks; so memory
+#  use does not grow with the length of the sequence.
 class MtSequenceEncoders(object):
 
-    ## Prints the given sequence, one value at a time as a decimal value.
+
+    ## The number of values formatted and written out at a time.
+    ChunkSize = 0x4000
+
+    ## Pre-formatted hex strings for every byte value (formatting bytes is the hot path for char arrays).
+    ByteHex = [ f"0x{b:02x}" for b in range(0x100) ]
+
+    ## The C type, and `struct`/`array` type code, for each supported word size (in bytes).
+    #  4 byte words are produced by @ref MersenneTwister, 8 byte words by MersenneTwister64.
+    WordTypes = { 4: ("unsigned int", "I"), 8: ("unsigned long", "Q") }
+
+
+    ## Splits an iterator into lists of (at most) @p size items.
     #  @param cls the type of object that is invoking this method.
+    #  @param generator the generator to split.
+    #  @param size the maximum number of items in each chunk.
+    #  @returns a generator of lists; the last of which may be short.
+    @classmethod
+    def _chunks(cls, generator:Iterator[Any], size:int) -> Iterator[List[Any]]:
+        generator = iter(generator)
+        chunk = list(islice(generator, size))
+        while chunk:
+            yield chunk
+            chunk = list(islice(generator, size))
+
+
+    ## Writes the given sequence out, one value per line, using a given format.
+    #  @param cls the type of object that is invoking this method.
+    #  @param stream the stream to write the encoded sequence to.
     #  @param generator the generator that will yield the sequence values.
-    #  @returns the string value used to express the sequence in the requested format.
+    #  @param format the format string used to express each value.
     @classmethod
-    def one_per_line_dec(cls, generator:Iterator[int]) -> str:
-        return "\n".join( map(str, generator ))
+    def _one_per_line(cls, stream:TextIO, generator:Iterator[int], format:str) -> None:
+        for chunk in cls._chunks(generator, cls.ChunkSize):
+            stream.write( "".join( format.format(v) for v in chunk ) )
 
 
-    ## Prints the given sequence, one value at a time as a hexadecimal value.
+    ## Writes the given sequence, one value at a time as a decimal value.
     #  @param cls the type of object that is invoking this method.
+    #  @param stream the stream to write the encoded sequence to.
     #  @param generator the generator that will yield the sequence values.
-    #  @returns the string value used to express the sequence in the requested format.
     @classmethod
-    def one_per_line_hex(cls, generator:Iterator[int]) -> str:
-        hex = lambda v: f"0x{v:08x}"
-        return "\n".join( map(hex, generator ))
+    def one_per_line_dec(cls, stream:TextIO, generator:Iterator[int]) -> None:
+        cls._one_per_line(stream, generator, "{0}\n")
 
 
-    ## Prints the given sequence as a C `unsigned int` array.
+    ## Writes the given sequence, one value at a time as a hexadecimal value.
     #  @param cls the type of object that is invoking this method.
-    #  @param variable_name name of the c variable to build the array on.
+    #  @param stream the stream to write the encoded sequence to.
     #  @param generator the generator that will yield the sequence values.
+    #  @param word_size the size of each value in bytes (sets the number of digits shown).
+    @classmethod
+    def one_per_line_hex(cls, stream:TextIO, generator:Iterator[int], word_size:int=4) -> None:
+        cls._one_per_line(stream, generator, f"0x{{0:0{word_size * 2}x}}\n")
+
+
+    ## Writes the given sequence as a C array.
+    #  @param cls the type of object that is invoking this method.
+    #  @param stream the stream to write the encoded sequence to.
+    #  @param declaration the C declaration of the array (everything before the `=`).
+    #  @param generator the generator that will yield the sequence values.
+    #  @param format callable used to express each value as a string.
     #  @param tab_size the number of spaces to use for a tab in output.
     #  @param items_per_line number of array elements per c source line.
-    #  @returns the string value used to express the sequence in the requested format.
     @classmethod
-    def c_uint_array(cls, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=16) -> str:
-        
-        lines = [f"unsigned int {variable_name}[] = {{"]
+    def _c_array(cls, stream:TextIO, declaration:str, generator:Iterator[int], format:Callable[[int], str], tab_size:int, items_per_line:int) -> None:
+
+        stream.write(f"{declaration} = {{")
+
         tab = " " * tab_size
-        leading_comma = ""
-        
-        for index, v in enumerate(generator):
-            lines[-1] += leading_comma
-            if index % items_per_line == 0: 
-                lines.append(tab)
-            lines[-1] += f"0x{v:08x}"            
-            leading_comma = ", "
+        line_separator = "\n"
+        chunk_size = max(1, cls.ChunkSize // items_per_line) * items_per_line
 
-        lines.append("}")
+        for chunk in cls._chunks(generator, chunk_size):
+            values = list(map(format, chunk))
+            lines = [ tab + ", ".join(values[i:i + items_per_line]) for i in range(0, len(values), items_per_line) ]
+            stream.write( line_separator + ", \n".join(lines) )
+            line_separator = ", \n"
 
-        return "\n".join(lines)
+        stream.write("\n}\n")
 
 
-    ## Prints the given sequence as a C `unsigned char` array.
+    ## Writes the given sequence as a C `unsigned int` array (`unsigned long` for 8 byte words).
+    #  @param cls the type of object that is invoking this method.
+    #  @param stream the stream to write the encoded sequence to.
+    #  @param variable_name name of the c variable to build the array on.
+    #  @param generator the generator that will yield the sequence values.
+    #  @param tab_size the number of spaces to use for a tab in output.
+    #  @param items_per_line number of array elements per c source line.
+    #  @param word_size the size of each value in bytes.
+    @classmethod
+    def c_uint_array(cls, stream:TextIO, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=16, word_size:int=4) -> None:
+        c_type, _ = cls.WordTypes[word_size]
+        cls._c_array(stream, f"{c_type} {variable_name}[]", generator, f"0x{{0:0{word_size * 2}x}}".format, tab_size, items_per_line)
+
+
+    ## Writes the given sequence as a C `unsigned char` array.
     #  @remarks NOTE that this is never invoked directly - instead a wrapper is provided that
     #     handles converting the MT int32 values into a steam of 4 single bytes first.
     #  @param cls the type of object that is invoking this method.
+    #  @param stream the stream to write the encoded sequence to.
     #  @param variable_name name of the c variable to build the array on.
     #  @param generator the generator that will yield the sequence values.
     #  @param tab_size the number of spaces to use for a tab in output.
     #  @param items_per_line number of array elements per c source line.
-    #  @returns the string value used to express the sequence in the requested format.
     @classmethod
-    def _c_char_array(cls, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=32) -> str:
-        
-        lines = [f"unsigned char {variable_name}[] = {{"]
-        tab = " " * tab_size
-        leading_comma = ""
-        
-        for index, v in enumerate(generator):
-            lines[-1] += leading_comma
-            if index % items_per_line == 0: 
-                lines.append(tab)
-            lines[-1] += f"0x{v:02x}"            
-            leading_comma = ", "
+    def _c_char_array(cls, stream:TextIO, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=32) -> None:
+        cls._c_array(stream, f"unsigned char {variable_name}[]", generator, cls.ByteHex.__getitem__, tab_size, items_per_line)
+
 
-        lines.append("}")
+    ## Converts a sequence of words into a stream of bytes.
+    #  @param cls the type of object that is invoking this method.
+    #  @param generator the generator that will yield the sequence values.
+    #  @param byte_order the struct byte order character (`<` or `>`).
+    #  @param word_size the size of each value in bytes.
+    #  @returns a generator yielding the individual bytes of each value.
+    @classmethod
+    def _word_bytes(cls, generator:Iterator[int], byte_order:str, word_size:int=4) -> Iterator[int]:
+        _, type_code = cls.WordTypes[word_size]
+        for chunk in cls._chunks(generator, cls.ChunkSize):
+            yield from pack(f"{byte_order}{len(chunk)}{type_code}", *chunk)
 
-        return "\n".join(lines)
 
-    ## Prints the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a little endian value.
+    ## Writes the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a little endian value.
     #  @param cls the type of object that is invoking this method.
+    #  @param stream the stream to write the encoded sequence to.
     #  @param variable_name name of the c variable to build the array on.
     #  @param generator the generator that will yield the sequence values.
     #  @param tab_size the number of spaces to use for a tab in output.
     #  @param items_per_line number of array elements per c source line.
-    #  @returns the string value used to express the sequence in the requested format.
+    #  @param word_size the size of each value in bytes.
     @classmethod
-    def c_char_array_le(cls, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=32) -> str:
-        
-        def char_generator_for_little_endian():
-            for uint32 in generator:
-                yield from pack("<I", uint32)
-
-        return cls._c_char_array(variable_name, char_generator_for_little_endian(), tab_size, items_per_line)
+    def c_char_array_le(cls, stream:TextIO, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=32, word_size:int=4) -> None:
+        cls._c_char_array(stream, variable_name, cls._word_bytes(generator, "<", word_size), tab_size, items_per_line)
 
 
-    ## Prints the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a big endian value.
+    ## Writes the given sequence as a C `unsigned char` array with each MT uint32 being interpretted as a big endian value.
     #  @param cls the type of object that is invoking this method.
+    #  @param stream the stream to write the encoded sequence to.
     #  @param variable_name name of the c variable to build the array on.
     #  @param generator the generator that will yield the sequence values.
     #  @param tab_size the number of spaces to use for a tab in output.
     #  @param items_per_line number of array elements per c source line.
-    #  @returns the string value used to express the sequence in the requested format.   
+    #  @param word_size the size of each value in bytes.
     @classmethod
-    def c_char_array_be(cls, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=32) -> str:
-        
-        def char_generator_for_big_endian():
-            for uint32 in generator:
-                yield from pack(">I", uint32)
+    def c_char_array_be(cls, stream:TextIO, variable_name:str, generator:Iterator[int], tab_size:int = 4, items_per_line:int=32, word_size:int=4) -> None:
+        cls._c_char_array(stream, variable_name, cls._word_bytes(generator, ">", word_size), tab_size, items_per_line)
+
+
+    ## Converts a block of values into a byte buffer of words in the given byte order.
+    #  @remarks blocks already in the native byte order are returned as-is, without copying.
+    #  @param cls the type of object that is invoking this method.
+    #  @param block a buffer of unsigned words (see @ref MersenneTwister.next_block).
+    #  @param byte_order the byte order to encode values in (`little` or `big`).
+    #  @returns an object supporting the buffer protocol holding the encoded values.
+    @classmethod
+    def _word_buffer(cls, block:Sequence[int], byte_order:str) -> memoryview:
+        view = memoryview(block)
+        if byte_order == byteorder:
+            return view.cast('B')
+        _, type_code = cls.WordTypes[view.itemsize]
+        words = array(type_code)
+        words.frombytes(view.cast('B'))
+        words.byteswap()
+        return memoryview(words).cast('B')
+
+
+    ## Writes the given sequence as raw words (uint32 for MT19937, uint64 for MT19937-64).
+    #  @param cls the type of object that is invoking this method.
+    #  @param stream the (binary) stream to write the encoded sequence to.
+    #  @param blocks generator yielding blocks of sequence values (see @ref MersenneTwister.sequence_blocks).
+    #  @param byte_order the byte order to encode values in (`little` or `big`).
+    @classmethod
+    def raw_words(cls, stream:BinaryIO, blocks:Iterator[Sequence[int]], byte_order:str="little") -> None:
+        for block in blocks:
+            stream.write( cls._word_buffer(block, byte_order) )
+
+
+    ## Writes the given sequence as a NumPy `.npy` file (a 1-D array of little-endian unsigned words).
+    #  @remarks the header is written by hand; NumPy is not required to produce the file.
+    #  @param cls the type of object that is invoking this method.
+    #  @param stream the (binary) stream to write the encoded sequence to.
+    #  @param blocks generator yielding blocks of sequence values (see @ref MersenneTwister.sequence_blocks).
+    #  @param count the number of values @p blocks will yield.
+    #  @param word_size the size of each value in bytes.
+    @classmethod
+    def npy(cls, stream:BinaryIO, blocks:Iterator[Sequence[int]], count:int, word_size:int=4) -> None:
+
+        magic = b"\x93NUMPY\x01\x00"
+        header = f"{{'descr': '<u{word_size}', 'fortran_order': False, 'shape': ({count},), }}"
+
+        # header is padded so that the data starts on a 64 byte boundary, and is terminated with a newline.
+        padding = -(len(magic) + 2 + len(header) + 1) % 64
+        header = (header + " " * padding + "\n").encode("latin1")
 
-        return cls._c_char_array(variable_name, char_generator_for_big_endian(), tab_size, items_per_line)
\ No newline at end of file
+        stream.write(magic + pack("<H", len(header)) + header)
+        cls.raw_words(stream, blocks, "little")
+
+
+    ## Writes the given sequence as raw words directly into a pre-sized memory mapped file.
+    #  @param cls the type of object that is invoking this method.
+    #  @param path the path of the file to create (or replace).
+    #  @param blocks generator yielding blocks of sequence values (see @ref MersenneTwister.sequence_blocks).
+    #  @param count the number of values @p blocks will yield.
+    #  @param byte_order the byte order to encode values in (`little` or `big`).
+    #  @param word_size the size of each value in bytes.
+    @classmethod
+    def memory_mapped_words(cls, path:Path, blocks:Iterator[Sequence[int]], count:int, byte_order:str="little", word_size:int=4) -> None:
+
+        size = count * word_size
+
+        with path.open("w+b") as handle:
+
+            handle.truncate(size)
+            if size == 0: return
+
+            with mmap(handle.fileno(), size) as mapped:
+                offset = 0
+                for block in blocks:
+                    data = cls._word_buffer(block, byte_order)
+                    mapped[offset:offset + len(data)] = data
+                    offset += len(data)
+                mapped.flush()
+
+            if offset != size:
+                raise RuntimeError(f"Memory mapped sequence was sized for {size} bytes, but {offset} bytes were written.")
+
+
+
+## Mersenne Twister PRNG (32-bit)
+#
+# MT19937 - @ref MersenneTwisterBase with its values exposed as unsigned 32bit numbers; matches the
+# `MersenneTwister` implementation in `twister.c`.
+class MersenneTwister(MersenneTwisterBase):
+
+
+    ## Instance members - all inherited from @ref MersenneTwisterBase.
+    __slots__ = ()
+
+
+    ## Generates the next unsigned 32bit number in the PRNGs sequence.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the next number from the PRNG's random sequence.
+    next_uint32 = MersenneTwisterBase.next_word
@@ -0,0 +1,98 @@
+# project imports
+from .mersenne_twister import MersenneTwisterBase
+from .mersenne_twister_engine import DefaultTwisterEngine64
+
+
+## Mersenne Twister PRNG (64-bit)
+#
+# MT19937-64 - as @ref MersenneTwister but each value is a 64-bit word, so each call yields twice as
+# many bits. Shares @ref MersenneTwisterBase with @ref MersenneTwister, but exposes its values through
+# @ref next_uint64 (there is no `next_uint32`) and matches the `MersenneTwister64` implementation in `twister.c`.
+#
+# Base on; [Wikipedia's documentation for MT19937](https://en.wikipedia.org/wiki/Mersenne_Twister)
+class MersenneTwister64(MersenneTwisterBase):
+
+
+    ## Instance members - all inherited from @ref MersenneTwisterBase.
+    __slots__ = ()
+
+    ## The size of the internal PRNG's state 
+    #  "n: degree of recurrence" in documentation.
+    MT19937_STATE_SIZE = 312
+
+    ## The size of a word in bits
+    WORD_SIZE = 64
+
+    ## Masks to ensure generated values fit in word size.
+    WORD_MASK = (1 << WORD_SIZE) - 1
+
+    ## The size of a word in bytes.
+    WORD_BYTES = WORD_SIZE // 8
+
+    ## The bits of word `i` that are combined with the @ref TWIST_LOWER_MASK bits of word `i + 1` during a twist.
+    TWIST_UPPER_MASK = 0xFFFFFFFF80000000
+
+    ## The bits of word `i + 1` that are combined with the @ref TWIST_UPPER_MASK bits of word `i` during a twist.
+    TWIST_LOWER_MASK = 0x000000007FFFFFFF
+
+    ## The engine used to twist/temper the state when one is not given.
+    DefaultEngine = DefaultTwisterEngine64
+
+
+
+    ## MT19937-64 'a' component
+    #  Coefficients of the rational normal form twist matrix
+    MT19937_A = 0xB5026F5AA96619E9
+
+    ## MT19937-64 'b' component
+    #  TGFSR(R) tempering bitmasks
+    MT19937_B = 0x71D67FFFEDA60000
+
+    ## MT19937-64 'c' component
+    #  TGFSR(R) tempering bitmasks
+    MT19937_C = 0xFFF7EEE000000000
+
+    ## MT19937-64 'd' component
+    #  Additional Mersenne Twister tempering bitmask
+    MT19937_D = 0x5555555555555555
+
+    ## MT19937-64 'f' component
+    #  The constant f forms another parameter to the generator, though not part of the algorithm proper.
+    #  @remarks The value for f for MT19937-64 is 6364136223846793005
+    MT19937_F = 0x5851F42D4C957F2D
+
+    ## MT19937-64 'l' component
+    # Additional Mersenne Twister tempering bit shifts#masks
+    MT19937_L = 0x0000002b
+
+    ## MT19937-64 'm' component
+    #  Middle word, an offset used in the recurrence relation defining the series: x, 1 <= m < n
+    MT19937_M = 0x0000009c
+
+    ## MT19937-64 's' component
+    #  TGFSR(R) tempering bit shifts
+    MT19937_S = 0x00000011
+
+    ## MT19937-64 't' component
+    #  TGFSR(R) tempering bit shifts
+    MT19937_T = 0x00000025
+
+    ## MT19937-64 'u' component
+    #  Additional Mersenne Twister tempering bit shifts#masks
+    MT19937_U = 0x0000001d
+
+
+    ## Skips shorter than this (in values) are made by twisting through the sequence rather than jumping.
+    JUMP_THRESHOLD = 64 * MT19937_STATE_SIZE
+
+    ## Shared @ref MersenneTwisterJump helper - created on first use as building it takes a moment.
+    _jump_helper = None
+
+    ## The size of a serialised state (see @ref to_bytes) - N little-endian words followed by a uint16 index.
+    SerialisedSize = MT19937_STATE_SIZE * WORD_BYTES + 2
+
+
+    ## Generates the next unsigned 64bit number in the PRNGs sequence.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the next number from the PRNG's random sequence.
+    next_uint64 = MersenneTwisterBase.next_word
@@ -0,0 +1,93 @@
+# python imports
+from collections import OrderedDict
+from pathlib import Path
+from os import getpid
+from typing import TypeVar, Optional
+
+
+## The @ref MersenneTwisterStateCache `Self` type
+SelfType = TypeVar('SelfType', bound='MersenneTwisterStateCache')
+
+
+## Seed keyed cache of Mersenne Twister states.
+#
+# Holds the state of the generator for a given seed after initialisation and the first twist (i.e. the
+# state that yields the first N values). Seeding a generator is a python loop over the whole state and
+# the same seeds are often used over and over - build tools regenerating the same hidden strings, for
+# example - so this lets them skip the warm-up entirely.
+#
+# States are held in memory in a bounded LRU, and optionally persisted to a directory so they survive
+# between runs. States are held in their serialised form (see @ref MersenneTwister.to_bytes) so they are
+# independent of the engine in use.
+class MersenneTwisterStateCache(object):
+
+
+    ## The file extension used for states persisted to disk.
+    FileExtension = ".mt19937"
+
+
+    ## Creates a new instance of the cache.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param maxsize the maximum number of states to hold in memory.
+    #  @param directory optional directory to persist states to (created if it does not exist).
+    def __init__(self, maxsize:int=256, directory:Optional[Path]=None) -> SelfType:
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory else None
+        self.states = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+
+    ## Gets the path a state is persisted to on disk.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param mt the @ref MersenneTwister type the state belongs to.
+    #  @param seed the (32-bit) seed the state was created from.
+    #  @returns the path of the state file.
+    def path_for(self, mt:type, seed:int) -> Path:
+        return self.directory / f"{mt.__name__.lower()}-{seed:08x}{self.FileExtension}"
+
+
+    ## Gets the serialised state for a seed after initialisation and first twist.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param mt the @ref MersenneTwister type the state belongs to.
+    #  @param seed the (32-bit) seed to get the state of.
+    #  @returns the serialised state (index 0; ready to yield the first value of the sequence).
+    def twisted_state(self, mt:type, seed:int) -> bytes:
+
+        key = (mt, seed)
+        data = self.states.get(key, None)
+
+        if data is not None:
+            self.hits += 1
+            self.states.move_to_end(key)
+            return data
+
+        self.misses += 1
+        path = self.path_for(mt, seed) if self.directory else None
+
+        if path and path.is_file():
+            data = path.read_bytes()
+
+        if data is None or len(data) != mt.SerialisedSize:
+            engine = mt.DefaultEngine
+            state = engine.twist(mt, engine.buffer(mt.initial_state(seed)))
+            data = mt.pack_state(engine, state, 0)
+            if path:
+                temporary_path = path.with_suffix(f".{getpid()}.tmp")
+                temporary_path.write_bytes(data)
+                temporary_path.replace(path)
+
+        self.states[key] = data
+        if len(self.states) > self.maxsize:
+            self.states.popitem(last=False)
+
+        return data
+
+
+    ## Empties the in-memory cache (states persisted to disk are left in place).
+    #  @param self the instance of the object that is invoking this method.
+    def clear(self) -> None:
+        self.states.clear()
@@ -0,0 +1,355 @@
+# python imports
+from array import array
+from sys import byteorder
+from typing import Iterable, Sequence, Any
+
+# third-party imports (optional)
+try:
+    import numpy
+except ImportError: # the pure-python engine is used instead.
+    numpy = None
+
+
+## Mersenne Twister block engine (pure-python).
+#
+# Bulk operations used by @ref MersenneTwister to progress and temper the whole 624-word state in one
+# go, rather than one word per call. State and output blocks are held in compact `array('I')` buffers.
+# This engine is always available, and is used when NumPy is not installed.
+#
+# The engine is independent of the word size; @ref ArrayTwisterEngine64 holds 64-bit words for MT19937-64.
+#
+# The twist is not a simple element-wise operation - words are updated in place and word `i` reads the
+# (already twisted) word `i + M - N` once `i >= N - M`. The state is therefore twisted in runs of `N - M`
+# words, each run only depending on values that have already been computed.
+class ArrayTwisterEngine(object):
+
+
+    ## The name of the engine (for logging/diagnostics).
+    name = "array"
+
+    ## The `array` type code used to hold words.
+    typecode = 'I'
+
+    ## The number of bits in each word.
+    word_bits = 32
+
+    ## If the engine can twist/temper many states (one per row of a 2-D buffer) in lockstep.
+    multi_state = False
+
+
+    ## Converts a list of integer words into an engine buffer.
+    #  @param cls the type of class that is invoking this method.
+    #  @param words the words to store.
+    #  @returns a compact buffer of unsigned words.
+    @classmethod
+    def buffer(cls, words:Iterable[int]) -> array:
+        return array(cls.typecode, words)
+
+
+    ## Creates an empty engine buffer.
+    #  @param cls the type of class that is invoking this method.
+    #  @returns an empty buffer of unsigned words.
+    @classmethod
+    def empty(cls) -> array:
+        return array(cls.typecode)
+
+
+    ## Joins a number of engine buffers together.
+    #  @param cls the type of class that is invoking this method.
+    #  @param blocks the buffers to join, in order.
+    #  @returns a single buffer containing all values from @p blocks.
+    @classmethod
+    def concatenate(cls, blocks:Sequence[array]) -> array:
+        joined = array(cls.typecode)
+        for block in blocks:
+            joined.extend(block)
+        return joined
+
+
+    ## Serialises an engine buffer as little-endian words.
+    #  @param cls the type of class that is invoking this method.
+    #  @param words the buffer to serialise.
+    #  @returns the little-endian bytes of @p words.
+    @classmethod
+    def to_bytes(cls, words:array) -> bytes:
+        if byteorder == 'little': return words.tobytes()
+        swapped = array(cls.typecode, words)
+        swapped.byteswap()
+        return swapped.tobytes()
+
+
+    ## Creates an engine buffer from little-endian words.
+    #  @param cls the type of class that is invoking this method.
+    #  @param data the bytes to load - as produced by @ref to_bytes.
+    #  @returns a compact buffer of unsigned words.
+    @classmethod
+    def from_bytes(cls, data:bytes) -> array:
+        words = array(cls.typecode)
+        words.frombytes(data)
+        if byteorder != 'little': words.byteswap()
+        return words
+
+
+    ## XORs together a number of equal width windows taken from a buffer.
+    #  Windows are combined as big integers; so each one costs a single shift and XOR.
+    #  @param cls the type of class that is invoking this method.
+    #  @param words the buffer to take windows from.
+    #  @param offsets the start offset of each window to combine.
+    #  @param width the number of words in each window.
+    #  @returns a buffer of @p width words.
+    @classmethod
+    def xor_windows(cls, words:array, offsets:Sequence[int], width:int) -> array:
+
+        packed = int.from_bytes(cls.to_bytes(array(cls.typecode, words)), 'little')
+
+        combined = 0
+        for offset in offsets:
+            combined ^= packed >> (offset * cls.word_bits)
+
+        combined &= (1 << (width * cls.word_bits)) - 1
+        return cls.from_bytes( combined.to_bytes(width * cls.word_bits // 8, 'little') )
+
+
+    ## Twists a full MT19937 state.
+    #  @param cls the type of class that is invoking this method.
+    #  @param mt the @ref MersenneTwister type providing the algorithm parameters.
+    #  @param state the current state (N words).
+    #  @returns the twisted state (N words) - @p state is not modified.
+    @classmethod
+    def twist(cls, mt:type, state:array) -> array:
+
+        n, m = mt.MT19937_STATE_SIZE, mt.MT19937_M
+        a, upper, lower = mt.MT19937_A, mt.TWIST_UPPER_MASK, mt.TWIST_LOWER_MASK
+        split = n - m
+
+        # every word but the last combines with a word that has not been twisted yet.
+        mag = [ (y >> 1) ^ (a if y & 1 else 0) for y in (
+            (x & upper) | (x1 & lower) for x, x1 in zip(state[:-1], state[1:])
+        )]
+
+        twisted = [ t ^ g for t, g in zip(state[m:], mag[:split]) ]
+        for start in range(split, n - 1, split):
+            stop = min(start + split, n - 1)
+            twisted.extend( t ^ g for t, g in zip(twisted[start - split:stop - split], mag[start:stop]) )
+
+        # ... the last word wraps around and combines with the (already twisted) first word.
+        y = (state[n - 1] & upper) | (twisted[0] & lower)
+        twisted.append(twisted[n - 1 - split] ^ (y >> 1) ^ (a if y & 1 else 0))
+
+        return array(cls.typecode, twisted)
+
+
+    ## Tempers a block of state words into generator output.
+    #  @param cls the type of class that is invoking this method.
+    #  @param mt the @ref MersenneTwister type providing the algorithm parameters.
+    #  @param state the state words to temper.
+    #  @returns the tempered output values - @p state is not modified.
+    @classmethod
+    def temper(cls, mt:type, state:array) -> array:
+
+        u, s, t, l = mt.MT19937_U, mt.MT19937_S, mt.MT19937_T, mt.MT19937_L
+        b, c, d = mt.MT19937_B, mt.MT19937_C, mt.MT19937_D
+
+        tempered = array(cls.typecode, state)
+        for index, y in enumerate(tempered):
+            y ^= (y >> u) & d
+            y ^= (y << s) & b
+            y ^= (y << t) & c
+            tempered[index] = y ^ (y >> l)
+
+        return tempered
+
+
+
+## Mersenne Twister block engine (NumPy).
+#
+# As @ref ArrayTwisterEngine but using NumPy `uint32` arrays, so each run of the twist and the tempering
+# of a whole block are single array operations. All operations work on the last axis, so a 2-D array of
+# states (one row per seed) is twisted and tempered in lockstep. @ref NumpyTwisterEngine64 holds 64-bit words.
+class NumpyTwisterEngine(object):
+
+
+    ## The name of the engine (for logging/diagnostics).
+    name = "numpy"
+
+    ## The NumPy data type used to hold words.
+    dtype = "uint32"
+
+    ## The number of bits in each word.
+    word_bits = 32
+
+    ## If the engine can twist/temper many states (one per row of a 2-D buffer) in lockstep.
+    multi_state = True
+
+    ## The number of windows gathered at once by @ref xor_windows (bounds temporary memory to ~2.5MB per batch).
+    WindowBatchSize = 1024
+
+
+    ## Converts a list of integer words into an engine buffer.
+    #  @param cls the type of class that is invoking this method.
+    #  @param words the words to store.
+    #  @returns a compact buffer of unsigned words.
+    @classmethod
+    def buffer(cls, words:Iterable[int]) -> Any:
+        return numpy.array(words, dtype=cls.dtype)
+
+
+    ## Creates an empty engine buffer.
+    #  @param cls the type of class that is invoking this method.
+    #  @returns an empty buffer of unsigned words.
+    @classmethod
+    def empty(cls) -> Any:
+        return numpy.empty(0, dtype=cls.dtype)
+
+
+    ## Joins a number of engine buffers together.
+    #  @param cls the type of class that is invoking this method.
+    #  @param blocks the buffers to join, in order.
+    #  @returns a single buffer containing all values from @p blocks.
+    @classmethod
+    def concatenate(cls, blocks:Sequence[Any]) -> Any:
+        return numpy.concatenate(blocks, axis=-1) if blocks else cls.empty()
+
+
+    ## Serialises an engine buffer as little-endian words.
+    #  @param cls the type of class that is invoking this method.
+    #  @param words the buffer to serialise.
+    #  @returns the little-endian bytes of @p words.
+    @classmethod
+    def to_bytes(cls, words:Any) -> bytes:
+        return numpy.asarray(words, dtype=f"<u{cls.word_bits // 8}").tobytes()
+
+
+    ## Creates an engine buffer from little-endian words.
+    #  @param cls the type of class that is invoking this method.
+    #  @param data the bytes to load - as produced by @ref to_bytes.
+    #  @returns a compact buffer of unsigned words.
+    @classmethod
+    def from_bytes(cls, data:bytes) -> Any:
+        return numpy.frombuffer(data, dtype=f"<u{cls.word_bits // 8}").astype(cls.dtype)
+
+
+    ## Calculates the initial (untwisted) states for a number of seeds at once.
+    #  Each word of the state depends on the last, so this walks along the state - but does so for every seed at once.
+    #  @param cls the type of class that is invoking this method.
+    #  @param mt the @ref MersenneTwister type providing the algorithm parameters.
+    #  @param seeds the seeds to initialise states for.
+    #  @returns a 2-D buffer with the N word initial state for each seed as a row.
+    @classmethod
+    def initial_states(cls, mt:type, seeds:Sequence[int]) -> Any:
+
+        word = numpy.dtype(cls.dtype).type
+        f, shift = word(mt.MT19937_F), word(mt.WORD_SIZE - 2)
+
+        states = numpy.empty((len(seeds), mt.MT19937_STATE_SIZE), dtype=cls.dtype)
+        v = numpy.array([ seed & mt.WORD_MASK for seed in seeds ], dtype=cls.dtype)
+        states[:, 0] = v
+
+        # arithmetic on arrays wraps at the word size; which is the masking the algorithm calls for.
+        for index in range(1, mt.MT19937_STATE_SIZE):
+            v = f * (v ^ (v >> shift)) + word(index)
+            states[:, index] = v
+
+        return states
+
+
+    ## XORs together a number of equal width windows taken from a buffer.
+    #  Windows are gathered (and combined) in batches to bound the memory used.
+    #  @param cls the type of class that is invoking this method.
+    #  @param words the buffer to take windows from.
+    #  @param offsets the start offset of each window to combine.
+    #  @param width the number of words in each window.
+    #  @returns a buffer of @p width words.
+    @classmethod
+    def xor_windows(cls, words:Any, offsets:Sequence[int], width:int) -> Any:
+
+        windows = numpy.lib.stride_tricks.sliding_window_view(numpy.asarray(words, dtype=cls.dtype), width)
+        offsets = numpy.asarray(offsets, dtype=numpy.intp)
+        combined = numpy.zeros(width, dtype=cls.dtype)
+
+        for start in range(0, len(offsets), cls.WindowBatchSize):
+            combined ^= numpy.bitwise_xor.reduce(windows[offsets[start:start + cls.WindowBatchSize]], axis=0)
+
+        return combined
+
+
+    ## Twists a full MT19937 state (or a 2-D array of states, one per row).
+    #  @param cls the type of class that is invoking this method.
+    #  @param mt the @ref MersenneTwister type providing the algorithm parameters.
+    #  @param state the current state(s) (N words on the last axis).
+    #  @returns the twisted state(s) - @p state is not modified.
+    @classmethod
+    def twist(cls, mt:type, state:Any) -> Any:
+
+        n, m = mt.MT19937_STATE_SIZE, mt.MT19937_M
+        word = numpy.dtype(cls.dtype).type
+        a, one = word(mt.MT19937_A), word(1)
+        upper, lower = word(mt.TWIST_UPPER_MASK), word(mt.TWIST_LOWER_MASK)
+        split = n - m
+
+        y = (state[..., :-1] & upper) | (state[..., 1:] & lower)
+        mag = (y >> one) ^ ((y & one) * a)
+
+        twisted = numpy.empty_like(state)
+        twisted[..., :split] = state[..., m:] ^ mag[..., :split]
+        for start in range(split, n - 1, split):
+            stop = min(start + split, n - 1)
+            twisted[..., start:stop] = twisted[..., start - split:stop - split] ^ mag[..., start:stop]
+
+        y = (state[..., n - 1:] & upper) | (twisted[..., :1] & lower)
+        twisted[..., n - 1:] = twisted[..., n - 1 - split:n - split] ^ (y >> one) ^ ((y & one) * a)
+
+        return twisted
+
+
+    ## Tempers a block of state words into generator output.
+    #  @param cls the type of class that is invoking this method.
+    #  @param mt the @ref MersenneTwister type providing the algorithm parameters.
+    #  @param state the state words to temper.
+    #  @returns the tempered output values - @p state is not modified.
+    @classmethod
+    def temper(cls, mt:type, state:Any) -> Any:
+        word = numpy.dtype(cls.dtype).type
+        y = state ^ ((state >> word(mt.MT19937_U)) & word(mt.MT19937_D))
+        y ^= (y << word(mt.MT19937_S)) & word(mt.MT19937_B)
+        y ^= (y << word(mt.MT19937_T)) & word(mt.MT19937_C)
+        y ^= y >> word(mt.MT19937_L)
+        return y
+
+
+
+## Mersenne Twister block engine for 64-bit words (pure-python).
+#  As @ref ArrayTwisterEngine; used by MT19937-64.
+class ArrayTwisterEngine64(ArrayTwisterEngine):
+
+    ## The name of the engine (for logging/diagnostics).
+    name = "array64"
+
+    ## The `array` type code used to hold words.
+    typecode = 'Q'
+
+    ## The number of bits in each word.
+    word_bits = 64
+
+
+
+## Mersenne Twister block engine for 64-bit words (NumPy).
+#  As @ref NumpyTwisterEngine; used by MT19937-64.
+class NumpyTwisterEngine64(NumpyTwisterEngine):
+
+    ## The name of the engine (for logging/diagnostics).
+    name = "numpy64"
+
+    ## The NumPy data type used to hold words.
+    dtype = "uint64"
+
+    ## The number of bits in each word.
+    word_bits = 64
+
+
+
+## The engine used by default - NumPy where it is installed, else the pure-python fallback.
+DefaultTwisterEngine = NumpyTwisterEngine if numpy is not None else ArrayTwisterEngine
+
+## The engine used by default for 64-bit generators.
+DefaultTwisterEngine64 = NumpyTwisterEngine64 if numpy is not None else ArrayTwisterEngine64
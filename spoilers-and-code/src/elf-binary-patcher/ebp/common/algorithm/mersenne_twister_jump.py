@@ -0,0 +1,167 @@
+# python imports
+from typing import Any, List
+
+
+## Counts the parity of the set bits in an integer.
+#  `int.bit_count` is only available from python 3.10, fall back to string counting on older versions.
+parity = (lambda value: value.bit_count() & 1) if hasattr(int, "bit_count") else (lambda value: bin(value).count("1") & 1)
+
+
+## Mersenne Twister jump-ahead
+#
+# Moves a Mersenne Twister forward by an arbitrary number of outputs in time that grows with the
+# logarithm of the distance; rather than by generating and discarding every value in between.
+#
+# The raw (untempered) words the generator produces are a linear recurrence over GF(2) with a
+# characteristic polynomial `phi` of degree 19937. If `t^d mod phi = sum(r_i * t^i)` then word
+# `x[s + d + j]` is the XOR of `x[s + i + j]` for every `i` where `r_i` is set - so the state `d` words
+# ahead is a XOR of windows over the next ~20k words of the sequence. `phi` itself is recovered once per
+# process from the generators own output using Berlekamp-Massey.
+#
+# Polynomials over GF(2) are stored as python integers; bit `i` holding the coefficient of `t^i`.
+class MersenneTwisterJump(object):
+
+
+    ## Lookup table to square a polynomial one byte at a time.
+    #  Squaring over GF(2) simply spreads the bits out (bit `i` moves to bit `2i`).
+    SquareBytes = [ int("".join(f"0{bit}" for bit in f"{byte:08b}"), 2).to_bytes(2, 'little') for byte in range(0x100) ]
+
+
+    ## Creates a new instance of the jump helper for a generator type.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param mt the @ref MersenneTwister type whose sequence we want to jump through.
+    def __init__(self, mt:type) -> None:
+        self.mt = mt
+        self.polynomial, self.degree = self.characteristic_polynomial(mt)
+        self.reduction_table = self.build_reduction_table(self.polynomial, self.degree)
+
+
+    ## Recovers the characteristic polynomial of the generators recurrence.
+    #  Runs Berlekamp-Massey over the low bit of 2N raw words (N being the degree; 19937 for MT19937 and MT19937-64).
+    #  @param cls the type of class that is invoking this method.
+    #  @param mt the @ref MersenneTwister type to recover the characteristic polynomial of.
+    #  @returns the characteristic polynomial and its degree.
+    @classmethod
+    def characteristic_polynomial(cls, mt:type) -> tuple[int, int]:
+
+        maximum_degree = mt.MT19937_STATE_SIZE * mt.WORD_SIZE - mt.TWIST_LOWER_MASK.bit_length()
+        engine = mt.DefaultEngine
+        words = engine.concatenate(cls.raw_blocks(mt, engine, engine.buffer(mt.initial_state(1)), 2 * maximum_degree)).tolist()
+
+        connection, previous, length, shift, window = 1, 1, 0, 1, 0
+
+        for index, word in enumerate(words):
+
+            window = (window << 1) | (word & 1)
+
+            if parity(connection & window):
+                last_connection = connection
+                connection ^= previous << shift
+                if 2 * length <= index:
+                    length, previous, shift = index + 1 - length, last_connection, 1
+                    continue
+
+            shift += 1
+
+        if length != maximum_degree:
+            raise RuntimeError(f"Failed to recover the characteristic polynomial of {mt.__name__}; got degree {length}, expected {maximum_degree}.")
+
+        # the connection polynomial is the reciprocal of the characteristic polynomial.
+        polynomial = int(f"{connection:0{length + 1}b}"[::-1], 2)
+        return polynomial, length
+
+
+    ## Generates the blocks of raw (untempered) words that follow a given state block.
+    #  @param cls the type of class that is invoking this method.
+    #  @param mt the @ref MersenneTwister type that provides the algorithm.
+    #  @param engine the engine used to twist the state.
+    #  @param state the block to start twisting from (not included in the output).
+    #  @param count the number of words we need.
+    #  @returns a list of engine buffers; holding at least @p count raw words between them.
+    @classmethod
+    def raw_blocks(cls, mt:type, engine:type, state:Any, count:int) -> List[Any]:
+        blocks = []
+        for _ in range(0, count, mt.MT19937_STATE_SIZE):
+            state = engine.twist(mt, state)
+            blocks.append(state)
+        return blocks
+
+
+    ## Builds a table that is used to reduce polynomials modulo the characteristic polynomial a byte at a time.
+    #  Entry `v` is the multiple of the polynomial whose coefficients `degree`..`degree + 7` are the bits of `v`.
+    #  @param cls the type of class that is invoking this method.
+    #  @param polynomial the modulus.
+    #  @param degree the degree of @p polynomial.
+    #  @returns a list of 256 polynomial multiples.
+    @classmethod
+    def build_reduction_table(cls, polynomial:int, degree:int) -> List[int]:
+        table = []
+        for value in range(0x100):
+            multiple, remainder = 0, value << degree
+            for bit in range(degree + 7, degree - 1, -1):
+                if (remainder >> bit) & 1:
+                    remainder ^= polynomial << (bit - degree)
+                    multiple ^= polynomial << (bit - degree)
+            table.append(multiple)
+        return table
+
+
+    ## Reduces a polynomial modulo the characteristic polynomial.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param value the polynomial to reduce.
+    #  @returns @p value mod the characteristic polynomial.
+    def reduce(self, value:int) -> int:
+
+        degree, table = self.degree, self.reduction_table
+        position = value.bit_length() - 8
+
+        while position >= degree:
+            top = (value >> position) & 0xff
+            if top: value ^= table[top] << (position - degree)
+            position -= 8
+
+        for bit in range(position + 7, degree - 1, -1):
+            if (value >> bit) & 1:
+                value ^= self.polynomial << (bit - degree)
+
+        return value
+
+
+    ## Squares a polynomial (without reduction).
+    #  @param cls the type of class that is invoking this method.
+    #  @param value the polynomial to square.
+    #  @returns the square of @p value.
+    @classmethod
+    def square(cls, value:int) -> int:
+        value_bytes = value.to_bytes((value.bit_length() + 7) // 8, 'little')
+        squared_bytes = b"".join( cls.SquareBytes[byte] for byte in value_bytes )
+        return int.from_bytes(squared_bytes, 'little')
+
+
+    ## Calculates `t^exponent` modulo the characteristic polynomial.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param exponent the power to raise `t` to.
+    #  @returns the jump polynomial for a distance of @p exponent words.
+    def jump_polynomial(self, exponent:int) -> int:
+        result = 1
+        for bit in f"{exponent:b}":
+            result = self.reduce(self.square(result))
+            if bit == "1":
+                result = self.reduce(result << 1)
+        return result
+
+
+    ## Calculates the state block @p distance words ahead of the given state block.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param engine the engine used to twist the state.
+    #  @param state the current state block; this must be a twisted block (not a freshly initialised state).
+    #  @param distance the number of words to move forward - usually a multiple of the state size.
+    #  @returns the state block @p distance words ahead of @p state, as an engine buffer.
+    def jump_state(self, engine:type, state:Any, distance:int) -> Any:
+
+        words = engine.concatenate([ state ] + self.raw_blocks(self.mt, engine, state, self.degree))
+
+        jump = self.jump_polynomial(distance)
+        offsets = [ index for index, bit in enumerate(reversed(f"{jump:b}")) if bit == "1" ]
+
+        return engine.xor_windows(words, offsets, self.mt.MT19937_STATE_SIZE)
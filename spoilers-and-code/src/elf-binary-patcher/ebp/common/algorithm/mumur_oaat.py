@@ -1,5 +1,13 @@
 # python3 imports
-from typing import Iterator, TypeVar
+from typing import Iterator, TypeVar, Sequence, List, Union, Any
+from array import array
+from sys import byteorder
+
+# third-party imports
+try:
+    import numpy
+except ImportError: # numpy is optional; the multi-seed path falls back to hashing a seed at a time.
+    numpy = None
 
 
 ## The @ref MurmurOaat64 `Self` type
@@ -11,6 +19,19 @@ SelfType = TypeVar('SelfType', bound='MurmurOaat64')
 class MurmurOaat64(object):
 
 
+    ## The multiplier applied to the state for every byte.
+    Multiplier = 0x5bd1e9955bd1e995
+
+    ## The right shift folded back into the state for every byte.
+    Shift = 0x2f
+
+    ## Mask to keep the state to 64-bits.
+    StateMask = 0xffffffffffffffff
+
+    ## The number of seeds at which hashing them together (with numpy) beats hashing them one at a time.
+    MultiSeedThreshold = 16
+
+
     ## Instanciates a new @ref MurmurOaat64 object.
     #  @param self the instance of the object that is invoking this method.
     #  @param seed the value used to intialise the hash state
@@ -23,18 +44,90 @@ class MurmurOaat64(object):
     #  @param byte_ the byte to apply to the hash state.
     def consume_byte(self, byte_:int) -> None:
         self.state ^= byte_
-        self.state *= 0x5bd1e9955bd1e995
-        self.state &= 0xffffffffffffffff
-        self.state ^= self.state >> 0x2f
+        self.state *= self.Multiplier
+        self.state &= self.StateMask
+        self.state ^= self.state >> self.Shift
     
 
     ## Applies a series of bytes to the hash.
     #  @param self the instance of the object that is invoking this method.
     #  @param iterator iterator to consume bytes from - consumes until the iterator ends.
     def consume(self, iterator:Iterator[int]) -> None:
+        self.state = self.hash_bytes(self.state, iterator)
+
+
+    ## Applies a buffer of bytes to the hash.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param buffer the bytes to apply to the hash state.
+    def consume_buffer(self, buffer:Union[bytes, bytearray, memoryview]) -> None:
+        self.state = self.hash_buffer(self.state, memoryview(buffer).cast('B'))
+
+
+    ## Applies a buffer of bytes to a hash state.
+    #  @param cls the type of class that is invoking this method.
+    #  @param state the hash state (or seed) to start from.
+    #  @param buffer the bytes to apply to the hash state.
+    #  @returns the hash state after the buffer has been applied.
+    @classmethod
+    def hash_buffer(cls, state:int, buffer:memoryview) -> int:
+        return cls.hash_bytes(state, buffer)
+
+
+    ## Gets the values mixed into the state (one per round) for a buffer, as a numpy array.
+    #  @param cls the type of class that is invoking this method.
+    #  @param buffer the bytes being hashed.
+    #  @returns a uint64 numpy array holding the value applied in each round.
+    @classmethod
+    def round_values(cls, buffer:memoryview) -> Any:
+        return numpy.frombuffer(buffer, dtype=numpy.uint8).astype(numpy.uint64)
+
+
+    ## Applies a series of bytes to a hash state.
+    #  This is the same as calling @ref consume_byte for each byte; but keeps the state in a local rather than
+    #  an attribute, which is around half the cost per byte. Matches `murmur_oaat64` in `integrity.c`.
+    #  Values are simply XOR'd into the state, so this works for any value up to 64-bits wide (not just bytes).
+    #  @param cls the type of class that is invoking this method.
+    #  @param state the hash state (or seed) to start from.
+    #  @param iterator iterator to consume bytes from - consumes until the iterator ends.
+    #  @returns the hash state after all the bytes have been applied.
+    @classmethod
+    def hash_bytes(cls, state:int, iterator:Iterator[int]) -> int:
+        multiplier, shift, mask = cls.Multiplier, cls.Shift, cls.StateMask
         for byte_ in iterator:
-            self.consume_byte(byte_)
-    
+            state = ((state ^ byte_) * multiplier) & mask
+            state ^= state >> shift
+        return state
+
+
+    ## Hashes the same buffer with a number of different seeds.
+    #  With numpy (and enough seeds) every seed is advanced together as one array, making a single pass
+    #  over the buffer; otherwise each seed is hashed in turn.
+    #  @param cls the type of class that is invoking this method.
+    #  @param seeds the seeds to hash the buffer with.
+    #  @param buffer the bytes to hash.
+    #  @returns the hash of @p buffer for each seed, in the order of @p seeds.
+    @classmethod
+    def hash_many(cls, seeds:Sequence[int], buffer:Union[bytes, bytearray, memoryview]) -> List[int]:
+
+        buffer = memoryview(buffer).cast('B')
+
+        if numpy is None or len(seeds) < cls.MultiSeedThreshold:
+            return [ cls.hash_buffer(seed, buffer) for seed in seeds ]
+
+        state = numpy.array(seeds, dtype=numpy.uint64)
+        folded = numpy.empty_like(state)
+        multiplier, shift = numpy.uint64(cls.Multiplier), numpy.uint64(cls.Shift)
+
+        # uint64 arithmetic on arrays wraps; which is the masking the algorithm calls for.
+        for value in cls.round_values(buffer):
+            numpy.bitwise_xor(state, value, out=state)
+            numpy.multiply(state, multiplier, out=state)
+            numpy.right_shift(state, shift, out=folded)
+            numpy.bitwise_xor(state, folded, out=state)
+
+        return state.tolist()
+
+
 
     ## Gets the current value of the hash.
     #  @param self the instance of the object that is invoking this method.
@@ -45,4 +138,58 @@ class MurmurOaat64(object):
 
 
 
-    
\ No newline at end of file
+## MurmurOaat64-ish algorithm; eight bytes at a time.
+#  Each round mixes a little endian QWORD into the state, rather than a single byte; any bytes left over at the
+#  end of a buffer are then mixed in one at a time. This does an eighth of the rounds of @ref MurmurOaat64 for
+#  the same data. Matches `murmur_oaat64_wordwise` in `integrity.c`.
+class MurmurOaat64Wordwise(MurmurOaat64):
+
+
+    ## The number of bytes mixed into the state each round.
+    WordSize = 8
+
+
+    ## Applies a series of bytes to the hash.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param iterator iterator to consume bytes from - consumes until the iterator ends.
+    def consume(self, iterator:Iterator[int]) -> None:
+        self.state = self.hash_buffer(self.state, memoryview(bytes(iterator)))
+
+
+    ## Splits a buffer into its whole words and the remaining bytes.
+    #  @param cls the type of class that is invoking this method.
+    #  @param buffer the bytes being hashed.
+    #  @returns an array of the whole (little endian) words, and a buffer of the remaining bytes.
+    @classmethod
+    def split_words(cls, buffer:memoryview) -> tuple[array, memoryview]:
+        word_bytes = len(buffer) - (len(buffer) % cls.WordSize)
+        words = array('Q')
+        words.frombytes(buffer[:word_bytes])
+        if byteorder != "little":
+            words.byteswap()
+        return words, buffer[word_bytes:]
+
+
+    ## Applies a buffer of bytes to a hash state.
+    #  @param cls the type of class that is invoking this method.
+    #  @param state the hash state (or seed) to start from.
+    #  @param buffer the bytes to apply to the hash state.
+    #  @returns the hash state after the buffer has been applied.
+    @classmethod
+    def hash_buffer(cls, state:int, buffer:memoryview) -> int:
+        words, remainder = cls.split_words(buffer)
+        state = cls.hash_bytes(state, words)
+        return cls.hash_bytes(state, remainder)
+
+
+    ## Gets the values mixed into the state (one per round) for a buffer, as a numpy array.
+    #  @param cls the type of class that is invoking this method.
+    #  @param buffer the bytes being hashed.
+    #  @returns a uint64 numpy array holding the value applied in each round.
+    @classmethod
+    def round_values(cls, buffer:memoryview) -> Any:
+        words, remainder = cls.split_words(buffer)
+        return numpy.concatenate([
+            numpy.frombuffer(words, dtype=numpy.uint64),
+            numpy.frombuffer(remainder, dtype=numpy.uint8).astype(numpy.uint64)
+        ])
@@ -0,0 +1,134 @@
+# python imports
+from struct import Struct
+from typing import Iterator, Optional, TypeVar
+
+# third-party imports
+from elftools.elf.sections import Section
+
+# project imports
+from .patch_process import Elf
+
+
+## The @ref AnnotationTable `Self` type
+SelfType = TypeVar('SelfType', bound='AnnotationTable')
+
+## The @ref AnnotationTableEntry `Self` type
+EntryType = TypeVar('EntryType', bound='AnnotationTableEntry')
+
+
+## A single record from an @ref AnnotationTable.
+#  Stands in for the ELF section the annotation would otherwise have been placed in; it provides the same `name`,
+#  `elffile` and `data()` members, where `data()` is the record without its leading annotation type.
+class AnnotationTableEntry(object):
+
+
+    ## Creates a new instance of the entry.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param table the table the record was read from.
+    #  @param index the index of the record in the table.
+    #  @param data the body of the record (everything after the annotation type).
+    def __init__(self, table:'AnnotationTable', index:int, data:bytes) -> EntryType:
+        self._table = table
+        self._index = index
+        self._data = data
+
+
+    ## A name identifying the record; used in log and error messages in place of a section name.
+    @property
+    def name(self) -> str:
+        return f"{self._table.section.name}[{self._index}]"
+
+
+    ## The ELF file the record was read from.
+    @property
+    def elffile(self) -> Elf:
+        return self._table.section.elffile
+
+
+    ## The virtual address the record is loaded at.
+    @property
+    def address(self) -> int:
+        return self._table.section.header.sh_addr + (self._index * AnnotationTable.RecordSize)
+
+
+    ## Gets the body of the record.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the bytes of the record after the annotation type.
+    def data(self) -> bytes:
+        return self._data
+
+
+
+## Contains the contents of the `.annotation-table` ELF section.
+#  When the `elf-binary` source is built with `ANNOTATION_TABLE` defined its annotations are placed as fixed-size
+#  records in this one section, rather than each in a section of its own (see "annotation-table.h"). Each record
+#  starts with a 64-bit annotation type; the rest of the record is the structure that would otherwise have been
+#  the content of the annotations section.
+class AnnotationTable(object):
+
+
+    ## The name of the section that holds the annotation table.
+    SectionName:str = ".annotation-table"
+
+    ## The size of every record in the table (`ANNOTATION_TABLE_RECORD_SIZE`).
+    RecordSize:int = 288
+
+    ## Identifies a hash patch annotation (`ANNOTATION_HASH_PATCH`).
+    HashPatch:int = 1
+
+    ## Identifies a protected string annotation (`ANNOTATION_PROTECTED_STRING`).
+    ProtectedString:int = 2
+
+    ## Layouts of a record with only the annotation type decoded; keyed by endianness.
+    RecordLayouts = {
+        True: Struct(f"<Q{RecordSize - 8}x"),
+        False: Struct(f">Q{RecordSize - 8}x"),
+    }
+
+
+    ## Gets the annotation table from the given @p elf.
+    #  @param cls the type of class that is invoking this method.
+    #  @param elf the ELF binary to read the annotation table from.
+    #  @returns the annotation table, or None if the binary was built without one.
+    @classmethod
+    def fromElf(cls, elf:Elf) -> Optional[SelfType]:
+        section = elf.get_section_by_name(cls.SectionName)
+        return cls(section) if section else None
+
+
+    ## Creates a new instance of the annotation table.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param section the `.annotation-table` section to read the records from.
+    def __init__(self, section:Section) -> SelfType:
+
+        elffile = section.elffile
+
+        if elffile.elfclass != 64:
+            raise RuntimeError(f"annotation tables are only supported in 64-bit binaries; {section.name} is in a {elffile.elfclass}-bit binary.")
+
+        self.section = section
+        self.buffer = section.data()
+
+        if len(self.buffer) % self.RecordSize:
+            raise RuntimeError(f"{section.name} is {len(self.buffer)} bytes, which is not a whole number of {self.RecordSize} byte records.")
+
+        record_layout = self.RecordLayouts[elffile.little_endian]
+        self.annotation_types = [ annotation_type for annotation_type, in record_layout.iter_unpack(self.buffer) ]
+
+
+    ## Gets the number of records in the table.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the number of records in the table.
+    def __len__(self) -> int:
+        return len(self.annotation_types)
+
+
+    ## Gets every record of the given type.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param annotation_type the type of annotation to get the records of.
+    #  @returns an iterator of the records of the given type, in the order they appear in the table.
+    def entries(self, annotation_type:int) -> Iterator[AnnotationTableEntry]:
+        for index, record_type in enumerate(self.annotation_types):
+            if record_type == annotation_type:
+                offset = index * self.RecordSize
+                yield AnnotationTableEntry(self, index, self.buffer[offset + 8 : offset + self.RecordSize])
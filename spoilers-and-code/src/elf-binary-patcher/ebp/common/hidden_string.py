@@ -1,10 +1,9 @@
 # python imports
-from struct import pack
 from random import randint
-from typing import Iterator, TypeVar, Optional
+from typing import Iterator, TypeVar, Optional, Sequence, List
 
 # project imports
-from ebp.common.algorithm import MersenneTwister
+from ebp.common.algorithm import MersenneTwister, MersenneTwister64, MersenneTwisterBase
 
 
 ## The @ref HiddenString `Self` type
@@ -15,36 +14,99 @@ HiddenStringType = TypeVar('HiddenStringType', bound='HiddenString')
 class HiddenString(object):
 
 
-    ## Wraps a mersenne twister to provide an interator of bytes (rather than uint32)
-    #  UINT32 is converted into bytes using little endian such as it would be seen in memory.
+    ## Wraps a mersenne twister to provide an interator of bytes (rather than words)
+    #  Words (uint32, or uint64 for MT19937-64) are converted into bytes using little endian such as it would be seen in memory.
     #  @param cls the type of class that is invoking this method.
     #  @param mersenne_twister the PRNG to wrap.
     #  @returns an iterator of integer byte values derived from the PRNG.
-    def mersenne_twister_byte_iterator(cls, mersenne_twister:MersenneTwister) -> Iterator[int]:
+    def mersenne_twister_byte_iterator(cls, mersenne_twister:MersenneTwisterBase) -> Iterator[int]:
         while 1:
-            uint32 = mersenne_twister.next_uint32()
-            yield from pack("<I", uint32)
+            yield from mersenne_twister.engine.to_bytes( mersenne_twister.next_block(1) )
 
     ## XORS the given byte squence against the current MT state.
+    #  The mask is drawn from the generator as a single block of words, rather than a word at a time.
     #  @param self the instanec of the object that is invoking this method.
     #  @param byte_sequence the sequence of bytes to XOR against the MT sequence.
     #  @returns the input bytes XOR'd against the MT sequence.
     def mt_xor_byte_sequence(self, byte_sequence:Iterator[int]) -> list[int]:
-        mt_byte_iterator = self.mersenne_twister_byte_iterator(self.mt)
-        return [ b ^ next(mt_byte_iterator) for b in byte_sequence ]
+        byte_sequence = bytes(byte_sequence)
+        word_count = -(-len(byte_sequence) // self.mt.WORD_BYTES)
+        mask = self.mt.engine.to_bytes( self.mt.next_block(word_count) )
+        return [ b ^ m for b, m in zip(byte_sequence, mask) ]
 
 
     ## Creates a new instance of this object.
     #  @param self the instance of the object that is invoking this method.
     #  @param hidden_string the hidden string to set.
     #  @param long_seed the seed to use to embed the hidden string (or NULL for random).
-    def __init__(self, hidden_string:str, long_seed:Optional[int] = None) -> HiddenStringType:
+    #  @param mt64 use the 64-bit (MT19937-64) generator, seeded with the full long seed; see `HIDDEN_STRING_MT64` in `crackme.c`.
+    def __init__(self, hidden_string:str, long_seed:Optional[int] = None, mt64:bool = False) -> HiddenStringType:
+        self.set_seed(hidden_string, long_seed, mt64)
+        self.mt = self.generator(self.seed)
+        self.xor_bytes = self.mt_xor_byte_sequence(hidden_string.encode("ascii") + b"\0")
+
+
+    ## Creates hidden strings for a number of values at once.
+    #  The generators for every string are run in lockstep (see @ref MersenneTwister.generate_many); rather than
+    #  initialising and running a generator per string. Instances created this way do not hold a generator (`mt`).
+    #  @param cls the type of class that is invoking this method.
+    #  @param hidden_strings the hidden strings to create.
+    #  @param long_seeds the seed to use for each hidden string (or NULL for random) - omit for all random.
+    #  @param mt64 use the 64-bit (MT19937-64) generator, seeded with the full long seed; see `HIDDEN_STRING_MT64` in `crackme.c`.
+    #  @returns a hidden string object for each value in @p hidden_strings, in the same order.
+    @classmethod
+    def batch(cls, hidden_strings:Sequence[str], long_seeds:Optional[Sequence[Optional[int]]] = None, mt64:bool = False) -> List[HiddenStringType]:
+
+        long_seeds = long_seeds or [ None ] * len(hidden_strings)
+        if len(long_seeds) != len(hidden_strings):
+            raise RuntimeError(f"Got {len(long_seeds)} seeds for {len(hidden_strings)} hidden strings.")
+
+        instances = []
+        for hidden_string, long_seed in zip(hidden_strings, long_seeds):
+            instance = cls.__new__(cls)
+            instance.set_seed(hidden_string, long_seed, mt64)
+            instance.mt = None
+            instances.append(instance)
+
+        if not instances:
+            return instances
+
+        generator = instances[0].generator
+        byte_sequences = [ instance.raw.encode("ascii") + b"\0" for instance in instances ]
+        word_count = -(-max(map(len, byte_sequences)) // generator.WORD_BYTES)
+        masks = generator.generate_many([ instance.seed for instance in instances ], word_count)
+
+        for instance, byte_sequence, mask in zip(instances, byte_sequences, masks):
+            instance.xor_bytes = [ b ^ m for b, m in zip(byte_sequence, generator.DefaultEngine.to_bytes(mask)) ]
+
+        return instances
+
+
+    ## Sets the seed values (and raw value) of this hidden string.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param hidden_string the hidden string to set.
+    #  @param long_seed the seed to use to embed the hidden string (or NULL for random).
+    #  @param mt64 use the 64-bit (MT19937-64) generator, seeded with the full long seed.
+    def set_seed(self, hidden_string:str, long_seed:Optional[int], mt64:bool) -> None:
         self.long_seed = long_seed or randint(0x0000000000000000, 0xFFFFFFFFFFFFFFFF)
         self.short_seed = (self.long_seed >> 32) ^ (self.long_seed & 0xffffffff)
-        self.mt = MersenneTwister(self.short_seed)        
-        self.xor_bytes = self.mt_xor_byte_sequence(hidden_string.encode("ascii") + b"\0")
+        self.mt64 = mt64
         self.raw = hidden_string
 
+    ## Gets the generator type used to mask this hidden string.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns @ref MersenneTwister64 for 64-bit masks, otherwise @ref MersenneTwister.
+    @property
+    def generator(self) -> type:
+        return MersenneTwister64 if self.mt64 else MersenneTwister
+
+    ## Gets the value the generator is seeded with.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the long seed for 64-bit masks, otherwise the short seed.
+    @property
+    def seed(self) -> int:
+        return self.long_seed if self.mt64 else self.short_seed
+
     ## Gets the hidden string mask as a byte string
     #  @param self the instance of the object that is invoking this method.
     #  @returns byte string interpretation of the XOR mask.
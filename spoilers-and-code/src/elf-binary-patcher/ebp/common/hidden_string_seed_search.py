@@ -0,0 +1,119 @@
+# python imports
+from random import randint
+from time import monotonic
+from typing import Callable, Iterable, Optional, TypeVar
+
+# project imports
+from ebp.common.algorithm import MersenneTwister, MersenneTwister64
+from ebp.common.hidden_string import HiddenString
+from ebp.common.prohibited_values import ProhibitedXorValues
+
+
+## The @ref HiddenStringSeedSearch `Self` type
+SelfType = TypeVar('SelfType', bound='HiddenStringSeedSearch')
+
+
+## Searches for a hidden string seed whose mask satisfies a predicate.
+#
+# @ref HiddenString accepts whatever mask falls out of a random seed; this tries random seeds in batches
+# (each batch being a single lockstep run of the generators, see @ref MersenneTwister.generate_many) until
+# a mask the predicate accepts is found, or the candidate / time budget runs out.
+class HiddenStringSeedSearch(object):
+
+
+    ## Mask byte values we steer clear of by default (see @ref ProhibitedXorValues).
+    ProhibitedValues = ProhibitedXorValues
+
+    ## An ASM NOP instruction.
+    AsmNop = 0x90
+
+    ## The number of candidate seeds evaluated per batch.
+    BatchSize = 4096
+
+    ## The default maximum number of candidates to try before giving up.
+    MaximumCandidates = 0x100000
+
+
+    ## Creates a predicate that rejects masks containing prohibited bytes or runs of NOPs.
+    #  @param cls the type of class that is invoking this method.
+    #  @param prohibited_values byte values that may not appear in the mask at all.
+    #  @param nop_run the length of a run of NOPs that may not appear in the mask (0 to allow any).
+    #  @returns a predicate that accepts a mask (as bytes) if it contains none of the above.
+    @classmethod
+    def avoiding(cls, prohibited_values:Iterable[int]=ProhibitedValues, nop_run:int=2) -> Callable[[bytes], bool]:
+        prohibited_values = bytes(prohibited_values)
+        nop_needle = bytes([ cls.AsmNop ]) * nop_run
+        def predicate(mask:bytes) -> bool:
+            if nop_run and nop_needle in mask:
+                return False
+            return not any( bytes([ value ]) in mask for value in prohibited_values )
+        return predicate
+
+
+    ## Creates a new instance of the search.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param predicate called with each candidate mask (as bytes); returns True to accept it (defaults to @ref avoiding).
+    #  @param mt64 search seeds for the 64-bit (MT19937-64) generator.
+    #  @param batch_size the number of candidate seeds to evaluate at once.
+    #  @param maximum_candidates the number of candidate seeds to try before giving up.
+    #  @param time_limit the number of seconds to search before giving up (or None for no limit).
+    def __init__(self, predicate:Optional[Callable[[bytes], bool]]=None, mt64:bool=False, batch_size:int=BatchSize,
+            maximum_candidates:int=MaximumCandidates, time_limit:Optional[float]=None) -> SelfType:
+        self.predicate = predicate or self.avoiding()
+        self.mt64 = mt64
+        self.batch_size = batch_size
+        self.maximum_candidates = maximum_candidates
+        self.time_limit = time_limit
+        self.tried = 0
+        self.elapsed = 0.0
+
+
+    ## Generates the masks for a batch of long seeds.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param plain_text the bytes being hidden (including the NUL terminator).
+    #  @param long_seeds the candidate long seeds.
+    #  @returns an iterator of (long seed, mask) for each candidate.
+    def masks(self, plain_text:bytes, long_seeds:list[int]) -> Iterable[tuple[int, bytes]]:
+
+        generator = MersenneTwister64 if self.mt64 else MersenneTwister
+        seeds = long_seeds if self.mt64 else [ (seed >> 32) ^ (seed & 0xffffffff) for seed in long_seeds ]
+
+        word_count = -(-len(plain_text) // generator.WORD_BYTES)
+        plain_value = int.from_bytes(plain_text, 'little')
+        to_bytes = generator.DefaultEngine.to_bytes
+
+        for long_seed, words in zip(long_seeds, generator.generate_many(seeds, word_count)):
+            mask_value = int.from_bytes(to_bytes(words)[:len(plain_text)], 'little') ^ plain_value
+            yield long_seed, mask_value.to_bytes(len(plain_text), 'little')
+
+
+    ## Searches for a seed whose mask for the given string satisfies the predicate.
+    #  The number of candidates tried and the time taken are left in `tried` and `elapsed`.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param hidden_string the hidden string to find a seed for.
+    #  @returns the hidden string created with the first accepted seed, or None if the budget ran out.
+    def __call__(self, hidden_string:str) -> Optional[HiddenString]:
+
+        plain_text = hidden_string.encode("ascii") + b"\0"
+        started = monotonic()
+        self.tried = 0
+
+        try:
+            while self.tried < self.maximum_candidates:
+
+                if self.time_limit is not None and monotonic() - started >= self.time_limit:
+                    break
+
+                batch_size = min(self.batch_size, self.maximum_candidates - self.tried)
+                # zero is not used; HiddenString treats a zero long seed as "pick one at random".
+                long_seeds = [ randint(0x0000000000000001, 0xFFFFFFFFFFFFFFFF) for _ in range(batch_size) ]
+
+                for long_seed, mask in self.masks(plain_text, long_seeds):
+                    self.tried += 1
+                    if self.predicate(mask):
+                        return HiddenString.batch([ hidden_string ], [ long_seed ], self.mt64)[0]
+
+            return None
+
+        finally:
+            self.elapsed = monotonic() - started
@@ -0,0 +1,91 @@
+# python imports
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar
+
+
+## The @ref IntervalIndex `Self` type
+SelfType = TypeVar('SelfType', bound='IntervalIndex')
+
+
+## A sorted set of non-overlapping address ranges.
+#  Ranges are half-open (`start` is in the range, `end` is not). Ranges that overlap or touch are merged as they are
+#  added, and the starts and ends are kept in two compact arrays, so adding a range and testing a range for overlap
+#  are both a bisect of those arrays.
+class IntervalIndex(object):
+
+
+    ## Creates a new instance of the index.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param ranges the initial (start, end) ranges to index.
+    def __init__(self, ranges:Iterable[Tuple[int, int]]=()) -> SelfType:
+        self.starts = array('Q')
+        self.ends = array('Q')
+        for start, end in sorted(ranges):
+            if start >= end:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+
+    ## Adds a range to the index.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param start the start of the range.
+    #  @param end the end of the range (exclusive).
+    #  @returns a token that can be passed to @ref undo_add to remove the range again.
+    def add(self, start:int, end:int) -> Optional[Tuple[int, array, array]]:
+
+        if start >= end:
+            return None
+
+        # ranges [first, last) are the ones that overlap or touch the new range; they're replaced by their union.
+        first = bisect_left(self.ends, start)
+        last = bisect_right(self.starts, end)
+
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+
+        token = (first, self.starts[first:last], self.ends[first:last])
+        self.starts[first:last] = array('Q', [ start ])
+        self.ends[first:last] = array('Q', [ end ])
+        return token
+
+
+    ## Reverts an @ref add.
+    #  Adds can only be undone in the reverse of the order they were made.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param token the token returned by the add to revert.
+    def undo_add(self, token:Optional[Tuple[int, array, array]]) -> None:
+        if token is not None:
+            first, starts, ends = token
+            self.starts[first:first + 1] = starts
+            self.ends[first:first + 1] = ends
+
+
+    ## Determines if a range overlaps any range in the index.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param start the start of the range.
+    #  @param end the end of the range (exclusive).
+    #  @returns True if any address in the range is in the index, else False.
+    def overlaps(self, start:int, end:int) -> bool:
+        # the first indexed range that ends after the query starts is the only candidate.
+        index = bisect_right(self.ends, start)
+        return start < end and index < len(self.ends) and self.starts[index] < end
+
+
+    ## Gets the number of (merged) ranges in the index.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the number of ranges in the index.
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+    ## Gets the (merged) ranges in the index.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns an iterator of (start, end) tuples, in address order.
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
@@ -1,9 +1,15 @@
 # ptoject imports
 from .elf import Elf
+from .mapped_elf import MappedElf
 from .patch_manifest import PatchManifest
+from .junk_pool import JunkPool
+from .section_index import SectionIndex
 
 # wildcard imports for the `ebp.common.algorithm` module
 __all__ = [
     "Elf",
-    "PatchManifest"
+    "MappedElf",
+    "PatchManifest",
+    "JunkPool",
+    "SectionIndex"
 ]
\ No newline at end of file
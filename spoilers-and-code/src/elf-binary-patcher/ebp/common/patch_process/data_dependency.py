@@ -1,5 +1,10 @@
 # python imports
-from typing import Iterator, TypeVar, Optional
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, Tuple, TypeVar, Optional
+
+# project imports
+from ebp.common.interval_index import IntervalIndex
 
 
 ## Self type for the @ref DataDepdendency class.
@@ -50,10 +55,9 @@ class DataDepdendency(object):
     #  @param length the length of the address range to test.
     #  @returns True if there is an overlap between this data dependency and the given range, else False.
     def collides_with(self, virtual_memory_address:int, length:int) -> bool:
-        finish_address = virtual_memory_address + length -1
-        return (virtual_memory_address >= self.start_address and virtual_memory_address < self.finish_address) or \
-               (finish_address > self.start_address and finish_address <= self.finish_address) or \
-               (virtual_memory_address < self.start_address and finish_address > self.finish_address)
+        if length <= 0 or self.length <= 0:
+            return False
+        return virtual_memory_address < self.finish_address and self.start_address < virtual_memory_address + length
 
 
     ## Converts the object to JSON notation for serialisation.
@@ -75,7 +79,11 @@ DataDependencyListType = TypeVar('DataDependencyListType', bound='DataDependency
 
 
 ## Represents a collection of data dependencies
-class DataDependencyList(list[DataDepdendency]):
+#  There is a dependency for every XOR key byte a patch uses, so these are not held as @ref DataDepdendency objects;
+#  the addresses and lengths are held in compact arrays (in the order they were recorded) and messages, which are
+#  mostly repeated, are interned. @ref DataDepdendency objects are only created when entries are read back out. 
+#  Collision tests are answered by an @ref IntervalIndex of the covered memory.
+class DataDependencyList(object):
 
     ## Loads a data dependency from JSON notorisation.
     #  @param cls the type of class invoking this method.
@@ -86,17 +94,127 @@ class DataDependencyList(list[DataDepdendency]):
         return cls( map(DataDepdendency.fromJson, json) )
 
 
+    ## Creates a new instance of the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param dependencies the initial data dependencies to hold.
+    def __init__(self, dependencies:Iterable[DataDepdendency]=()) -> DataDependencyListType:
+        self.start_addresses = array('Q')
+        self.lengths = array('Q')
+        self.message_ids = array('L')
+        self.messages = []
+        self.message_lookup = {}
+        self.covered = IntervalIndex()
+        self.sorted_start_addresses = array('Q')    # start addresses in address order ...
+        self.sorted_entries = array('L')            # ... and the entry each belongs to.
+        self.longest = 0
+        for dependency in dependencies:
+            self.append(dependency)
+
+
+    ## Records a new data dependency.
+    #  @note keeping the start addresses in address order inserts in to an array, which is O(n) in the number of
+    #    dependencies recorded. This is a single memmove; for the hundreds of dependencies a patch records it costs less
+    #    than the rest of the call, and it only dominates once there are tens of thousands.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param virtual_memory_address the virtual memory address that the data dependency starts at.
+    #  @param length the amount of bytes the data dependency covers.
+    #  @param message a message to explain what is using this memory and why.
+    #  @returns a token that can be passed to @ref undo_record to remove the dependency again.
+    def record(self, virtual_memory_address:int, length:int, message:Optional[str]) -> Tuple:
+
+        message_id = self.message_lookup.get(message, None)
+        new_message = message_id is None
+        if new_message:
+            message_id = self.message_lookup[message] = len(self.messages)
+            self.messages.append(message)
+
+        entry = len(self.start_addresses)
+        self.start_addresses.append(virtual_memory_address)
+        self.lengths.append(length)
+        self.message_ids.append(message_id)
+
+        position = bisect_right(self.sorted_start_addresses, virtual_memory_address)
+        self.sorted_start_addresses.insert(position, virtual_memory_address)
+        self.sorted_entries.insert(position, entry)
+
+        longest = self.longest
+        self.longest = max(self.longest, length)
+        covered_token = self.covered.add(virtual_memory_address, virtual_memory_address + length)
+
+        return (new_message, position, longest, covered_token)
+
+
+    ## Reverts a @ref record.
+    #  Records can only be undone in the reverse of the order they were made.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param token the token returned by the record to revert.
+    def undo_record(self, token:Tuple) -> None:
+
+        new_message, position, longest, covered_token = token
+
+        self.covered.undo_add(covered_token)
+        self.longest = longest
+        del self.sorted_start_addresses[position]
+        del self.sorted_entries[position]
+        self.start_addresses.pop()
+        self.lengths.pop()
+        self.message_ids.pop()
+
+        if new_message:
+            del self.message_lookup[self.messages.pop()]
+
+
+    ## Adds a data dependency to the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param dependency the data dependency to add.
+    def append(self, dependency:DataDepdendency) -> None:
+        self.record(dependency.start_address, dependency.length, dependency.message)
+
+
+    ## Gets a data dependency from the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param entry the index of the dependency, in the order they were recorded.
+    #  @returns the data dependency.
+    def __getitem__(self, entry:int) -> DataDepdendency:
+        message = self.messages[self.message_ids[entry]]
+        return DataDepdendency(self.start_addresses[entry], self.lengths[entry], message)
+
+
+    ## Gets the number of data dependencies in the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the number of data dependencies in the list.
+    def __len__(self) -> int:
+        return len(self.start_addresses)
+
+
+    ## Gets the data dependencies in the list.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns an iterator of the data dependencies, in the order they were recorded.
+    def __iter__(self) -> Iterator[DataDepdendency]:
+        for entry in range(len(self)):
+            yield self[entry]
+
+
     ## Returns an iterator of all data dependencies that collide with the given range.
     #  @param self the instance of the object that is invoking this method.
     #  @param virtual_memory_address address of the memory that we want to test.
     #  @param length the length of the address range to test.
     #  @returns an iterator of all the data dependencies in this list that collide with the given range.
     def collisions(self, virtual_memory_address:int, length:int) -> Iterator[DataDepdendency]:
-        for dependency in self:
+
+        finish_address = virtual_memory_address + length
+
+        if not self.covered.overlaps(virtual_memory_address, finish_address):
+            return
+
+        # no dependency is longer than `longest`; so only those starting in this window can reach the range.
+        first = bisect_left(self.sorted_start_addresses, virtual_memory_address - self.longest + 1)
+        last = bisect_left(self.sorted_start_addresses, finish_address)
+
+        for entry in sorted(self.sorted_entries[first:last]):
+            dependency = self[entry]
             if dependency.collides_with(virtual_memory_address, length):
                 yield dependency
-        return
-        yield
 
 
     ## Tests if the given range collides with any known data dependencies.
@@ -105,9 +223,7 @@ class DataDependencyList(list[DataDepdendency]):
     #  @param length the length of the address range to test.
     #  @returns True if one or more data dependencies that collide with the request range.
     def has_dependency(self, virtual_memory_address:int, length:int) -> bool:
-        for collision in self.collisions(virtual_memory_address, length):
-            return True
-        return False
+        return self.covered.overlaps(virtual_memory_address, virtual_memory_address + length)
 
 
     ## Converts the object to JSON notation for serialisation.
@@ -1,16 +1,45 @@
 # python imports
-from random import randint
-from typing import List, TypeVar, Optional, Any
+from os import stat, environ
+from pathlib import Path
+from shutil import copyfile
+from typing import List, TypeVar, Optional, Any, Iterator, Iterable, Tuple
 from types import TracebackType
 
 # third-party imports
-from pwnlib.elf import ELF as pwnlib_elf
 from elftools.elf.sections import Section
 
 # project imports
 from ebp.x64asm import ScopedJunkHook
+from ebp.common.interval_index import IntervalIndex
 from .patch_manifest import PatchManifest
-from .data_dependency import DataDepdendency
+from .junk_pool import JunkPool
+from .section_index import SectionIndex
+from .mapped_elf import MappedElf
+
+
+## The environment variable that selects the library ELF binaries are loaded with; either `mapped` (the default,
+#  see @ref MappedElf) or `pwnlib` (`pwnlib.elf.ELF`, which needs pwntools to be installed).
+ElfBackendVariable = "EBP_ELF_BACKEND"
+
+
+## Gets the class that @ref Elf extends, as selected by the @ref ElfBackendVariable environment variable.
+#  pwntools is slow to import, so it is only imported if it has been selected.
+#  @returns the class that loads ELF binaries.
+def select_elf_backend() -> type:
+
+    backend = environ.get(ElfBackendVariable, "mapped")
+
+    if backend == "mapped":
+        return MappedElf
+
+    if backend == "pwnlib":
+        try:
+            from pwnlib.elf import ELF as pwnlib_elf
+        except ImportError as ex:
+            raise RuntimeError(f"{ElfBackendVariable} selects the pwnlib ELF backend, but pwntools is not installed.") from ex
+        return pwnlib_elf
+
+    raise RuntimeError(f"{ElfBackendVariable} is '{backend}'; expected one of 'mapped' or 'pwnlib'.")
 
 
 ## Self type for the @ref Elf type.
@@ -20,7 +49,9 @@ ElfType = TypeVar('ElfType', bound="Elf")
 TentativePatchType = TypeVar('TentativePatchType', bound='TentativePatch')
 
 ## Because sometimes we don't know where we are going.
-#  Allows changes to the patch manifest to be "rolled back". Can extend this to the ELF bytes if we really need to.
+#  Allows changes to the binary to be "rolled back". While the patch is open the ELF journals every change made to it
+#  (bytes written, data dependencies recorded and junk bytes registered or used) along with how to undo it; leaving
+#  scope without confirming the patch undoes the journaled changes in reverse. Patches can be nested.
 class TentativePatch(object):
 
 
@@ -29,7 +60,7 @@ class TentativePatch(object):
     #  @param elf the ELF file we might need to undo changes in.
     def __init__(self, elf:ElfType) -> TentativePatchType:
         self.elf = elf
-        self.manifest = elf.manifest_snapshot()
+        self.journal_mark = elf.begin_transaction()
         self.changes_confirmed = False
 
 
@@ -51,23 +82,33 @@ class TentativePatch(object):
     #  @param exc_value the exception that caused us to exit `with` scope if any, else None.
     #  @param traceback the exception traceback that caused us to exit `with` scope if any, else None.
     def __exit__(self, exc_type:Optional[type], exc_value:Optional[Exception], traceback:Optional[TracebackType]):
-        if not self.changes_confirmed:
-            self.elf.restore_manifest(self.manifest)
+        if self.changes_confirmed:
+            self.elf.commit_transaction(self.journal_mark)
+        else:
+            self.elf.rollback_transaction(self.journal_mark)
 
 
 
 ## Elf extension class.
-#  Provides some extensions to the library ELF class.
-class Elf(pwnlib_elf):
+#  Provides some extensions to the library ELF class (see @ref select_elf_backend).
+class Elf(select_elf_backend()):
 
 
     ## Creates a new instance of this object.
     #  @note adds a patch manifest member to all loaded ELF files.
     #  @param self the instance of the object that is invoking this method.
     #  @param path the path of the ELF binary we are loading.
-    #  @param args positional arguments provided to constructor (see pwnlib documentation).
-    #  @param kwargs keyword arguments provided to constructor (see pwnlib documentation).
+    #  @param args positional arguments provided to constructor (see @ref MappedElf or pwnlib documentation).
+    #  @param kwargs keyword arguments provided to constructor (see @ref MappedElf or pwnlib documentation).
     def __init__(self, path:str, *args:list, **kwargs:dict) -> ElfType:
+        self.volatile_regions_cache = None
+        self.volatile_regions_sources = IntervalIndex()
+        self.journal = None
+        self.journal_marks = []
+        self._section_index = None
+        self.section_bytes_cache = {}
+        self.dirty_extents = IntervalIndex()
+        self.source_signature = self.file_signature(path)
         super().__init__(path, *args, **kwargs)
         self.patch_manifest = PatchManifest.forElf(path)
 
@@ -94,7 +135,188 @@ class Elf(pwnlib_elf):
             addresses = "\n".join( f"- 0x{d.start_address:08x} -> 0x{d.finish_address:08x} ({d.length} bytes): {d.message}" for d in data_depdendencies )
             raise RuntimeError(f"DANGER: attempted to write to 0x{address:08x} -> 0x{address+bytes_length:08x} ({bytes_length} bytes), but this clobbers registered data dependencies:\n" + addresses)
         
+        previous_bytes = self.read(address, bytes_length) if self.journal is not None else None
+        dirty_token = self.restore_bytes(address, bytes_)
+
+        if self.journal is not None:
+            self.journal.append((self.undo_write, address, previous_bytes, dirty_token))
+
+
+    ## Writes data to the elf file, without checking for data dependencies or journaling the change.
+    #  Used by @ref write, and to put back bytes when a transaction is rolled back.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the address that writing starts at.
+    #  @param bytes_ the bytes to write to the address.
+    #  @returns a token that can be passed to `dirty_extents.undo_add` to stop treating the bytes as changed.
+    def restore_bytes(self, address:int, bytes_:bytes) -> Optional[Tuple]:
+
+        # drop the volatile regions if this write could change them.
+        if self.volatile_regions_cache is not None and self.touches_volatile_sources(address, len(bytes_)):
+            self.invalidate_volatile_regions()
+
+        offset = self.vaddr_to_offset(address)
+        dirty_token = None
+
+        if offset is not None:
+            # ... and the bytes of any sections it changes.
+            if self.section_bytes_cache:
+                self.invalidate_section_bytes(offset, len(bytes_))
+            dirty_token = self.dirty_extents.add(offset, offset + len(bytes_))
+
         super().write(address, bytes_)
+        return dirty_token
+
+
+    ## Reverts a journaled @ref write; putting back the bytes it overwrote, and the dirty extents from before it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the address that was written to.
+    #  @param bytes_ the bytes that were at the address before the write.
+    #  @param dirty_token the token returned when the write marked its bytes as changed.
+    def undo_write(self, address:int, bytes_:bytes, dirty_token:Optional[Tuple]) -> None:
+        self.dirty_extents.undo_add(self.restore_bytes(address, bytes_))
+        self.dirty_extents.undo_add(dirty_token)
+
+
+    ## Gets the bytes of a section.
+    #  The bytes are read once and shared between callers until a write changes the section; unlike `section.data()`
+    #  which copies the section every time it is called.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param section the section to get the bytes of.
+    #  @returns the current bytes of the section.
+    def section_bytes(self, section:Section) -> bytes:
+        key = (section.header.sh_offset, section.header.sh_size)
+        section_bytes = self.section_bytes_cache.get(key, None)
+        if section_bytes is None:
+            section_bytes = self.section_bytes_cache[key] = section.data()
+        return section_bytes
+
+
+    ## Discards the cached bytes of any section that overlaps a range of the file.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param offset the file offset the range starts at.
+    #  @param length the number of bytes in the range.
+    def invalidate_section_bytes(self, offset:int, length:int) -> None:
+        for key in [ k for k in self.section_bytes_cache if k[0] < offset + length and offset < k[0] + k[1] ]:
+            del self.section_bytes_cache[key]
+
+
+    ## Starts journaling changes to the binary, so that they can be undone.
+    #  See @ref TentativePatch; transactions can be nested, but must be committed or rolled back innermost first.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns a mark identifying the start of the transaction in the journal.
+    def begin_transaction(self) -> int:
+        if self.journal is None:
+            self.journal = []
+        mark = len(self.journal)
+        self.journal_marks.append(mark)
+        return mark
+
+
+    ## Accepts the changes made in the innermost transaction.
+    #  If an outer transaction is open the changes stay journaled, so that it can still undo them.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param mark the mark returned when the transaction was started.
+    def commit_transaction(self, mark:int) -> None:
+        self.end_transaction(mark)
+
+
+    ## Undoes the changes made in the innermost transaction.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param mark the mark returned when the transaction was started.
+    def rollback_transaction(self, mark:int) -> None:
+        assert self.journal_marks and self.journal_marks[-1] == mark, "transactions must be rolled back innermost first."
+        while len(self.journal) > mark:
+            undo, *arguments = self.journal.pop()
+            undo(*arguments)
+        self.end_transaction(mark)
+
+
+    ## Closes the innermost transaction; journaling stops once no transactions are open.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param mark the mark returned when the transaction was started.
+    def end_transaction(self, mark:int) -> None:
+        assert self.journal_marks and self.journal_marks[-1] == mark, "transactions must be ended innermost first."
+        assert mark <= len(self.journal), "the journal has been unwound past the start of the transaction."
+        self.journal_marks.pop()
+        if not self.journal_marks:
+            self.journal = None
+
+
+    ## Caches the volatile regions of the binary, until a write touches the memory they were derived from.
+    #  See `ebp.actions.get_volatile_regions`; the regions are expensive to derive and are queried on every gadget compile.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param volatile_regions the volatile regions to cache.
+    #  @param sources the (start, end) virtual address ranges the regions were derived from (annotations and reservations).
+    def cache_volatile_regions(self, volatile_regions:Any, sources:Iterable[Tuple[int, int]]) -> None:
+        self.volatile_regions_sources = IntervalIndex(sources)
+        self.volatile_regions_cache = volatile_regions
+
+
+    ## Discards any cached volatile regions; they will be derived again the next time they are requested.
+    #  @param self the instance of the object that is invoking this method.
+    def invalidate_volatile_regions(self) -> None:
+        self.volatile_regions_cache = None
+        self.volatile_regions_sources = IntervalIndex()
+
+
+    ## Determines if a range of memory overlaps memory the cached volatile regions were derived from.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the start of the range.
+    #  @param length the number of bytes in the range.
+    #  @returns True if the range overlaps any of the sources, else False.
+    def touches_volatile_sources(self, address:int, length:int) -> bool:
+        return self.volatile_regions_sources.overlaps(address, address + length)
+
+
+    ## Gets a read-only view of the bytes at a virtual address, without copying them.
+    #  Unlike `read` this does not follow the range across segments; the whole range must be backed by the file.
+    #  The view reflects any later writes to the binary.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address the view starts at.
+    #  @param count the number of bytes in the view.
+    #  @returns a read-only memoryview of the requested bytes.
+    def view(self, address:int, count:int) -> memoryview:
+        offset = self.vaddr_to_offset(address)
+        if offset is None:
+            raise RuntimeError(f"Unable to view 0x{address:016x} - this address is not backed by the file.")
+        return self.file_view(offset, count)
+
+
+    ## Gets a read-only view of the bytes in a section, without copying them.
+    #  The view reflects any later writes to the binary.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param section the section to view.
+    #  @returns a read-only memoryview of the sections bytes; index 0 is the byte at the sections `sh_addr`.
+    def section_view(self, section:Section) -> memoryview:
+        return self.file_view(section.header.sh_offset, section.header.sh_size)
+
+
+    ## Gets a read-only view of the file, without copying it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param offset the file offset the view starts at.
+    #  @param count the number of bytes in the view.
+    #  @returns a read-only memoryview of the requested bytes.
+    def file_view(self, offset:int, count:int) -> memoryview:
+        if offset < 0 or offset + count > len(self.mmap):
+            raise RuntimeError(f"Unable to view file offset 0x{offset:08x} -> 0x{offset+count:08x} ({count} bytes); this is outside of the file.")
+        return memoryview(self.mmap)[offset:offset + count].toreadonly()
+
+
+    ## Finds every occurance of a byte sequence in a range of virtual memory, without copying the memory.
+    #  Occurances may overlap.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param sequence the byte sequence to look for.
+    #  @param address the virtual address to start looking from.
+    #  @param count the number of bytes to search.
+    #  @returns an iterator of the virtual addresses the sequence was found at.
+    def find_all(self, sequence:bytes, address:int, count:int) -> Iterator[int]:
+        offset = self.vaddr_to_offset(address)
+        if offset is None:
+            raise RuntimeError(f"Unable to search 0x{address:016x} - this address is not backed by the file.")
+        index = self.mmap.find(sequence, offset, offset + count)
+        while index >= 0:
+            yield address + (index - offset)
+            index = self.mmap.find(sequence, index + 1, offset + count)
 
 
     ## Registers any junk bytes that are creating within the given scope.
@@ -109,13 +331,14 @@ class Elf(pwnlib_elf):
     #  @param address the address of the byte to note as being junk.
     def register_junk(self, address:int) -> None:
         assert not self.patch_manifest.data_dependencies.has_dependency(address, 1)
-        return self.patch_manifest.junk_offsets.append(address)
+        if self.patch_manifest.junk_offsets.add(address) and self.journal is not None:
+            self.journal.append((self.patch_manifest.junk_offsets.discard, address))
 
 
-    ## Gets a list of available junk offsets.
+    ## Gets the available junk offsets.
     #  @param self the instance of the object that is invoking this method.
-    #  @return list of offsets that contain junk values.
-    def junk_available(self) -> List[int]:
+    #  @return pool of offsets that contain junk values.
+    def junk_available(self) -> JunkPool:
         return self.patch_manifest.junk_offsets
 
     ## Assigns the requires value to a junk offset and returns that address.
@@ -134,8 +357,8 @@ class Elf(pwnlib_elf):
         assert len(value) == 1, "too much data for junk byte"
 
         # assign a junk value
-        index = randint(0, len(self.patch_manifest.junk_offsets) - 1)
-        address = self.patch_manifest.junk_offsets.pop(index)
+        address = self.patch_manifest.junk_offsets.choice()
+        self.discard_junk(address)
         self.write(address, value)
         
         # notorise the new dependency
@@ -149,26 +372,56 @@ class Elf(pwnlib_elf):
     #  @note overwritten to also save manifest file on save() call.
     #  @param self the instance of the object that is invoking this method.
     #  @param path the path to save the binay at, if ommited uses load path.
-    #  @returns check pwnlib documentation.
-    def save(self, path:str=None) -> Any:
+    def save(self, path:str=None) -> None:
+        assert not self.journal_marks, "the binary can not be saved while a transaction is open."
         if path is None:
             path = self.path
+        self.save_dirty_extents(Path(path))
         self.patch_manifest.save(path)
-        return super().save(path)
 
 
-    ## Takes a snapshot of the manifest.
+    ## Saves the binary by writing only the extents of the file that have changed since it was loaded.
+    #  Saving over the loaded file writes the changed extents in place; saving anywhere else copies the loaded file
+    #  (which the kernel can do without it passing through us) and then writes the changed extents over the copy. If
+    #  the loaded file has changed on disk since it was loaded, saving anywhere else writes the whole binary instead;
+    #  saving over it is refused, rather than losing whichever changes were made to it.
     #  @param self the instance of the object that is invoking this method.
-    #  @returns a duplicate copy of the current patch manifest file.
-    def manifest_snapshot(self) -> PatchManifest:
-        return self.patch_manifest.copy()
+    #  @param path the path to save the binary at.
+    def save_dirty_extents(self, path:Path) -> None:
 
-    ## Sets the current patch manifest.
-    #  Used to restore a previous manifest if patching fails.
-    #  @param self the instance of the object that is invoking this method.
-    #  @param manifest the manifest to restore.
-    def restore_manifest(self, manifest:PatchManifest) -> None:
-        self.patch_manifest = manifest
+        source = Path(self.path)
+        in_place = path.exists() and path.samefile(source)
+
+        if self.file_signature(source) != self.source_signature:
+            if in_place:
+                raise RuntimeError(f"Unable to save {path}; it has changed on disk since it was loaded.")
+            super().save(path)
+            return
+
+        if not in_place:
+            copyfile(source, path)
+
+        with path.open("r+b") as file_handle:
+            for start, end in self.dirty_extents:
+                file_handle.seek(start)
+                file_handle.write(self.mmap[start:end])
+
+        # the loaded file now matches the binary; later saves only need what changes from here.
+        if in_place:
+            self.dirty_extents = IntervalIndex()
+            self.source_signature = self.file_signature(source)
+
+
+    ## Gets a signature used to detect if a file has changed on disk.
+    #  @param path the path of the file.
+    #  @returns the size and modification time of the file, or None if it does not exist.
+    @staticmethod
+    def file_signature(path:str) -> Optional[Tuple[int, int]]:
+        try:
+            file_stat = stat(path)
+        except FileNotFoundError:
+            return None
+        return (file_stat.st_size, file_stat.st_mtime_ns)
 
 
     ## Records a new data depdendency in this elf.
@@ -178,12 +431,22 @@ class Elf(pwnlib_elf):
     #  @param message the reason we are not dependent on this address range.
     def record_data_dependency(self, virtual_memory_address, length, message=None) -> None:
         for address in range(virtual_memory_address, virtual_memory_address + length):
-            if address in self.patch_manifest.junk_offsets:
-                index = self.patch_manifest.junk_offsets.index(address)
-                del self.patch_manifest.junk_offsets[index]
-        
-        dependency = DataDepdendency(virtual_memory_address, length, message)
-        self.patch_manifest.data_dependencies.append(dependency)
+            self.discard_junk(address)
+
+        data_dependencies = self.patch_manifest.data_dependencies
+        token = data_dependencies.record(virtual_memory_address, length, message)
+        if self.journal is not None:
+            self.journal.append((data_dependencies.undo_record, token))
+
+
+    ## Removes an address from the available junk offsets, if it is one.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the address that is no longer junk.
+    def discard_junk(self, address:int) -> None:
+        junk_offsets = self.patch_manifest.junk_offsets
+        position = junk_offsets.discard(address)
+        if position is not None and self.journal is not None:
+            self.journal.append((junk_offsets.restore, address, position))
 
 
     ## Determines which section the given address resides in.
@@ -205,14 +468,36 @@ class Elf(pwnlib_elf):
 
     ## Determines the sections that a given memory address can appear in.
     #  NOTE: this returns a list - if the ELF is healthy and we've not goofed there should only ever be 0 or 1 items in this list.
+    #  Only sections that occupy memory are considered, and a section does not contain the address at its end.
     #  @param self the instance of the object that is invoking this method.
     #  @param address the address tha we wish to try to find the owning section of.
     #  @returns a list of sections that contain the given virtual memory address.
     def get_all_sections_containing(self, address:int) -> List[Section]:
-        sections = []
-        for section in self.sections:
-            section_start = section.header.sh_addr
-            section_ends = section_start + section.header.sh_size
-            if address >= section_start and address <= section_ends:
-                sections.append(section)
-        return sections
+        return self.section_index.sections_containing(address)
+
+
+    ## The index of where sections and segments sit in memory; built the first time it is needed.
+    @property
+    def section_index(self) -> SectionIndex:
+        if self._section_index is None:
+            self._section_index = SectionIndex(self)
+        return self._section_index
+
+
+    ## Translates a virtual address to the offset in the file that backs it.
+    #  @note overriden to answer from the @ref SectionIndex rather than searching the memory map.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address to translate.
+    #  @returns the file offset, or None if the address is not backed by the file.
+    def vaddr_to_offset(self, address:int) -> Optional[int]:
+        return self.section_index.vaddr_to_offset(address - self.address + self.load_addr)
+
+
+    ## Translates a file offset to the virtual address it is loaded at.
+    #  @note overriden to answer from the @ref SectionIndex rather than searching the segments.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param offset the file offset to translate.
+    #  @returns the virtual address, or None if the offset is not loaded.
+    def offset_to_vaddr(self, offset:int) -> Optional[int]:
+        address = self.section_index.offset_to_vaddr(offset)
+        return None if address is None else address + self.address - self.load_addr
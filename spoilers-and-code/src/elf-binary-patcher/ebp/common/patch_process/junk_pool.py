@@ -0,0 +1,119 @@
+# python imports
+from array import array
+from random import randint
+from typing import Iterable, Iterator, Optional, TypeVar
+
+
+## Self type for the @ref JunkPool class.
+JunkPoolType = TypeVar('JunkPoolType', bound='JunkPool')
+
+
+## A pool of addresses that hold junk bytes; values that can be arbitrarily changed.
+#  Junk gadgets register thousands of these, and every data dependency recorded needs to remove any it covers. The
+#  addresses are held in a compact array with a map of address to position in the array; removing an address moves
+#  the last address in to its place. This makes adding, removing, picking an address at random and membership tests
+#  all O(1). The order addresses are held in is not meaningful.
+class JunkPool(object):
+
+
+    ## Loads a junk pool from JSON notorisation.
+    #  @param cls the type of class invoking this method.
+    #  @param json the JSON list of junk addresses.
+    #  @returns a new instance of the object from the provided JSON.
+    @classmethod
+    def fromJson(cls, json:list) -> JunkPoolType:
+        return cls(json)
+
+
+    ## Creates a new instance of the pool.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param addresses the initial junk addresses to hold.
+    def __init__(self, addresses:Iterable[int]=()) -> JunkPoolType:
+        self.addresses = array('Q')
+        self.positions = {}
+        for address in addresses:
+            self.add(address)
+
+
+    ## Adds an address to the pool; addresses already in the pool are ignored.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the address of the junk byte.
+    #  @returns True if the address was added, or False if it was already in the pool.
+    def add(self, address:int) -> bool:
+        if address in self.positions:
+            return False
+        self.positions[address] = len(self.addresses)
+        self.addresses.append(address)
+        return True
+
+
+    ## Removes an address from the pool, if it is in the pool.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the address to remove.
+    #  @returns the position the address held (see @ref restore), or None if it was not in the pool.
+    def discard(self, address:int) -> Optional[int]:
+
+        position = self.positions.pop(address, None)
+        if position is None:
+            return None
+
+        last_address = self.addresses.pop()
+        if last_address != address:
+            self.addresses[position] = last_address
+            self.positions[last_address] = position
+
+        return position
+
+
+    ## Reverts a @ref discard, putting the address back in the position it held.
+    #  Discards can only be undone in the reverse of the order they were made.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the address that was discarded.
+    #  @param position the position returned by the discard.
+    def restore(self, address:int, position:int) -> None:
+        if position < len(self.addresses):
+            moved_address = self.addresses[position]
+            self.positions[moved_address] = len(self.addresses)
+            self.addresses.append(moved_address)
+            self.addresses[position] = address
+        else:
+            self.addresses.append(address)
+        self.positions[address] = position
+
+
+    ## Picks a random address from the pool, without removing it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the address that was picked.
+    def choice(self) -> int:
+        if not self.addresses:
+            raise RuntimeError("Unable to draw a junk byte; there are none available.")
+        return self.addresses[randint(0, len(self.addresses) - 1)]
+
+
+    ## Determines if an address is in the pool.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the address to look for.
+    #  @returns True if the address is in the pool, else False.
+    def __contains__(self, address:int) -> bool:
+        return address in self.positions
+
+
+    ## Gets the number of addresses in the pool.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the number of addresses in the pool.
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+
+    ## Gets the addresses in the pool.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns an iterator of the addresses in the pool.
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.addresses)
+
+
+    ## Converts the object to JSON notation for serialisation.
+    #  @param self the instance of the object that is invoking this method.
+    #  @returns the junk addresses, as a list that can be serialised.
+    def to_json(self) -> list:
+        return self.addresses.tolist()
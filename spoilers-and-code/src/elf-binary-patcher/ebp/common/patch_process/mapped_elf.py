@@ -0,0 +1,201 @@
+# python imports
+from mmap import mmap, ACCESS_COPY
+from os.path import abspath
+from typing import Iterator, List, Optional, TypeVar
+
+# third-party imports
+from elftools.elf.elffile import ELFFile
+from elftools.elf.sections import Section
+from elftools.elf.segments import Segment
+
+
+## Self type for the @ref MappedElf class.
+MappedElfType = TypeVar('MappedElfType', bound='MappedElf')
+
+
+## A lightweight ELF binary that can be read, patched and saved.
+#  Built directly on pyelftools, and provides the part of the `pwnlib.elf.ELF` interface this tool uses (`read`,
+#  `write`, `save`, `sections`, `entry`, `get_segment_for_address` and the address translation helpers) without
+#  importing pwntools or doing the symbol, PLT and checksec analysis its constructor does. The file is mapped
+#  copy-on-write; writes change the mapping (and so what pyelftools reads back) but not the file on disk.
+class MappedElf(ELFFile):
+
+
+    ## The granularity segments are mapped in to memory with.
+    PageSize:int = 0x1000
+
+
+    ## Creates a new instance of this object.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param path the path of the ELF binary we are loading.
+    #  @param checksec accepted for compatibility with `pwnlib.elf.ELF`; no security checks are performed.
+    def __init__(self, path:str, checksec:bool=False) -> MappedElfType:
+
+        # the mapping stays valid once the file it was made from is closed.
+        with open(path, 'rb') as file_handle:
+            self.mmap = mmap(file_handle.fileno(), 0, access=ACCESS_COPY)
+
+        self._sections = None
+        self._segments = None
+        super().__init__(self.mmap)
+        self.path = abspath(path)
+
+        self.load_segments = sorted(( s.header for s in self.iter_segments('PT_LOAD') ), key=lambda header: header.p_vaddr)
+
+        # like pwnlib; position dependent binaries are at the lowest address they load at, anything else is at zero.
+        load_addresses = [ header.p_vaddr for header in self.load_segments if header.p_vaddr ]
+        self.load_addr = min(load_addresses) if load_addresses and self.header.e_type != 'ET_DYN' else 0
+        self.address = self.load_addr
+
+        # segments are mapped a page at a time; the rest of their first and last page (up to the next segment) reads as zeros.
+        self.memory_spans = []
+        for index, header in enumerate(self.load_segments):
+            memory_end = header.p_vaddr + header.p_memsz
+            span_start = max(header.p_vaddr - (header.p_vaddr % self.PageSize), self.memory_spans[-1][1] if self.memory_spans else 0)
+            span_end = memory_end + (-memory_end % self.PageSize)
+            if index + 1 < len(self.load_segments):
+                span_end = min(span_end, max(self.load_segments[index + 1].p_vaddr, memory_end))
+            self.memory_spans.append((span_start, span_end, header))
+
+
+    ## Iterates the sections in the binary.
+    #  @note overriden so the sections are only parsed once.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param type if given, only sections of this type (`sh_type`) are yielded.
+    #  @returns an iterator of the sections in the binary.
+    def iter_sections(self, type:Optional[str]=None) -> Iterator[Section]:
+        if self._sections is None:
+            self._sections = [ self.get_section(index) for index in range(self.num_sections()) ]
+        return ( section for section in self._sections if type is None or section.header.sh_type == type )
+
+
+    ## Iterates the segments in the binary.
+    #  @note overriden so the segments are only parsed once.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param type if given, only segments of this type (`p_type`) are yielded.
+    #  @returns an iterator of the segments in the binary.
+    def iter_segments(self, type:Optional[str]=None) -> Iterator[Segment]:
+        if self._segments is None:
+            self._segments = [ self.get_segment(index) for index in range(self.num_segments()) ]
+        return ( segment for segment in self._segments if type is None or segment.header.p_type == type )
+
+
+    ## The sections in the binary.
+    @property
+    def sections(self) -> List[Section]:
+        return list(self.iter_sections())
+
+
+    ## The segments in the binary.
+    @property
+    def segments(self) -> List[Segment]:
+        return list(self.iter_segments())
+
+
+    ## The address of the entry point of the binary.
+    @property
+    def entry(self) -> int:
+        return self.address + (self.header.e_entry - self.load_addr)
+
+
+    ## Translates a virtual address to the offset in the file that backs it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address to translate.
+    #  @returns the file offset, or None if the address is not backed by the file.
+    def vaddr_to_offset(self, address:int) -> Optional[int]:
+        address = address - self.address + self.load_addr
+        for header in self.load_segments:
+            if header.p_vaddr <= address < header.p_vaddr + header.p_filesz:
+                return header.p_offset + (address - header.p_vaddr)
+        return None
+
+
+    ## Translates a file offset to the virtual address it is loaded at.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param offset the file offset to translate.
+    #  @returns the virtual address, or None if the offset is not loaded.
+    def offset_to_vaddr(self, offset:int) -> Optional[int]:
+        for header in self.load_segments:
+            if header.p_offset <= offset < header.p_offset + header.p_filesz:
+                return header.p_vaddr + (offset - header.p_offset) + self.address - self.load_addr
+        return None
+
+
+    ## Gets the loadable segment that holds a range of virtual memory.
+    #  As with pwnlib, the whole range (and the byte after it) must be in both the memory and file-backed part of the segment.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address the range starts at.
+    #  @param size the number of bytes in the range.
+    #  @returns the segment that holds the range, or None if no one segment does.
+    def get_segment_for_address(self, address:int, size:int=1) -> Optional[Segment]:
+
+        for segment in self.iter_segments('PT_LOAD'):
+            header = segment.header
+
+            if not (header.p_vaddr <= address <= address + size < header.p_vaddr + header.p_memsz):
+                continue
+
+            offset = self.vaddr_to_offset(address)
+            if offset is not None and header.p_offset <= offset <= offset + size < header.p_offset + header.p_filesz:
+                return segment
+
+        return None
+
+
+    ## Reads bytes from a virtual address.
+    #  The range may span segments; memory that is loaded but not backed by the file (such as `.bss`) reads as zeros.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address to start reading from.
+    #  @param count the number of bytes to read.
+    #  @returns the bytes that were read.
+    def read(self, address:int, count:int) -> bytes:
+
+        chunks = []
+        cursor = address - self.address + self.load_addr
+        stop = cursor + count
+
+        for span_start, span_end, header in self.memory_spans:
+
+            if cursor >= stop or cursor < span_start:
+                break
+            if cursor >= span_end:
+                continue
+
+            chunk_end = min(stop, span_end)
+            file_start = max(cursor, header.p_vaddr)
+            file_end = min(chunk_end, header.p_vaddr + header.p_filesz)
+
+            if file_start < file_end:
+                offset = header.p_offset + (file_start - header.p_vaddr)
+                chunks.append(bytes(file_start - cursor))
+                chunks.append(self.mmap[offset:offset + (file_end - file_start)])
+                chunks.append(bytes(chunk_end - file_end))
+            else:
+                chunks.append(bytes(chunk_end - cursor))
+
+            cursor = chunk_end
+
+        if cursor < stop:
+            raise RuntimeError(f"Unable to read 0x{address:016x} -> 0x{address+count:016x} ({count} bytes); 0x{cursor - self.load_addr + self.address:016x} is not loaded from the binary.")
+
+        return b"".join(chunks)
+
+
+    ## Writes bytes to a virtual address.
+    #  The bytes are written to the mapping of the file; see @ref save.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address that writing starts at.
+    #  @param bytes_ the bytes to write to the address.
+    def write(self, address:int, bytes_:bytes) -> None:
+        offset = self.vaddr_to_offset(address)
+        if offset is None:
+            raise RuntimeError(f"Unable to write to 0x{address:016x} - this address is not backed by the file.")
+        self.mmap[offset:offset + len(bytes_)] = bytes_
+
+
+    ## Saves the binary, with any changes that have been written to it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param path the path to save the binary at, if ommited uses load path.
+    def save(self, path:str=None) -> None:
+        with open(path or self.path, 'wb') as file_handle:
+            file_handle.write(self.mmap)
@@ -4,7 +4,6 @@ from typing import TypeVar
 from pathlib import Path
 from json import load, dump
 from datetime import datetime
-from copy import copy
 
 ## The @ref PatchManifest object self type.
 PatchManifestType = TypeVar('PatchManifestType', bound='PatchManifest')
@@ -12,6 +11,7 @@ PatchManifestType = TypeVar('PatchManifestType', bound='PatchManifest')
        
 # project imports
 from .data_dependency import DataDependencyList
+from .junk_pool import JunkPool
 
 ## Patch Manifest Object
 #  This object contains information about the patch process. 
@@ -77,20 +77,9 @@ class PatchManifest(object):
         self.last_saved = None                          # when the elf file was last written.
         self.last_saved_path = None                     # where the elf file was written to.         
         self.data_dependencies = DataDependencyList()   # a list of offsets that are being used as data and should not be altered.
-        self.junk_offsets = []                          # a lsit of offsets that are junk and can be arbitrarily altered.
+        self.junk_offsets = JunkPool()                  # a pool of offsets that are junk and can be arbitrarily altered.
 
 
-    ## Creates a copy of this elf manifest
-    #  This is mostly used for snapshotting before a tentative path. The copy must be entirely stand alone for this reason.
-    #  @param self the instance of the object that is invoking this object.
-    #  @returns a new, duplicate instance of this object.
-    def copy(self) -> PatchManifestType:
-        manifest_copy = copy(self)
-        manifest_copy.data_dependencies = copy(self.data_dependencies)
-        manifest_copy.junk_offsets = copy(self.junk_offsets)
-        return manifest_copy
-    
-
     ## Converts the object to JSON notation for serialisation.
     #  @param self the instance of the object that is invoking this method.
     #  @returns this object, expressed as a dict object that can be serialised.
@@ -99,7 +88,7 @@ class PatchManifest(object):
             'last-saved': self.last_saved.strftime("%Y-%m-%d %H:%M:%S"),
             'last-saved-path': str(self.last_saved_path),
             'data-dependencies': self.data_dependencies.to_json(),
-            'junk-offsets': self.junk_offsets,
+            'junk-offsets': self.junk_offsets.to_json(),
         }
 
     ## Applies data loaded in JSON notorisation to this object.
@@ -111,7 +100,7 @@ class PatchManifest(object):
         last_saved_path = json.get('last-saved-path', None)
         last_saved_date = json.get('last-saved', None)
 
-        self.junk_offsets = json.get('junk-offsets', [])
+        self.junk_offsets = JunkPool.fromJson(json.get('junk-offsets', []))
         self.data_dependencies = DataDependencyList.fromJson(data_depdendencies)
         self.last_saved_path = None if not last_saved_path else Path(last_saved_path)
         self.last_saved = None if not last_saved_date else datetime.strptime(
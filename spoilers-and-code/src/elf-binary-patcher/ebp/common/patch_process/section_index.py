@@ -0,0 +1,118 @@
+# python imports
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, TypeVar
+
+# third-party imports
+from elftools.elf.elffile import ELFFile
+from elftools.elf.sections import Section
+from elftools.elf.constants import SH_FLAGS
+
+
+## Self type for the @ref SectionIndex class.
+SectionIndexType = TypeVar('SectionIndexType', bound='SectionIndex')
+
+
+## An index of where sections and loaded segments sit in virtual memory (and in the file).
+#  Built once when a binary is loaded, then queried with a bisect rather than a scan of every section or segment.
+#  Ranges are half-open; a section of `N` bytes at `A` contains `A` up to (but not including) `A + N`. Only sections
+#  that occupy memory (`SHF_ALLOC`) are indexed, and only when they have a size; thread local `NOBITS` sections
+#  (`.tbss`) describe per-thread templates rather than memory at their address, so they are left out too.
+#  Addresses are those the binary was linked at; see `Elf.vaddr_to_offset` for binaries that have been rebased.
+class SectionIndex(object):
+
+
+    ## Creates a new instance of the index.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param elffile the ELF binary to index.
+    def __init__(self, elffile:ELFFile) -> SectionIndexType:
+
+        sections = []
+        for section in elffile.iter_sections():
+            flags = section.header.sh_flags
+            if not flags & SH_FLAGS.SHF_ALLOC or section.header.sh_size == 0:
+                continue
+            if section.header.sh_type == 'SHT_NOBITS' and flags & SH_FLAGS.SHF_TLS:
+                continue
+            sections.append(section)
+
+        sections.sort(key=lambda section: section.header.sh_addr)
+        self.sections = sections
+        self.section_starts = array('Q', ( s.header.sh_addr for s in sections ))
+        self.section_ends = array('Q', ( s.header.sh_addr + s.header.sh_size for s in sections ))
+        self.longest_section = max(( s.header.sh_size for s in sections ), default=0)
+
+        # only the part of a segment that is backed by the file can be translated to a file offset.
+        segments = [ s.header for s in elffile.iter_segments() if s.header.p_type == 'PT_LOAD' and s.header.p_filesz ]
+
+        self.longest_segment = max(( h.p_filesz for h in segments ), default=0)
+
+        by_address = sorted(segments, key=lambda header: header.p_vaddr)
+        self.segment_addresses = array('Q', ( h.p_vaddr for h in by_address ))
+        self.segment_address_ends = array('Q', ( h.p_vaddr + h.p_filesz for h in by_address ))
+        self.segment_address_offsets = array('Q', ( h.p_offset for h in by_address ))
+
+        by_offset = sorted(segments, key=lambda header: header.p_offset)
+        self.segment_offsets = array('Q', ( h.p_offset for h in by_offset ))
+        self.segment_offset_ends = array('Q', ( h.p_offset + h.p_filesz for h in by_offset ))
+        self.segment_offset_addresses = array('Q', ( h.p_vaddr for h in by_offset ))
+
+
+    ## Gets the sections that contain a virtual address.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address to look for.
+    #  @returns the sections that contain the address, in address order (there should only ever be 0 or 1).
+    def sections_containing(self, address:int) -> List[Section]:
+
+        # sections starting at or before the address, and no more than the longest section before it, can contain it.
+        index = bisect_right(self.section_starts, address) - 1
+        sections = []
+
+        while index >= 0 and self.section_starts[index] + self.longest_section > address:
+            if address < self.section_ends[index]:
+                sections.append(self.sections[index])
+            index -= 1
+
+        sections.reverse()
+        return sections
+
+
+    ## Translates a virtual address to the offset in the file that backs it.
+    #  If loaded segments overlap, the one that starts at the lowest address translates the address.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param address the virtual address to translate.
+    #  @returns the file offset, or None if the address is not backed by the file.
+    def vaddr_to_offset(self, address:int) -> Optional[int]:
+
+        # segments starting at or before the address, and no more than the longest segment before it, can contain it.
+        index = bisect_right(self.segment_addresses, address) - 1
+        offset = None
+
+        while index >= 0 and self.segment_addresses[index] + self.longest_segment > address:
+            if address < self.segment_address_ends[index]:
+                offset = self.segment_address_offsets[index] + (address - self.segment_addresses[index])
+            index -= 1
+
+        return offset
+
+
+    ## Translates a file offset to the virtual address it is loaded at.
+    #  If the offset is loaded by more than one segment, the segment that starts at the lowest address translates it.
+    #  @param self the instance of the object that is invoking this method.
+    #  @param offset the file offset to translate.
+    #  @returns the virtual address, or None if the offset is not loaded.
+    def offset_to_vaddr(self, offset:int) -> Optional[int]:
+
+        # as above; segments starting at or before the offset, and no more than the longest segment before it, can load it.
+        index = bisect_right(self.segment_offsets, offset) - 1
+        loaded_by = None
+
+        while index >= 0 and self.segment_offsets[index] + self.longest_segment > offset:
+            if offset < self.segment_offset_ends[index]:
+                if loaded_by is None or self.segment_offset_addresses[index] < self.segment_offset_addresses[loaded_by]:
+                    loaded_by = index
+            index -= 1
+
+        if loaded_by is None:
+            return None
+        return self.segment_offset_addresses[loaded_by] + (offset - self.segment_offsets[loaded_by])
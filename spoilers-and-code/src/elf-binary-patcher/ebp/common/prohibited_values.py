@@ -0,0 +1,7 @@
+## Byte values that XOR masks steer clear of.
+#  Shared by the `protect-strings` XOR assignment gadgets and @ref HiddenStringSeedSearch, which avoid them for the same reasons.
+ProhibitedXorValues = [
+    0x00, # Really not useful for XOR operations - leaves the other operand (e.g. the plain text character) as-is.
+    0x90, # :kludge: 0x90 _could_ be an ASM NOP instruction, ASM NOPs are used to reserve space for patching so this value may change later.
+          #    ideal world we would track area's we've identified for patching, for now though its just easier to steer clear.
+]
@@ -1,6 +1,9 @@
 # python3 imports
 from argparse import Namespace
 
+# project imports
+from ebp.common.algorithm import MersenneTwisterBase, MersenneTwisterStateCache
+
 ## The EBP binary application
 #  Acts as a wrapper for the tools/actions this package contains.
 class ElfBinaryPatcher(object):
@@ -11,6 +14,9 @@ class ElfBinaryPatcher(object):
     #  @param arguments the arguments that the application was invoked with.
     def run(self, arguments:Namespace) -> None:
 
+        if arguments.mt_state_cache:
+            MersenneTwisterBase.state_cache = MersenneTwisterStateCache(directory=arguments.mt_state_cache)
+
         # create an instance of the action and invoked it.
         action_instance = arguments.action_class(arguments)
         exit( action_instance() )
@@ -74,6 +74,9 @@ class ElfBinaryPatcherArguments(ArgumentParser):
             choices=CliLoggingLevel.LoggingLevels.keys(), default=INFO, action=CliLoggingLevel,
             help="The amount of logging that this tooling should generate.")
 
+        self.add_argument("--mt-state-cache", type=Path, default=None,
+            help="Directory used to persist seeded Mersenne Twister states between runs (states are only cached in memory if omitted).")
+
         actions_subparsers = self.add_subparsers(dest="action", help="the actions this tool can perform", parser_class=ArgumentParser)
         actions_subparsers.required = True
 
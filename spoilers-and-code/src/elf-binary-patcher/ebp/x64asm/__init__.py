@@ -7,6 +7,7 @@ from .base import x64Instruction, CompilationState
 from .inc_rbx import INC_RBX
 from .dec_rbx import DEC_RBX
 from .add_rbx_imm8 import ADD_RBX_imm8
+from .add_rbx_imm32 import ADD_RBX_imm32
 from .sub_rbx_imm8 import SUB_RBX_imm8
 from .mov_qwordptr_rbx_rax import MOV_QWORDPTR_RBX_RAX
 from .mov_dwordptr_rbx_eax import MOV_DWORDPTR_RBX_EAX
@@ -15,7 +15,8 @@ class MOV_DWORDPTR_RBX_imm8off_imm32(x64Instruction):
     
     ## Instanciates a new @ref MOV_DWORDPTR_RBX_imm8off_imm32 object.
     #  @param self the instance of the object that is invoking this method.
-    #  @param relative_offset the RIP relative offset to read a value from.
+    #  @param offset the (signed) offset from RBX to write the value to; -0x80 to 0x7f.
+    #  @param value the value to write.
     #  @param signed indicates whether the value is signed or not.
     def __init__(self, offset, value, signed=False) -> SelfType:
         self.offset = offset
@@ -33,7 +34,8 @@ class MOV_DWORDPTR_RBX_imm8off_imm32(x64Instruction):
     #  Displays the instruction as INTEL flavor assembly.
     #  @returns a Friendly string that represents the data contained in this object.
     def __str__(self) -> str:
-        return f"mov     DWORD PTR[rbx + 0x{self.offset:02x}], 0x{self.value:08x}"
+        sign = "-" if self.offset < 0 else "+"
+        return f"mov     DWORD PTR[rbx {sign} 0x{abs(self.offset):02x}], 0x{self.value:08x}"
 
 
     ## Compiles this assembly instruction into shellcode.
@@ -41,4 +43,4 @@ class MOV_DWORDPTR_RBX_imm8off_imm32(x64Instruction):
     def __call__(self, state:CompilationState) -> bytearray:
         offset_byte = self.offset.to_bytes(length=1, byteorder='little', signed=True)
         value_bytes = self.value.to_bytes(length=4, byteorder='little', signed=self.value_signed)
-        return [0xc7, 0x43, self.offset] + list(value_bytes)
\ No newline at end of file
+        return [0xc7, 0x43] + list(offset_byte) + list(value_bytes)
\ No newline at end of file
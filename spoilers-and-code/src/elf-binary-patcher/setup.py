@@ -20,9 +20,19 @@ readme_md = project_directory / 'README.md'
 
 ## List of packages that this project requires
 required_dependencies = [
-    "pwntools       >= 4.9, < 5",   # used to parse/edit the ELF file.
+    "pyelftools     >= 0.29, < 1",  # used to parse/edit the ELF file.
 ]
 
+## Optional dependencies (extras); install with, e.g., `pip install -e .[fast]`
+optional_dependencies = {
+    "fast": [
+        "numpy      >= 1.20, < 3",  # vectorised mersenne twister engine (pure-python fallback is used without it).
+    ],
+    "pwnlib": [
+        "pwntools   >= 4.9, < 5",   # alternative ELF backend (selected with `EBP_ELF_BACKEND=pwnlib`).
+    ]
+}
+
 
 # do the setup action.
 setup(
@@ -57,6 +67,9 @@ setup(
     # List of dependencies that this module requires.
     install_requires = required_dependencies,
 
+    # List of optional dependencies (extras) this module supports.
+    extras_require = optional_dependencies,
+
     # List additional URLs that are relevant to the package.
     project_urls={
         "module": "https://github.com/wintersdeep/cv-ctf/spoilers-and-code/src/elf-binary-patcher/README.md"
@@ -0,0 +1,88 @@
+# python imports
+from os import environ
+from pathlib import Path
+from shutil import which, copyfile
+from subprocess import run, PIPE, STDOUT
+from sys import executable
+
+# third-party imports
+import pytest
+
+
+## The directory the `ebp` package is in.
+PatcherDirectory = Path(__file__).resolve().parent.parent
+
+## The script that builds the internal `elf-binary` crackme.
+CrackmeBuildScript = PatcherDirectory.parent / "elf-binary" / "scripts" / "build-internal.sh"
+
+## A small program with initialised data, and memory that is not backed by the file (`.bss`).
+SampleSource = """
+char sample_data[96] = "initialised data that is backed by the file";
+char sample_bss[8192];
+
+int main(int argc, char ** argv) {
+    sample_bss[argc] = sample_data[argc];
+    return sample_bss[1];
+}
+"""
+
+
+## Compiles a C program, skipping the test if it can't be built here.
+#  @param directory the directory to build the program in.
+#  @param name the name of the program.
+#  @param source the C source of the program.
+#  @param flags extra flags to pass to `gcc`.
+#  @returns the path of the built program.
+def compile_program(directory:Path, name:str, source:str, flags:list) -> Path:
+
+    if which("gcc") is None:
+        pytest.skip("gcc is needed to build test binaries.")
+
+    source_path = directory / f"{name}.c"
+    source_path.write_text(source)
+    binary_path = directory / name
+
+    result = run([ "gcc", *flags, "-o", str(binary_path), str(source_path) ], stdout=PIPE, stderr=STDOUT)
+    if result.returncode != 0:
+        pytest.skip(f"unable to build {name}: {result.stdout.decode(errors='replace')}")
+
+    return binary_path
+
+
+## The sample program, built as both a position dependent and a position independent executable.
+@pytest.fixture(scope="session", params=[ "-no-pie", "-pie" ])
+def sample_binary(request:pytest.FixtureRequest, tmp_path_factory:pytest.TempPathFactory) -> Path:
+    directory = tmp_path_factory.mktemp("sample")
+    return compile_program(directory, "sample", SampleSource, [ "-O0", request.param ])
+
+
+## A copy of the sample program that a test can change.
+@pytest.fixture
+def sample_copy(sample_binary:Path, tmp_path:Path) -> Path:
+    path = tmp_path / sample_binary.name
+    copyfile(sample_binary, path)
+    return path
+
+
+## Runs an `ebp` action, failing the test if it does not succeed.
+#  @param arguments the arguments to pass to `ebp`.
+def run_ebp(*arguments:str) -> None:
+    result = run([ executable, "-m", "ebp", "-l", "error", *arguments ], cwd=PatcherDirectory, stdout=PIPE, stderr=STDOUT)
+    assert result.returncode == 0, result.stdout.decode(errors="replace")
+
+
+## The internal `elf-binary` crackme, after it has been through `hash-patch`.
+@pytest.fixture(scope="session")
+def hash_patched_crackme(tmp_path_factory:pytest.TempPathFactory) -> Path:
+
+    if which("gcc") is None or which("bash") is None or not CrackmeBuildScript.exists():
+        pytest.skip("gcc, bash and the elf-binary sources are needed to build the crackme.")
+
+    directory = tmp_path_factory.mktemp("crackme")
+    build_environment = dict(environ, ELF_BUILD_DIRECTORY=str(directory), ELF_BUILD_NAME="crackme")
+    result = run([ "bash", str(CrackmeBuildScript) ], env=build_environment, stdout=PIPE, stderr=STDOUT)
+    if result.returncode != 0:
+        pytest.skip(f"unable to build the crackme: {result.stdout.decode(errors='replace')}")
+
+    run_ebp("hash-patch", str(directory / "crackme"), str(directory / "hash-patched"))
+    return directory / "hash-patched"
@@ -0,0 +1,92 @@
+# python imports
+from os import stat, utime
+from pathlib import Path
+
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.patch_process import Elf
+
+
+## Loads the sample program and makes a few changes to it; in code, in data and at the very start of the file.
+#  @param path the path of the sample program.
+#  @returns the loaded program.
+def load_and_change(path:Path) -> Elf:
+    elf = Elf(str(path), checksec=False)
+    text = elf.get_section_by_name(".text").header
+    data = elf.get_section_by_name(".data").header
+    elf.write(text.sh_addr + 4, b"\xcc" * 5)
+    elf.write(text.sh_addr + text.sh_size - 1, b"\x90")
+    elf.write(data.sh_addr, b"changed")
+    elf.write(elf.offset_to_vaddr(0) + 8, b"\x01")
+    return elf
+
+
+## The bytes a full-buffer write of the binary would produce.
+#  @param elf the binary.
+#  @returns every byte of the binary, with its changes.
+def full_buffer(elf:Elf) -> bytes:
+    return bytes(elf.mmap)
+
+
+## Saving somewhere new copies the loaded file and writes the changed extents over it; the same as writing every byte.
+def test_save_to_new_path(sample_copy:Path, tmp_path:Path) -> None:
+
+    original = sample_copy.read_bytes()
+    elf = load_and_change(sample_copy)
+    assert len(elf.dirty_extents) > 0
+
+    path = tmp_path / "saved"
+    elf.save(str(path))
+
+    assert path.read_bytes() == full_buffer(elf)
+    assert path.read_bytes() != original
+    assert sample_copy.read_bytes() == original
+
+
+## Saving over the loaded file writes the changed extents in place; the same as writing every byte. Later saves only
+#  write what changed since.
+def test_save_in_place(sample_copy:Path) -> None:
+
+    elf = load_and_change(sample_copy)
+    elf.save()
+    assert sample_copy.read_bytes() == full_buffer(elf)
+    assert len(elf.dirty_extents) == 0
+
+    data = elf.get_section_by_name(".data").header
+    elf.write(data.sh_addr + 16, b"changed again")
+    elf.save(str(sample_copy))
+    assert sample_copy.read_bytes() == full_buffer(elf)
+
+
+## A binary with no changes saves as a copy of the file it was loaded from.
+def test_save_unchanged(sample_copy:Path, tmp_path:Path) -> None:
+    elf = Elf(str(sample_copy), checksec=False)
+    elf.save(str(tmp_path / "saved"))
+    assert (tmp_path / "saved").read_bytes() == sample_copy.read_bytes()
+
+
+## Marks a file as changed on disk, without changing its contents.
+#  @param path the file to touch.
+def touch(path:Path) -> None:
+    file_stat = stat(path)
+    utime(path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000))
+
+
+## Once the loaded file has changed on disk, saving over it is refused and saving elsewhere writes every byte.
+def test_save_after_source_changed(sample_copy:Path, tmp_path:Path) -> None:
+
+    elf = load_and_change(sample_copy)
+    on_disk = bytearray(sample_copy.read_bytes())
+    on_disk[-1] ^= 0xff
+    sample_copy.write_bytes(on_disk)
+    touch(sample_copy)
+
+    with pytest.raises(RuntimeError):
+        elf.save()
+    assert sample_copy.read_bytes() == on_disk
+
+    path = tmp_path / "saved"
+    elf.save(str(path))
+    assert path.read_bytes() == full_buffer(elf)
@@ -0,0 +1,85 @@
+# python imports
+from pathlib import Path
+from struct import pack
+from types import SimpleNamespace
+
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.patch_process import Elf
+from ebp.actions.hash_patch.hash_patch_sections import HashPatchSections
+from ebp.actions.hash_patch.sections import HashGenerator
+from ebp.actions.verify_integrity import IntegrityVerifier
+
+
+## Creates a generator whose region holds the given bytes.
+#  @param memory the bytes in the generators region.
+#  @param start_address the address the region starts at.
+#  @returns the generator.
+def generator_over(memory:bytes, start_address:int) -> HashGenerator:
+    section = SimpleNamespace(name=".hash-patch.test")
+    generator = HashGenerator(section, start_address, start_address + len(memory), 1)
+    generator.scoped_memory = lambda: memoryview(memory)
+    return generator
+
+
+## The skip array is read back correctly when the generator moves RBX backwards (a negative `add rbx, imm8`).
+def test_read_skips_array_negative_rebase() -> None:
+
+    start_address = 0x401000
+    skips = [ 0x10, 0x20, HashGenerator.SkipArrayStop ]
+    rebase = -8
+
+    patch = bytes([ 0x90, 0x90 ])
+    patch += bytes([ 0x48, 0x83, 0xc3 ]) + pack("<b", rebase)                               # add  rbx, -8
+    for index, skip in enumerate(skips):
+        patch += bytes([ 0xc7, 0x43 ]) + pack("<bI", index * 4 - rebase, skip)             # mov  DWORD PTR [rbx + imm8], imm32
+    lea_address = start_address + len(patch)
+    virtual_memory_start = 0x402000
+    patch += bytes([ 0x48, 0x8d, 0x1d ]) + pack("<i", virtual_memory_start - (lea_address + 7))  # lea  rbx, [rip + imm32]
+    patch += bytes([ 0xc3 ])
+
+    volatile_qwords, memory_start, memory_end = generator_over(patch, start_address).read_skips_array()
+
+    assert memory_start == virtual_memory_start
+    assert volatile_qwords == [ virtual_memory_start + 0x10 ]
+    assert memory_end == virtual_memory_start + 0x10 + 8 + 0x20
+
+
+## A binary straight out of `hash-patch` verifies.
+def test_hash_patched_binary_verifies(hash_patched_crackme:Path) -> None:
+    report = IntegrityVerifier.verify_file(hash_patched_crackme)
+    assert report.passed, report.failures
+    assert report.checks > 0
+
+
+## Gets the addresses of a few bytes in the hashed memory of a binary that are not volatile.
+#  @param path the hash-patched binary.
+#  @returns the file offset of each byte.
+def hashed_byte_offsets(path:Path) -> list:
+
+    elf = Elf(str(path), checksec=False)
+    generators = [ section for section in HashPatchSections.fromElf(elf) if isinstance(section, HashGenerator) ]
+    volatile_qwords, memory_start, memory_end = generators[0].read_skips_array()
+
+    volatile = lambda address: any( q <= address < q + 8 for q in volatile_qwords )
+    candidates = [ memory_start, (memory_start + memory_end) // 2, memory_end - 1 ]
+    return [ elf.vaddr_to_offset(address) for address in candidates if not volatile(address) ]
+
+
+## Flipping a single hashed byte of a patched binary is reported.
+def test_flipped_byte_is_reported(hash_patched_crackme:Path, tmp_path:Path) -> None:
+
+    contents = hash_patched_crackme.read_bytes()
+    offsets = hashed_byte_offsets(hash_patched_crackme)
+    assert offsets
+
+    for offset in offsets:
+        tampered = bytearray(contents)
+        tampered[offset] ^= 0x01
+        path = tmp_path / f"tampered-{offset:x}"
+        path.write_bytes(tampered)
+
+        report = IntegrityVerifier.verify_file(path)
+        assert not report.passed, f"flipping the byte at file offset 0x{offset:x} was not reported."
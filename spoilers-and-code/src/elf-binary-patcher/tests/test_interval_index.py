@@ -0,0 +1,160 @@
+# python imports
+from random import Random
+
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.interval_index import IntervalIndex
+from ebp.common.patch_process.data_dependency import DataDependencyList
+
+
+## The addresses the brute force comparisons are made over; small, so ranges often overlap and touch.
+AddressSpace = 160
+
+
+## Merges a set of addresses in to the half-open ranges an @ref IntervalIndex should hold for them.
+#  @param covered the addresses that are covered.
+#  @returns a list of (start, end) ranges, in address order.
+def merged_ranges(covered:set) -> list:
+    ranges = []
+    for address in sorted(covered):
+        if ranges and ranges[-1][1] == address:
+            ranges[-1][1] = address + 1
+        else:
+            ranges.append([ address, address + 1 ])
+    return [ tuple(r) for r in ranges ]
+
+
+## Gets random (start, end) ranges; some empty, some long.
+#  @param random the random number generator to use.
+#  @param count the number of ranges to create.
+#  @returns the ranges.
+def random_ranges(random:Random, count:int) -> list:
+    ranges = []
+    for _ in range(count):
+        start = random.randrange(AddressSpace)
+        length = random.choice([ 0, 1, 2, 3, 8, random.randrange(40) ])
+        ranges.append((start, start + length))
+    return ranges
+
+
+## Every query range over the address space; including empty ones.
+QueryRanges = [ (start, end) for start in range(AddressSpace + 1) for end in range(start, min(start + 12, AddressSpace + 1)) ]
+
+
+## The index holds merged ranges and answers overlap queries as a set of covered addresses would.
+@pytest.mark.parametrize("seed", range(6))
+def test_interval_index_matches_brute_force(seed:int) -> None:
+
+    random = Random(seed)
+    index = IntervalIndex()
+    covered = set()
+
+    for start, end in random_ranges(random, 30):
+        index.add(start, end)
+        covered.update(range(start, end))
+        assert list(index) == merged_ranges(covered)
+
+    for start, end in QueryRanges:
+        expected = any( address in covered for address in range(start, end) )
+        assert index.overlaps(start, end) == expected, f"overlaps({start}, {end})"
+
+    assert list(IntervalIndex(random_ranges(Random(seed), 30))) == merged_ranges(covered)
+
+
+## Ranges are half-open; ranges that touch do not overlap (but are merged), and empty ranges are ignored.
+def test_interval_index_edges() -> None:
+
+    index = IntervalIndex([ (10, 20) ])
+    assert not index.overlaps(20, 30)
+    assert not index.overlaps(0, 10)
+    assert index.overlaps(19, 20) and index.overlaps(9, 11)
+    assert not index.overlaps(15, 15)
+
+    assert index.add(30, 30) is None
+    assert list(index) == [ (10, 20) ]
+
+    index.add(20, 25)
+    index.add(5, 10)
+    assert list(index) == [ (5, 25) ]
+
+
+## Undoing adds in reverse puts the index back as it was before each add.
+@pytest.mark.parametrize("seed", range(6))
+def test_interval_index_undo_add(seed:int) -> None:
+
+    index = IntervalIndex()
+    history = []
+
+    for start, end in random_ranges(Random(seed), 30):
+        before = list(index)
+        history.append((before, index.add(start, end)))
+
+    for before, token in reversed(history):
+        index.undo_add(token)
+        assert list(index) == before
+
+
+## Checks every query range against testing each dependency in turn.
+#  @param dependencies the list to check.
+#  @param recorded the (address, length) of each dependency already in the list.
+def assert_matches_brute_force(dependencies:DataDependencyList, recorded:list) -> None:
+    for address, end in QueryRanges:
+        length = end - address
+        expected = [ entry for entry, (start, size) in enumerate(recorded) if size and length and start < end and address < start + size ]
+        found = [ (d.start_address, d.length) for d in dependencies.collisions(address, length) ]
+        assert found == [ recorded[entry] for entry in expected ], f"collisions(0x{address:x}, {length})"
+        assert dependencies.has_dependency(address, length) == bool(expected), f"has_dependency(0x{address:x}, {length})"
+
+
+## Collisions and dependency tests match testing each dependency in turn.
+@pytest.mark.parametrize("seed", range(4))
+def test_data_dependencies_match_brute_force(seed:int) -> None:
+
+    dependencies = DataDependencyList()
+    recorded = []
+
+    for start, end in random_ranges(Random(seed), 25):
+        dependencies.record(start, end - start, f"dependency at {start}")
+        recorded.append((start, end - start))
+
+    assert_matches_brute_force(dependencies, recorded)
+
+
+## A long dependency is found by queries past the short dependencies that start after it.
+def test_long_dependency_shadows_later_short_ones() -> None:
+
+    dependencies = DataDependencyList()
+    recorded = [ (0, 100) ] + [ (address, 1) for address in range(10, 90, 4) ] + [ (120, 4) ]
+    for address, length in recorded:
+        dependencies.record(address, length, None)
+
+    assert [ d.start_address for d in dependencies.collisions(95, 1) ] == [ 0 ]
+    assert [ d.start_address for d in dependencies.collisions(42, 1) ] == [ 0, 42 ]
+    assert list(dependencies.collisions(100, 20)) == []
+    assert_matches_brute_force(dependencies, recorded)
+
+
+## Undoing records in reverse puts the list back as it was before each record.
+@pytest.mark.parametrize("seed", range(4))
+def test_data_dependency_undo_record(seed:int) -> None:
+
+    dependencies = DataDependencyList()
+    recorded = []
+    history = []
+
+    state = lambda: (dependencies.to_json(), list(dependencies.covered), list(dependencies.sorted_start_addresses),
+        list(dependencies.sorted_entries), dependencies.longest, list(dependencies.messages), dict(dependencies.message_lookup))
+
+    for start, end in random_ranges(Random(seed), 25):
+        before = state()
+        history.append((before, dependencies.record(start, end - start, f"message {start % 3}")))
+        recorded.append((start, end - start))
+
+    for before, token in reversed(history):
+        dependencies.undo_record(token)
+        recorded.pop()
+        assert state() == before
+
+    assert_matches_brute_force(dependencies, recorded)
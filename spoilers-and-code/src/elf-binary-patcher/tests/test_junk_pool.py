@@ -0,0 +1,91 @@
+# python imports
+from json import dumps, loads
+from random import Random
+
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.patch_process import JunkPool
+
+
+## The junk addresses the pools under test are built from.
+Addresses = [ 0x401000 + (index * 7) for index in range(64) ]
+
+
+## Checks that a pools position map agrees with the order it holds addresses in.
+#  @param pool the pool to check.
+def assert_consistent(pool:JunkPool) -> None:
+    assert len(pool.positions) == len(pool.addresses)
+    for position, address in enumerate(pool.addresses):
+        assert pool.positions[address] == position
+
+
+## Discarding addresses (in any order) and restoring them in reverse puts the pool back exactly as it was.
+@pytest.mark.parametrize("seed", range(8))
+def test_discard_restore_round_trip(seed:int) -> None:
+
+    pool = JunkPool(Addresses)
+    addresses, positions = pool.to_json(), dict(pool.positions)
+    random = Random(seed)
+
+    discarded = []
+    for address in random.sample(Addresses, 40):
+        position = pool.discard(address)
+        assert position is not None and address not in pool
+        assert_consistent(pool)
+        discarded.append((address, position))
+
+    # discarding an address that is no longer in the pool changes nothing, and gives nothing to restore.
+    assert pool.discard(discarded[0][0]) is None
+
+    for address, position in reversed(discarded):
+        pool.restore(address, position)
+        assert_consistent(pool)
+
+    assert pool.to_json() == addresses
+    assert pool.positions == positions
+
+
+## Discarding the last address held does not move any other address.
+def test_discard_last_address() -> None:
+    pool = JunkPool(Addresses)
+    position = pool.discard(Addresses[-1])
+    assert position == len(Addresses) - 1
+    assert pool.to_json() == Addresses[:-1]
+    pool.restore(Addresses[-1], position)
+    assert pool.to_json() == Addresses
+
+
+## Adding an address that is already held is ignored.
+def test_add_ignores_duplicates() -> None:
+    pool = JunkPool(Addresses + Addresses[:4])
+    assert pool.add(Addresses[0]) is False
+    assert pool.to_json() == Addresses
+    assert_consistent(pool)
+
+
+## `choice` only ever picks held addresses, and fails when the pool is empty.
+def test_choice() -> None:
+    pool = JunkPool(Addresses[:3])
+    pool.discard(Addresses[1])
+    assert { pool.choice() for _ in range(100) } <= { Addresses[0], Addresses[2] }
+    with pytest.raises(RuntimeError):
+        JunkPool().choice()
+
+
+## The pool is serialised as the plain list of addresses the manifest has always held.
+def test_to_json_is_address_list() -> None:
+
+    pool = JunkPool()
+    for address in Addresses:
+        pool.add(address)
+
+    json = pool.to_json()
+    assert type(json) is list and all( type(address) is int for address in json )
+    assert json == Addresses
+    assert loads(dumps(json)) == Addresses
+
+    restored = JunkPool.fromJson(loads(dumps(json)))
+    assert restored.to_json() == Addresses
+    assert_consistent(restored)
@@ -0,0 +1,106 @@
+# python imports
+from pathlib import Path
+
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.patch_process import MappedElf
+
+
+## Gets addresses either side of the start and (file and memory) end of every loaded segment, and of the pages they are in.
+#  @param elf the binary to get the addresses of.
+#  @returns the addresses, in order.
+def segment_edges(elf:MappedElf) -> list:
+    edges = set()
+    for header in elf.load_segments:
+        memory_end = header.p_vaddr + header.p_memsz
+        for edge in (header.p_vaddr, header.p_vaddr + header.p_filesz, memory_end, memory_end + (-memory_end % elf.PageSize)):
+            edges.update(range(max(edge - 9, 0), edge + 9))
+    return sorted(edges)
+
+
+## Calls a function, noting if it fails; the two backends raise different exception types.
+#  @param function the function to call.
+#  @param arguments the arguments to call it with.
+#  @returns the value returned, or `Exception` if it raised one.
+def outcome(function, *arguments) -> object:
+    try:
+        return function(*arguments)
+    except Exception:
+        return Exception
+
+
+## Reads that run past the file-backed end of a segment read zeros (like `.bss`) until the end of its page.
+def test_read_zero_pads_segment_ends(sample_binary:Path) -> None:
+
+    elf = MappedElf(str(sample_binary))
+    header = max(elf.load_segments, key=lambda h: h.p_memsz - h.p_filesz)
+    assert header.p_memsz > header.p_filesz
+
+    file_end = header.p_vaddr + header.p_filesz
+    read = elf.read(file_end - 4, 64)
+    assert read[:4] == elf.mmap[header.p_offset + header.p_filesz - 4:header.p_offset + header.p_filesz]
+    assert read[4:] == bytes(60)
+
+    memory_end = header.p_vaddr + header.p_memsz
+    page_end = memory_end + (-memory_end % elf.PageSize)
+    assert elf.read(memory_end, page_end - memory_end) == bytes(page_end - memory_end)
+
+
+## Writes to memory that is not backed by the file fail, rather than changing some other part of the file.
+def test_write_outside_file_raises(sample_binary:Path) -> None:
+
+    elf = MappedElf(str(sample_binary))
+    bss = elf.get_section_by_name(".bss").header
+    before = bytes(elf.mmap)
+
+    for address in (bss.sh_addr, bss.sh_addr + bss.sh_size - 1, elf.load_segments[-1].p_vaddr + elf.load_segments[-1].p_memsz):
+        with pytest.raises(RuntimeError):
+            elf.write(address + elf.address - elf.load_addr, b"\x01")
+
+    assert bytes(elf.mmap) == before
+
+
+## Writes change what is read back, and the mapping; but not the file on disk.
+def test_write_changes_mapping_only(sample_copy:Path) -> None:
+
+    elf = MappedElf(str(sample_copy))
+    data = elf.get_section_by_name(".data").header
+    elf.write(data.sh_addr + elf.address - elf.load_addr, b"patched")
+
+    assert elf.read(data.sh_addr + elf.address - elf.load_addr, 7) == b"patched"
+    assert elf.get_section_by_name(".data").data()[:7] == b"patched"
+    assert sample_copy.read_bytes()[data.sh_offset:data.sh_offset + 7] != b"patched"
+
+
+## The mapped backend agrees with `pwnlib.elf.ELF` on where the binary is, what it reads and how addresses translate.
+def test_parity_with_pwnlib(sample_binary:Path) -> None:
+
+    pwnlib_elf = pytest.importorskip("pwnlib.elf")
+    reference = pwnlib_elf.ELF(str(sample_binary), checksec=False)
+    elf = MappedElf(str(sample_binary))
+
+    assert (elf.address, elf.load_addr, elf.entry) == (reference.address, reference.load_addr, reference.entry)
+
+    for address in segment_edges(elf):
+
+        for count in (1, 8, 64):
+            assert outcome(elf.read, address, count) == outcome(reference.read, address, count), f"read(0x{address:x}, {count})"
+
+        # pwnlib fails to translate (or find the segment of) addresses that are not loaded at all; these have no file offset.
+        expected = outcome(reference.vaddr_to_offset, address)
+        assert elf.vaddr_to_offset(address) == (None if expected is Exception else expected), f"vaddr_to_offset(0x{address:x})"
+
+        offset = elf.vaddr_to_offset(address)
+        if offset is not None:
+            assert elf.offset_to_vaddr(offset) == reference.offset_to_vaddr(offset) == address
+
+        segment = elf.get_segment_for_address(address, 8)
+        reference_segment = outcome(reference.get_segment_for_address, address, 8)
+        reference_segment = None if reference_segment is Exception else reference_segment
+        assert (segment and segment.header) == (reference_segment and reference_segment.header), f"get_segment_for_address(0x{address:x})"
+
+    elf.write(elf.entry, b"\xcc\xcc")
+    reference.write(reference.entry, b"\xcc\xcc")
+    assert bytes(elf.mmap) == bytes(reference.mmap)
@@ -0,0 +1,118 @@
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.algorithm import MersenneTwister, MersenneTwister64, MersenneTwisterBase
+from ebp.common.algorithm.mersenne_twister_engine import (
+    numpy, ArrayTwisterEngine, ArrayTwisterEngine64, NumpyTwisterEngine, NumpyTwisterEngine64
+)
+
+
+## The generator types under test, with the engines they can run on (NumPy engines only if it is installed).
+Generators = [
+    (MersenneTwister, ArrayTwisterEngine),
+    (MersenneTwister64, ArrayTwisterEngine64),
+    *( [ (MersenneTwister, NumpyTwisterEngine), (MersenneTwister64, NumpyTwisterEngine64) ] if numpy is not None else [] ),
+]
+
+## Values from the `twister.c` implementation in `elf-binary`; (seed, skip, MT19937 value, MT19937-64 value).
+#  Generated by seeding with `create_mersenne_twister` / `create_mersenne_twister64`, discarding `skip` values with
+#  `next_mersenne_twister_uint32` / `next_mersenne_twister_uint64` and recording the next value of each.
+TwisterCValues = [
+    (0x00000000,        0, 0x8c7f0aac, 0x28e837c5cb41dc3e),
+    (0x00000000,      623, 0xe2031ce4, 0xa9989234f325bdb3),
+    (0x00000000,      624, 0x145b8f3a, 0xc2467e33bba9f953),
+    (0x00000000,     1247, 0x44463f17, 0x57f2a0eaa717cca8),
+    (0x00000000,   100000, 0x4ec1d86d, 0xbbfeba46d0b7d549),
+    (0x00000000,  1000000, 0x7d055ded, 0x864fe8830df7c4cd),
+    (0x00000000, 10000000, 0xf1b280ba, 0x91d91d80f5b8a5ac),
+    (0x00001571,        0, 0xd091bb5c, 0xc96d191cf6f6aea6),
+    (0x00001571,      623, 0xefa14dff, 0xd7c295afc52a1c17),
+    (0x00001571,      624, 0xf914dc58, 0xab1bf7646b530a67),
+    (0x00001571,     1247, 0x974a05c7, 0x64d47937156316ad),
+    (0x00001571,   100000, 0xa01755e8, 0x698d965fcddf1a9d),
+    (0x00001571,  1000000, 0xbae40b42, 0x31f7e9072be4cd66),
+    (0x00001571, 10000000, 0x6c080027, 0x642dc56040ed16b3),
+    (0xdeadbeef,        0, 0x39037a7d, 0xc20369a413e28fc1),
+    (0xdeadbeef,      623, 0x50cdb043, 0x8aa3312bffa5fd2e),
+    (0xdeadbeef,      624, 0xd6fa6c5c, 0xcdf0c3d0a8a70cb2),
+    (0xdeadbeef,     1247, 0x3759e591, 0x6ebd50d807bc9fad),
+    (0xdeadbeef,   100000, 0xbd28a13d, 0x53c8df0bdcc80730),
+    (0xdeadbeef,  1000000, 0xc5a509fe, 0x006545d34eb26675),
+    (0xdeadbeef, 10000000, 0xfbd4a028, 0x120efbfbf37556ca),
+]
+
+## The furthest short skip checked against twisting through the sequence; covers several 624/312 value blocks.
+BruteForceLimit = 2000
+
+
+## Gets the short skips to check `jump` against `discard` with.
+#  Every skip is checked on the generators default engine; the others are slow to jump, so only check either side
+#  of each block boundary (and a spread of skips in between).
+#  @param generator_type the generator type under test.
+#  @param engine the engine the generator is using.
+#  @returns the skips to check.
+def short_skips(generator_type:type, engine:type) -> list[int]:
+    if engine is generator_type.DefaultEngine:
+        return list(range(BruteForceLimit + 1))
+    block_size = generator_type.MT19937_STATE_SIZE
+    edges = { block * block_size + delta for block in range(BruteForceLimit // block_size + 1) for delta in (-1, 0, 1) }
+    return sorted(( edges | set(range(0, BruteForceLimit + 1, 97)) ) - { -1 })
+
+
+## Creates a generator, optionally after consuming some values, that always jumps rather than twisting through blocks.
+#  @param generator_type the generator type to create.
+#  @param engine the engine the generator should use.
+#  @param seed the seed to initialise the generator with.
+#  @param consumed the number of values to read before the generator is returned.
+#  @returns the new generator.
+def create_generator(generator_type:type, engine:type, seed:int, consumed:int=0) -> MersenneTwisterBase:
+    generator = generator_type(seed, engine)
+    for _ in range(consumed):
+        generator.next_word()
+    return generator
+
+
+## `jump` lands on the same value as `discard` for short skips, from the start of the sequence and mid-block.
+@pytest.mark.parametrize("generator_type, engine", Generators)
+@pytest.mark.parametrize("consumed", [ 0, 100 ])
+def test_jump_matches_discard(monkeypatch:pytest.MonkeyPatch, generator_type:type, engine:type, consumed:int) -> None:
+
+    # force the jump path for every distance; by default short skips are made with `discard`.
+    monkeypatch.setattr(generator_type, "JUMP_THRESHOLD", 0)
+
+    for count in short_skips(generator_type, engine):
+
+        discarded = create_generator(generator_type, engine, 5489, consumed)
+        discarded.discard(count)
+
+        jumped = create_generator(generator_type, engine, 5489, consumed)
+        jumped.jump(count)
+
+        expected = [ discarded.next_word() for _ in range(2) ]
+        assert [ jumped.next_word() for _ in range(2) ] == expected, f"jump({count}) after {consumed} values"
+
+
+## `jump` reproduces the sequence generated by `twister.c`.
+@pytest.mark.parametrize("generator_type, engine", Generators)
+@pytest.mark.parametrize("seed, skip, value_32, value_64", TwisterCValues)
+def test_jump_matches_twister_c(generator_type:type, engine:type, seed:int, skip:int, value_32:int, value_64:int) -> None:
+    generator = create_generator(generator_type, engine, seed)
+    generator.jump(skip)
+    expected = value_64 if generator_type is MersenneTwister64 else value_32
+    assert generator.next_word() == expected
+
+
+## Each generator only offers the fixed-size accessor for its own word size; both share the common base (and its
+#  state cache) without one being a kind of the other.
+def test_word_size_accessors() -> None:
+
+    assert not issubclass(MersenneTwister64, MersenneTwister) and not issubclass(MersenneTwister, MersenneTwister64)
+    assert issubclass(MersenneTwister, MersenneTwisterBase) and issubclass(MersenneTwister64, MersenneTwisterBase)
+    assert not hasattr(MersenneTwister64, "next_uint32") and not hasattr(MersenneTwister, "next_uint64")
+    assert MersenneTwister.state_cache is MersenneTwister64.state_cache is MersenneTwisterBase.state_cache
+
+    seed, skip, value_32, value_64 = TwisterCValues[0]
+    assert skip == 0
+    assert MersenneTwister(seed).next_uint32() == value_32
+    assert MersenneTwister64(seed).next_uint64() == value_64
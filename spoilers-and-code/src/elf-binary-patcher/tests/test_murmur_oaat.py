@@ -0,0 +1,155 @@
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.algorithm import MurmurOaat64, MurmurOaat64Wordwise
+
+
+## The seeds buffers are hashed with; more than @ref MurmurOaat64.MultiSeedThreshold, so `hash_many` hashes them in lockstep.
+Seeds = [ 0, 1, 0x1eaf5adca75f00d5, 0xdeadbeef, 0xffffffffffffffff ] + [ (index * 0x9e3779b97f4a7c15) & 0xffffffffffffffff for index in range(2, 18) ]
+
+## The lengths of buffer hashed; empty, a single byte, either side of a QWORD and lengths that are not a multiple of eight.
+Lengths = [ 0, 1, 7, 8, 9, 13, 15, 16, 17, 23, 31, 4099 ]
+
+## Values from `murmur_oaat64` in `integrity.c`; (seed, length, hash) of `length` bytes of @ref sample_buffer.
+IntegrityCValues = [
+    (0x0000000000000000,  0, 0x0000000000000000),
+    (0x0000000000000000,  1, 0x74c26c8074c285fe),
+    (0x0000000000000000,  7, 0xf74483fef12c1d0c),
+    (0x0000000000000000,  8, 0xe95e39783f7d1b99),
+    (0x0000000000000000,  9, 0x9e743e445e903777),
+    (0x0000000000000000, 15, 0x4de1820cb8c08570),
+    (0x0000000000000000, 16, 0x9e3d4eee588ef8a3),
+    (0x0000000000000000, 17, 0x83d1a520733ba176),
+    (0x0000000000000000, 23, 0x66388eb818d1b5f3),
+    (0x0000000000000000, 31, 0xc43feab2e4ef50c2),
+    (0x1eaf5adca75f00d5,  0, 0x1eaf5adca75f00d5),
+    (0x1eaf5adca75f00d5,  1, 0x54ddb36c41773b68),
+    (0x1eaf5adca75f00d5,  7, 0x1bd3b3ba83faffa0),
+    (0x1eaf5adca75f00d5,  8, 0x199d99d930a1707a),
+    (0x1eaf5adca75f00d5,  9, 0xbe3649f695db86ec),
+    (0x1eaf5adca75f00d5, 15, 0x05e290d86d575920),
+    (0x1eaf5adca75f00d5, 16, 0xd8eb8f5c06a9451e),
+    (0x1eaf5adca75f00d5, 17, 0x0f08e65ea7f409bd),
+    (0x1eaf5adca75f00d5, 23, 0xfc3c88961347d155),
+    (0x1eaf5adca75f00d5, 31, 0x671d646b1ba4319e),
+    (0x00000000deadbeef,  0, 0x00000000deadbeef),
+    (0x00000000deadbeef,  1, 0xe95fc82b9980bcfe),
+    (0x00000000deadbeef,  7, 0x1d79d8432a44e263),
+    (0x00000000deadbeef,  8, 0x873c1b4f0aa1126e),
+    (0x00000000deadbeef,  9, 0x5fa248ec907c3b60),
+    (0x00000000deadbeef, 15, 0x3a68e66dd6d6001c),
+    (0x00000000deadbeef, 16, 0x605ac219bc88f478),
+    (0x00000000deadbeef, 17, 0x1e9487f7d210ba8b),
+    (0x00000000deadbeef, 23, 0x9702e9bf141bb670),
+    (0x00000000deadbeef, 31, 0xe10f4f984a26830b),
+]
+
+## Values from `murmur_oaat64_wordwise` in `integrity.c` (built with `INTEGRITY_HASH_WORDS`); (seed, length, hash) of `length` bytes of @ref sample_buffer.
+IntegrityCWordwiseValues = [
+    (0x0000000000000000,  0, 0x0000000000000000),
+    (0x0000000000000000,  1, 0x74c26c8074c285fe),
+    (0x0000000000000000,  7, 0xf74483fef12c1d0c),
+    (0x0000000000000000,  8, 0x4fe8792ce8abd8aa),
+    (0x0000000000000000,  9, 0xda2d27a7dd3402ca),
+    (0x0000000000000000, 15, 0x2b2aa1798b053747),
+    (0x0000000000000000, 16, 0x2b466cceb938af1c),
+    (0x0000000000000000, 17, 0xf82c75935e8b6c8e),
+    (0x0000000000000000, 23, 0xf88d90c5ff0317f2),
+    (0x0000000000000000, 31, 0x0182e7c9367579f4),
+    (0x1eaf5adca75f00d5,  0, 0x1eaf5adca75f00d5),
+    (0x1eaf5adca75f00d5,  1, 0x54ddb36c41773b68),
+    (0x1eaf5adca75f00d5,  7, 0x1bd3b3ba83faffa0),
+    (0x1eaf5adca75f00d5,  8, 0x7cb7fe009ae894bc),
+    (0x1eaf5adca75f00d5,  9, 0x6a4c8aabc778d627),
+    (0x1eaf5adca75f00d5, 15, 0x65c883cea95095a8),
+    (0x1eaf5adca75f00d5, 16, 0xde2cfdc3f42f21e7),
+    (0x1eaf5adca75f00d5, 17, 0xd87eec6bc0917414),
+    (0x1eaf5adca75f00d5, 23, 0x57f042bd8310198e),
+    (0x1eaf5adca75f00d5, 31, 0x1c8967e45718a8f6),
+    (0x00000000deadbeef,  0, 0x00000000deadbeef),
+    (0x00000000deadbeef,  1, 0xe95fc82b9980bcfe),
+    (0x00000000deadbeef,  7, 0x1d79d8432a44e263),
+    (0x00000000deadbeef,  8, 0x2586335ffdebf64d),
+    (0x00000000deadbeef,  9, 0x12c99ad5064a0210),
+    (0x00000000deadbeef, 15, 0x66118a1d428f542a),
+    (0x00000000deadbeef, 16, 0xa87eef14415b3e7e),
+    (0x00000000deadbeef, 17, 0xa3b2cdd1a7722ba9),
+    (0x00000000deadbeef, 23, 0xc722e3d67e36ded3),
+    (0x00000000deadbeef, 31, 0xfb13e9d6a5a42afc),
+]
+
+
+## Gets the bytes that are hashed.
+#  The buffer is a view that starts three bytes in to its underlying bytes, so word reads from it are unaligned.
+#  @param length the number of bytes in the buffer.
+#  @returns a view of the buffer.
+def sample_buffer(length:int) -> memoryview:
+    return memoryview(bytes( (index * 0x9d + 0x3b) & 0xff for index in range(length + 3) ))[3:]
+
+
+## Hashes a buffer a byte at a time, as the hash was before it worked on buffers.
+#  @param seed the seed to hash with.
+#  @param buffer the bytes to hash.
+#  @returns the hash of the buffer.
+def hash_per_byte(seed:int, buffer:memoryview) -> int:
+    hash_ = MurmurOaat64(seed)
+    for byte_ in buffer.tobytes():
+        hash_.consume_byte(byte_)
+    return int(hash_)
+
+
+## `hash_buffer` (and `consume_buffer`) match hashing a byte at a time.
+@pytest.mark.parametrize("length", Lengths)
+def test_hash_buffer_matches_per_byte(length:int) -> None:
+    buffer = sample_buffer(length)
+    for seed in Seeds:
+        expected = hash_per_byte(seed, buffer)
+        assert MurmurOaat64.hash_buffer(seed, buffer) == expected, f"seed 0x{seed:016x}"
+        consumed = MurmurOaat64(seed)
+        consumed.consume_buffer(buffer)
+        assert int(consumed) == expected, f"seed 0x{seed:016x}"
+
+
+## Every lane of `hash_many` matches hashing a byte at a time; with fewer seeds than hashing in lockstep needs, and with enough.
+@pytest.mark.parametrize("length", Lengths)
+@pytest.mark.parametrize("number_of_seeds", [ 1, MurmurOaat64.MultiSeedThreshold - 1, len(Seeds) ])
+def test_hash_many_matches_per_byte(length:int, number_of_seeds:int) -> None:
+    buffer = sample_buffer(length)
+    seeds = Seeds[:number_of_seeds]
+    assert MurmurOaat64.hash_many(seeds, buffer) == [ hash_per_byte(seed, buffer) for seed in seeds ]
+
+
+## `hash_many` hashes one seed at a time when numpy is not installed.
+def test_hash_many_without_numpy(monkeypatch:pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("ebp.common.algorithm.mumur_oaat.numpy", None)
+    buffer = sample_buffer(31)
+    assert MurmurOaat64.hash_many(Seeds, buffer) == [ hash_per_byte(seed, buffer) for seed in Seeds ]
+
+
+## The hash matches `murmur_oaat64` in `integrity.c`.
+@pytest.mark.parametrize("seed, length, expected", IntegrityCValues)
+def test_hash_matches_integrity_c(seed:int, length:int, expected:int) -> None:
+    buffer = sample_buffer(length)
+    assert MurmurOaat64.hash_buffer(seed, buffer) == expected
+    assert hash_per_byte(seed, buffer) == expected
+    assert MurmurOaat64.hash_many([ seed ] * len(Seeds), buffer) == [ expected ] * len(Seeds)
+
+
+## The wordwise hash matches `murmur_oaat64_wordwise` in `integrity.c`; whole QWORDS, then any remaining bytes one at a time.
+@pytest.mark.parametrize("seed, length, expected", IntegrityCWordwiseValues)
+def test_wordwise_hash_matches_integrity_c(seed:int, length:int, expected:int) -> None:
+    buffer = sample_buffer(length)
+    assert MurmurOaat64Wordwise.hash_buffer(seed, buffer) == expected
+    consumed = MurmurOaat64Wordwise(seed)
+    consumed.consume(iter(buffer.tobytes()))
+    assert int(consumed) == expected
+
+
+## Every lane of the wordwise `hash_many` matches the wordwise `hash_buffer`.
+@pytest.mark.parametrize("length", Lengths)
+@pytest.mark.parametrize("number_of_seeds", [ 1, MurmurOaat64.MultiSeedThreshold - 1, len(Seeds) ])
+def test_wordwise_hash_many_matches_hash_buffer(length:int, number_of_seeds:int) -> None:
+    buffer = sample_buffer(length)
+    seeds = Seeds[:number_of_seeds]
+    assert MurmurOaat64Wordwise.hash_many(seeds, buffer) == [ MurmurOaat64Wordwise.hash_buffer(seed, buffer) for seed in seeds ]
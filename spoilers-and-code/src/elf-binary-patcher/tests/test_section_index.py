@@ -0,0 +1,159 @@
+# python imports
+from pathlib import Path
+from types import SimpleNamespace
+
+# third-party imports
+from elftools.elf.constants import SH_FLAGS
+
+# project imports
+from ebp.common.patch_process import Elf, MappedElf, SectionIndex
+
+
+## Creates a stand-in for a pyelftools section or segment.
+#  @param name the name of the section.
+#  @param fields the fields of its header.
+#  @returns an object with the given name and header.
+def header_only(name:str="", **fields:int) -> SimpleNamespace:
+    return SimpleNamespace(name=name, header=SimpleNamespace(**fields))
+
+
+## Creates a stand-in for a loaded segment.
+#  @param vaddr the address the segment is loaded at.
+#  @param offset the file offset the segment is loaded from.
+#  @param filesz the number of bytes loaded from the file.
+#  @param memsz the number of bytes of memory the segment occupies.
+#  @returns the segment.
+def load_segment(vaddr:int, offset:int, filesz:int, memsz:int=None) -> SimpleNamespace:
+    return header_only(p_type='PT_LOAD', p_vaddr=vaddr, p_offset=offset, p_filesz=filesz, p_memsz=filesz if memsz is None else memsz)
+
+
+## Creates a stand-in for an ELF binary with the given sections and segments.
+#  @param sections the sections in the binary.
+#  @param segments the segments in the binary.
+#  @returns the binary.
+def fake_elf(sections:list, segments:list) -> SimpleNamespace:
+    return SimpleNamespace(iter_sections=lambda: iter(sections), iter_segments=lambda: iter(segments))
+
+
+## Translates an address by checking every loaded segment, lowest address first.
+#  @param segments the segments in the binary.
+#  @param address the address to translate.
+#  @returns the file offset, or None if the address is not backed by the file.
+def brute_force_vaddr_to_offset(segments:list, address:int) -> int:
+    for header in sorted(( s.header for s in segments ), key=lambda h: h.p_vaddr):
+        if header.p_vaddr <= address < header.p_vaddr + header.p_filesz:
+            return header.p_offset + (address - header.p_vaddr)
+    return None
+
+
+## Translates an offset by checking every loaded segment, lowest address first.
+#  @param segments the segments in the binary.
+#  @param offset the offset to translate.
+#  @returns the virtual address, or None if the offset is not loaded.
+def brute_force_offset_to_vaddr(segments:list, offset:int) -> int:
+    for header in sorted(( s.header for s in segments ), key=lambda h: h.p_vaddr):
+        if header.p_offset <= offset < header.p_offset + header.p_filesz:
+            return header.p_vaddr + (offset - header.p_offset)
+    return None
+
+
+## Gets the sections that contain an address by checking every section.
+#  @param elf the binary.
+#  @param address the address to look for.
+#  @returns the names of the sections that contain the address.
+def brute_force_sections_containing(elf, address:int) -> list:
+    return [ section.name for section in elf.iter_sections()
+        if section.header.sh_flags & SH_FLAGS.SHF_ALLOC and section.header.sh_size
+        and not (section.header.sh_type == 'SHT_NOBITS' and section.header.sh_flags & SH_FLAGS.SHF_TLS)
+        and section.header.sh_addr <= address < section.header.sh_addr + section.header.sh_size ]
+
+
+## Sections contain their first and last byte, but not the byte after them.
+def test_section_boundaries(sample_binary:Path) -> None:
+
+    elf = Elf(str(sample_binary), checksec=False)
+    index = elf.section_index
+    assert index.sections
+
+    for section in index.sections:
+        start, size = section.header.sh_addr, section.header.sh_size
+        assert section in index.sections_containing(start)
+        assert section in index.sections_containing(start + size - 1)
+        assert section not in index.sections_containing(start + size)
+        assert section not in index.sections_containing(start - 1)
+        for address in (start - 1, start, start + 1, start + size - 1, start + size, start + size + 1):
+            found = [ s.name for s in index.sections_containing(address) ]
+            assert found == brute_force_sections_containing(elf, address), f"0x{address:x}"
+
+
+## `.bss` is found as a section, but has no file offset; reads of it are zeros and writes to it fail.
+def test_bss_has_no_file_offset(sample_binary:Path) -> None:
+
+    elf = Elf(str(sample_binary), checksec=False)
+    bss = elf.get_section_by_name(".bss")
+    start, size = bss.header.sh_addr, bss.header.sh_size
+
+    for address in (start, start + size // 2, start + size - 1):
+        assert elf.get_section_containing(address).name == ".bss"
+        assert elf.vaddr_to_offset(address) is None
+    assert elf.read(start, size) == bytes(size)
+
+
+## Address and offset translation match checking every segment, around the edges of every segment.
+def test_translation_matches_segments(sample_binary:Path) -> None:
+
+    elf = MappedElf(str(sample_binary))
+    index = SectionIndex(elf)
+    segments = list(elf.iter_segments('PT_LOAD'))
+
+    for header in ( s.header for s in segments ):
+        for edge in (header.p_vaddr, header.p_vaddr + header.p_filesz, header.p_vaddr + header.p_memsz):
+            for address in range(edge - 2, edge + 3):
+                assert index.vaddr_to_offset(address) == brute_force_vaddr_to_offset(segments, address) == elf.vaddr_to_offset(address)
+        for edge in (header.p_offset, header.p_offset + header.p_filesz):
+            for offset in range(max(edge - 2, 0), edge + 3):
+                assert index.offset_to_vaddr(offset) == brute_force_offset_to_vaddr(segments, offset) == elf.offset_to_vaddr(offset)
+
+
+## Overlapping loaded segments translate through the segment that starts lowest; including past the end of a later,
+#  shorter, segment.
+def test_overlapping_segments() -> None:
+
+    segments = [
+        load_segment(0x1000, 0x0000, 0x3000),
+        load_segment(0x2000, 0x5000, 0x0800),
+        load_segment(0x10000, 0x0000, 0x0100),
+        load_segment(0x20000, 0x6000, 0x0000, 0x1000),
+    ]
+    index = SectionIndex(fake_elf([], segments))
+
+    assert index.vaddr_to_offset(0x2100) == 0x1100
+    assert index.vaddr_to_offset(0x2900) == 0x1900
+    assert index.vaddr_to_offset(0x10050) == 0x0050
+    assert index.vaddr_to_offset(0x20000) is None
+    assert index.offset_to_vaddr(0x0050) == 0x1050
+    assert index.offset_to_vaddr(0x5010) == 0x2010
+
+    for address in range(0x0f00, 0x21100, 0x10):
+        assert index.vaddr_to_offset(address) == brute_force_vaddr_to_offset(segments, address), f"0x{address:x}"
+    for offset in range(0, 0x7000, 0x10):
+        assert index.offset_to_vaddr(offset) == brute_force_offset_to_vaddr(segments, offset), f"0x{offset:x}"
+
+
+## Sections that do not occupy memory, are empty or are thread local `.tbss` templates are not indexed.
+def test_unindexed_sections() -> None:
+
+    alloc, tls = SH_FLAGS.SHF_ALLOC, SH_FLAGS.SHF_TLS
+    sections = [
+        header_only(".text", sh_addr=0x1000, sh_size=0x100, sh_flags=alloc, sh_type='SHT_PROGBITS'),
+        header_only(".empty", sh_addr=0x1100, sh_size=0, sh_flags=alloc, sh_type='SHT_PROGBITS'),
+        header_only(".tbss", sh_addr=0x1100, sh_size=0x10, sh_flags=alloc | tls, sh_type='SHT_NOBITS'),
+        header_only(".comment", sh_addr=0, sh_size=0x40, sh_flags=0, sh_type='SHT_PROGBITS'),
+        header_only(".bss", sh_addr=0x1100, sh_size=0x200, sh_flags=alloc, sh_type='SHT_NOBITS'),
+    ]
+    index = SectionIndex(fake_elf(sections, []))
+
+    assert [ s.name for s in index.sections_containing(0x1100) ] == [ ".bss" ]
+    assert [ s.name for s in index.sections_containing(0x10ff) ] == [ ".text" ]
+    assert index.sections_containing(0x20) == []
+    assert index.sections_containing(0x1300) == []
@@ -0,0 +1,111 @@
+# python imports
+from pathlib import Path
+
+# third-party imports
+import pytest
+
+# project imports
+from ebp.common.patch_process import Elf
+
+
+## Loads the sample program, with a few junk bytes and a data dependency in its `.text` section.
+#  @param path the path of the sample program.
+#  @returns the loaded program and its `.text` section.
+def load_sample(path:Path) -> tuple:
+    elf = Elf(str(path), checksec=False)
+    text = elf.get_section_by_name(".text")
+    for offset in range(0x10, 0x30):
+        elf.register_junk(text.header.sh_addr + offset)
+    elf.record_data_dependency(text.header.sh_addr + 0x40, 8, "sample dependency")
+    elf.write(text.header.sh_addr + 0x50, b"\xcc" * 4)
+    return elf, text
+
+
+## Gets everything a rolled back transaction must put back.
+#  @param elf the binary to take the state of.
+#  @param text the `.text` section of the binary.
+#  @returns a comparable snapshot of the binary and its manifest.
+def snapshot(elf:Elf, text) -> dict:
+    dependencies = elf.patch_manifest.data_dependencies
+    junk = elf.patch_manifest.junk_offsets
+    return {
+        "text": elf.read(text.header.sh_addr, text.header.sh_size),
+        "section-bytes": bytes(elf.section_bytes(text)),
+        "dirty-extents": list(elf.dirty_extents),
+        "data-dependencies": dependencies.to_json(),
+        "covered": list(dependencies.covered),
+        "sorted-start-addresses": list(dependencies.sorted_start_addresses),
+        "sorted-entries": list(dependencies.sorted_entries),
+        "longest": dependencies.longest,
+        "messages": list(dependencies.messages),
+        "junk-offsets": junk.to_json(),
+        "junk-positions": dict(junk.positions),
+    }
+
+
+## Makes changes of every kind the ELF journals.
+#  @param elf the binary to change.
+#  @param text the `.text` section of the binary.
+#  @param offset where in the `.text` section to make the changes.
+def make_changes(elf:Elf, text, offset:int) -> None:
+    address = text.header.sh_addr + offset
+    elf.write(address, b"\x90\x90\x90")
+    elf.write(address + 1, b"\xcc\xcc\xcc\xcc")
+    elf.register_junk(address + 0x40)
+    elf.assign_junk(0x41, "assigned junk")
+    elf.record_data_dependency(address + 0x10, 4, "tentative dependency")
+    elf.record_data_dependency(address + 0x30, 16, None)
+
+
+## Rolling back nested patches puts back the bytes, caches, dirty extents and manifest from before the outer patch.
+def test_rollback_restores_state(sample_copy:Path) -> None:
+
+    elf, text = load_sample(sample_copy)
+    elf.cache_volatile_regions(object(), [ (text.header.sh_addr + 0x60, text.header.sh_addr + 0x68) ])
+    before = snapshot(elf, text)
+
+    with elf.start_tentative_patch():
+        make_changes(elf, text, 0x60)
+        with elf.start_tentative_patch() as inner_patch:
+            make_changes(elf, text, 0x80)
+            inner_patch.confirm()
+        assert snapshot(elf, text) != before
+        assert elf.volatile_regions_cache is None
+
+    assert snapshot(elf, text) == before
+    assert elf.journal is None and not elf.journal_marks
+
+
+## Rolling back an inner patch keeps the changes the outer patch made before it.
+def test_inner_rollback_keeps_outer_changes(sample_copy:Path) -> None:
+
+    elf, text = load_sample(sample_copy)
+
+    with elf.start_tentative_patch() as outer_patch:
+        make_changes(elf, text, 0x60)
+        outer_state = snapshot(elf, text)
+        with elf.start_tentative_patch():
+            make_changes(elf, text, 0x80)
+        assert snapshot(elf, text) == outer_state
+        outer_patch.confirm()
+
+    assert snapshot(elf, text) == outer_state
+
+
+## Transactions must be closed innermost first.
+@pytest.mark.parametrize("close", [ Elf.commit_transaction, Elf.rollback_transaction ])
+def test_transactions_nest_strictly(sample_copy:Path, close) -> None:
+
+    elf, text = load_sample(sample_copy)
+
+    outer_mark = elf.begin_transaction()
+    elf.write(text.header.sh_addr + 0x60, b"\x90")
+    inner_mark = elf.begin_transaction()
+    elf.write(text.header.sh_addr + 0x61, b"\x90")
+
+    with pytest.raises(AssertionError):
+        close(elf, outer_mark)
+
+    elf.commit_transaction(inner_mark)
+    elf.rollback_transaction(outer_mark)
+    assert elf.journal is None
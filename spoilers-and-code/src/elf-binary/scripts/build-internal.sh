@@ -17,6 +17,9 @@ DEFINITION_ENVIRONMENT_VARIABLES=(                \
   "FLAG_MT_SEED_QWORD"                            \
   "FLAG_MASK_STRING"                              \
   "FLAG_RAW_VALUE"                                \
+  "HIDDEN_STRING_MT64"                            \
+  "INTEGRITY_HASH_WORDS"                          \
+  "ANNOTATION_TABLE"                              \
 )
 
 for DEFINITION_VARIABLE in "${DEFINITION_ENVIRONMENT_VARIABLES[@]}"
@@ -0,0 +1,34 @@
+#ifndef CVCTF_ANNOTATION_TABLE_H
+#define CVCTF_ANNOTATION_TABLE_H
+
+// = Annotation Table (`ANNOTATION_TABLE`)
+//
+// The post-build tools learn what needs patching from annotations the compiler leaves in the binary. By
+// default every annotation is placed in its own ELF section (`.protected-string-entry.*`, `.hash-patch.*`).
+// If `ANNOTATION_TABLE` is defined they are instead placed, as fixed-size records, in a single section:
+//   - the tooling reads every annotation with one read of one section.
+//   - the section header table no longer grows with every annotation.
+//
+// Every record starts with an `unsigned long` identifying what it describes; the rest of the record is
+// defined by the header for that type of annotation (see "integrity.h" and "protected-string.h").
+
+/// The name of the section that annotation records are placed in.
+#define ANNOTATION_TABLE_SECTION ".annotation-table"
+
+/// The size of every annotation record.
+//
+//  This fits the largest annotation (a hash patch entry) behind its type, and is a multiple of 32 so GCC's
+//  alignment of large objects never leaves a gap between records.
+#define ANNOTATION_TABLE_RECORD_SIZE 288
+
+/// Identifies a record describing an integrity hash patch (see `struct hash_patch_table_record`).
+#define ANNOTATION_HASH_PATCH 1
+
+/// Identifies a record describing a protected string (see `struct protected_string_table_record`).
+#define ANNOTATION_PROTECTED_STRING 2
+
+/// Declares a static variable `_` as a record in the annotation table.
+#define ANNOTATION_TABLE_RECORD \
+    static __attribute__( ( section(ANNOTATION_TABLE_SECTION), used, aligned(32) ) )
+
+#endif // CVCTF_ANNOTATION_TABLE_H
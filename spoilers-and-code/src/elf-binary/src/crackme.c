@@ -43,6 +43,18 @@
 #pragma message("FLAG_MASK_STRING was not defined - using default value - you'd want to use a real value for release.")
 #endif
 
+#ifdef HIDDEN_STRING_MT64 // hidden strings are masked with MT19937-64, seeded with the full QWORD seed.
+typedef MersenneTwister64 HiddenStringTwister;
+typedef unsigned long HiddenStringTwisterValue;
+#define create_hidden_string_twister(seed) create_mersenne_twister64(seed)
+#define next_hidden_string_twister_value(mt) next_mersenne_twister_uint64(mt)
+#else
+typedef MersenneTwister HiddenStringTwister;
+typedef unsigned int HiddenStringTwisterValue;
+#define create_hidden_string_twister(seed) create_mersenne_twister_long(seed)
+#define next_hidden_string_twister_value(mt) next_mersenne_twister_uint32(mt)
+#endif
+
 typedef struct crackme_state_
 {
   unsigned long integrity_hash;
@@ -53,13 +65,13 @@ typedef struct crackme_state_
 
 
 
-unsigned char next_password_character(unsigned int index, MersenneTwister* mt, unsigned int *current_mt_value, char* buffer, unsigned int buffer_size)
+unsigned char next_password_character(unsigned int index, HiddenStringTwister* mt, HiddenStringTwisterValue *current_mt_value, char* buffer, unsigned int buffer_size)
 {
-    if(index % 4 == 0)
+    if(index % sizeof(HiddenStringTwisterValue) == 0)
     {
-        *current_mt_value = next_mersenne_twister_uint32(mt);
+        *current_mt_value = next_hidden_string_twister_value(mt);
     } 
-    const unsigned char mt_char = ((char*)current_mt_value)[index % 4];
+    const unsigned char mt_char = ((char*)current_mt_value)[index % sizeof(HiddenStringTwisterValue)];
     const unsigned char buffer_char = buffer[index % buffer_size];
     unsigned char tmp = buffer_char ^ mt_char;
     return tmp;
@@ -72,11 +84,11 @@ unsigned long check_password(char* password_string, unsigned int password_size,
 
     if(buffer)
     {
-        MersenneTwister mt;
+        HiddenStringTwister mt;
             
         REQUIRES_INTEGRITY_XOR_TO_KNOWN(PRIMARY_INTEGRITY_CHAIN, IC_GATE_1, PASSWORD_MT_SEED_QWORD, {
             unsigned long seed = state->integrity_hash ^ XOR_MASK_FOR_KNOWN_VALUE;
-            mt = create_mersenne_twister_long(seed);
+            mt = create_hidden_string_twister(seed);
         })
 
         CONTAINS_INTEGRITY_HASH(PRIMARY_INTEGRITY_CHAIN, IC_GATE_2, {
@@ -86,7 +98,7 @@ unsigned long check_password(char* password_string, unsigned int password_size,
         ASSIGN_PROTECTED_STRING(buffer, PASSWORD_MASK_STRING);
 
         unsigned int i = 0;
-        unsigned int current_mt_value = 0;
+        HiddenStringTwisterValue current_mt_value = 0;
 
         // this loop checks the password one character at a time - it never holds the full string decrypted.
         // each character is XOR'd against the correct value in memory and deviation is recorded. 
@@ -118,7 +130,7 @@ void release_flag(crackme_state* state)
     if(buffer)
     {
 
-        MersenneTwister mt;
+        HiddenStringTwister mt;
 
         // increment integrity hash.
         CONTAINS_INTEGRITY_HASH(PRIMARY_INTEGRITY_CHAIN, IC_GATE_4, {
@@ -128,7 +140,7 @@ void release_flag(crackme_state* state)
         // create a mersenee twister with a known seed from integrity.
         REQUIRES_INTEGRITY_XOR_TO_KNOWN(PRIMARY_INTEGRITY_CHAIN, IC_GATE_4, FLAG_MT_SEED_QWORD, {
             unsigned long seed = state->integrity_hash ^ XOR_MASK_FOR_KNOWN_VALUE;
-            mt = create_mersenne_twister_long(seed);
+            mt = create_hidden_string_twister(seed);
         })
 
         // unpack the "here is the password" prefix into the output buffer.
@@ -139,7 +151,7 @@ void release_flag(crackme_state* state)
         ASSIGN_PROTECTED_STRING(flag_string, FLAG_MASK_STRING);
 
         unsigned int i = 0;
-        unsigned int current_mt_value = 0;
+        HiddenStringTwisterValue current_mt_value = 0;
     
         do
         {   // user the mersenne twister sequence as the second XOR source to "decrypt" the flag.
@@ -25,6 +25,28 @@ unsigned long murmur_oaat64(const unsigned char * data_buffer, unsigned long len
 }
 
 
+/// MurmurOOAT64 method (ish), eight bytes at a time - calculates the hash of the given data buffer.
+//  @param data_buffer a pointer to the data to caclulate a hash of.
+//  @param length the amount of data to hash from @p data_buffer.
+//  @param state the current state of the hash, or if the first buffer hashed can be used as a seed value.
+//  @returns the state of the hash after the given data buffer has been consumed - either use or feed back in as state.
+unsigned long murmur_oaat64_wordwise(const unsigned char * data_buffer, unsigned long length, unsigned long state)
+{
+    unsigned long i = 0;
+
+    for (; i + sizeof(unsigned long) <= length; i += sizeof(unsigned long)) {
+        unsigned long word;
+        // data is not necessarily aligned - this compiles to a single unaligned load.
+        __builtin_memcpy(&word, data_buffer + i, sizeof(word));
+        state ^= word;
+        state *= 0x5bd1e9955bd1e995;
+        state ^= state >> 47;
+    }
+
+    return murmur_oaat64(data_buffer + i, length - i, state);
+}
+
+
 /// Calculates a hash of this binaries "predictable" contents.
 //  @param state the state (or seed) used to initialise the hashing algorithm.
 //  @returns the hash of the fixed content of the binary.
@@ -42,17 +64,24 @@ unsigned long calculate_binary_hash(unsigned long state, MemoryPool* memory_pool
             
             char* virtual_memory_ptr;
 
-            // ARRAY_SETUP_SIZE is has +2 to account for the end of memory and STOP entries
+            // ARRAY_SETUP_ENTRIES is has +2 to account for the end of memory and STOP entries
             //   which are added to the end of the array; assignments look like:
             //  c7 43 7f 44 33 22 11           mov    dword [rbx+0x7f],0x11223344 - 7 bytes
-            #define ARRAY_SETUP_SIZE ( NUMBER_OF_VOLATILE_QWORDS + 2) * 7
+            #define ARRAY_SETUP_ENTRIES ( NUMBER_OF_VOLATILE_QWORDS + 2 )
+
+            // the imm8 offset reaches 32 entries; larger arrays move RBX into the array first, which
+            //   reaches 64 entries, and then again for every further 64 entries:
+            //  48 83 c3 7f                    add    rbx,0x7f - 4 bytes
+            //  48 81 c3 00 01 00 00           add    rbx,0x100 - 7 bytes
+            #define ARRAY_SETUP_SIZE ( ( ARRAY_SETUP_ENTRIES * 7 ) + \
+                ( ARRAY_SETUP_ENTRIES > 32 ? 4 + ( ( ARRAY_SETUP_ENTRIES - 1 ) / 64 ) * 7 : 0 ) )
 
             // The number of bytes required to assign the RAX register to the start of VMA
             //   48 8d 1d f9 ff ff ff          lea    rbx,[rip+0xfffffffffffffff9]
             #define ASSIGN_VIRTUAL_MEMORY_PTR_SIZE 7
 
             // The number of bytes required to patch the generator configuration.
-            #define PATCH_SIZE ARRAY_SETUP_SIZE + ASSIGN_VIRTUAL_MEMORY_PTR_SIZE
+            #define PATCH_SIZE ( ARRAY_SETUP_SIZE + ASSIGN_VIRTUAL_MEMORY_PTR_SIZE )
 
 
             // reserve space in .text to patch generator - we need to build the volatile offsets array
@@ -70,7 +99,7 @@ unsigned long calculate_binary_hash(unsigned long state, MemoryPool* memory_pool
 
             while(*data_length != (unsigned int) -1)
             {
-                state = murmur_oaat64(virtual_memory_ptr, *data_length, state);
+                state = integrity_hash_buffer(virtual_memory_ptr, *data_length, state);
                 virtual_memory_ptr += (*data_length + sizeof(unsigned long));
                 data_length++;
             }
@@ -2,6 +2,7 @@
 #define CVCTF_INTEGRITY_H
 
     #include "memory.h"
+    #include "annotation-table.h"
 
     /// The number of qwords that cannot be signed that are in the software.
     //  Post build tooling will complain if this is not correct and tell you what it should be.
@@ -29,6 +30,23 @@
     #define EXPECTED_MURMUR_HASH 0xfea75ba5e64b10b5
 
 
+    /// Identifies the byte-at-a-time integrity hash (`murmur_oaat64`) in a generators annotation.
+    #define INTEGRITY_HASH_BYTEWISE 0
+
+    /// Identifies the eight-bytes-at-a-time integrity hash (`murmur_oaat64_wordwise`) in a generators annotation.
+    #define INTEGRITY_HASH_WORDWISE 1
+
+    /// The hash the integrity generator walks the binary with.
+    //  Define INTEGRITY_HASH_WORDS to use the wordwise hash; the post build tool reads which was chosen from the generators annotation.
+    #ifdef INTEGRITY_HASH_WORDS
+    #define INTEGRITY_HASH_ALGORITHM INTEGRITY_HASH_WORDWISE
+    #define integrity_hash_buffer(data_buffer, length, state) murmur_oaat64_wordwise(data_buffer, length, state)
+    #else
+    #define INTEGRITY_HASH_ALGORITHM INTEGRITY_HASH_BYTEWISE
+    #define integrity_hash_buffer(data_buffer, length, state) murmur_oaat64(data_buffer, length, state)
+    #endif
+
+
     /// The prefix used for sections that record the location of regions that need an integrity hash injected.
     // 
     //  The post-build tool will look for this prefix to determine what work it needs to do when patching the binary.
@@ -65,6 +83,16 @@
         char buffer_value_and_sequence_id[];
     };
 
+    /// Structure used to store meta data for a HASH_GENERATOR section descriptor
+    struct __attribute__((__packed__)) _hash_generator
+    {
+        /// The number of volatile QWORDS space was reserved for (see NUMBER_OF_VOLATILE_QWORDS).
+        unsigned long volatile_qwords;
+
+        /// The hash the generator walks the binary with (INTEGRITY_HASH_BYTEWISE or INTEGRITY_HASH_WORDWISE).
+        unsigned long hash_algorithm;
+    };
+
     /// Union that stores meta information about a hash patch entry.
     union _hash_patch_section_entry_meta
     {
@@ -76,6 +104,9 @@
 
         struct _known_murmur_hash known_murmur_hash;
 
+        /// Used by HASH_GENERATOR to describe the generator.
+        struct _hash_generator hash_generator;
+
     };
 
 
@@ -110,6 +141,22 @@
         union _hash_patch_section_entry_meta meta;
     };
 
+
+    /// Structure of a hash patch annotation table record.
+    //
+    //  Used in place of a `hash_patch_section_entry` section when `ANNOTATION_TABLE` is defined; see "annotation-table.h".
+    struct hash_patch_table_record
+    {
+        /// The type of annotation this record describes (always ANNOTATION_HASH_PATCH).
+        unsigned long   annotation_type;
+
+        /// The hash patch entry this record describes.
+        struct hash_patch_section_entry entry;
+    };
+
+    _Static_assert(sizeof(struct hash_patch_table_record) == ANNOTATION_TABLE_RECORD_SIZE,
+        "hash patch table records must be ANNOTATION_TABLE_RECORD_SIZE bytes.");
+
     
     
 
@@ -152,24 +199,33 @@
     //  to contain the relevant code, and an integer that describes what is there. The meta information section is more loose and 
     //  its contents will depend entirely on the type of component prensent. Each XXX implementation handles a different type of META.
 
+    /// Declares the static variable that holds a "hash patch" annotation, initialised from the given `hash_patch_section_entry` fields.
+    #ifndef ANNOTATION_TABLE
+    #define DECLARE_HASH_PATCH_ANNOTATION(...)                                                              \
+        static __attribute__( ( section(HASH_PATCH_PREFIX "." __FILE__ ":"  INDIRECT(__LINE__)) ) )         \
+        struct hash_patch_section_entry _ = { __VA_ARGS__ }
+    #else // ANNOTATION_TABLE - record the annotation in the annotation table instead; see "annotation-table.h".
+    #define DECLARE_HASH_PATCH_ANNOTATION(...)                                                              \
+        ANNOTATION_TABLE_RECORD                                                                             \
+        struct hash_patch_table_record _ = { .annotation_type = ANNOTATION_HASH_PATCH, .entry = { __VA_ARGS__ } }
+    #endif // ANNOTATION_TABLE
+
     /// Creates a "hash patch" annotation with a raw data meta section.
     #define ANNOTATE_HASH_PATCH__RAW(IVID, ACTION_OR_SEEDING, META)                                         \
         {                                                                                                   \
-            static __attribute__( ( section(HASH_PATCH_PREFIX "." __FILE__ ":"  INDIRECT(__LINE__)) ) )     \
-            struct hash_patch_section_entry _ = {                                                           \
+            DECLARE_HASH_PATCH_ANNOTATION(                                                                  \
                 .start_of_entry = &&START_HASH_PATCH_ANNOTATION_NAME(IVID),                                 \
                 .end_of_entry = &&END_HASH_PATCH_ANNOTATION_NAME(IVID),                                     \
                 .hash_action = ACTION_OR_SEEDING,                                                           \
                 .meta={ .raw = META }                                                                       \
-            };                                                                                              \
+            );                                                                                              \
         }        
         
 
     /// Creates a "hash patch" annotation with an XOR_TO_KNOWN data meta section.
     #define ANNOTATE_HASH_PATCH__XOR_TO_KNOWN(IVID, SEQUENCE_ID, SEEDING, REQUIRED_KNOWN)                   \
         {                                                                                                   \
-            static __attribute__( ( section(HASH_PATCH_PREFIX "." __FILE__ ":"  INDIRECT(__LINE__)) ) )     \
-            struct hash_patch_section_entry _ = {                                                           \
+            DECLARE_HASH_PATCH_ANNOTATION(                                                                  \
                 .start_of_entry = &&START_HASH_PATCH_ANNOTATION_NAME(IVID),                                 \
                 .end_of_entry = &&END_HASH_PATCH_ANNOTATION_NAME(IVID),                                     \
                 .hash_action = XOR_TO_KNOWN,                                                                \
@@ -178,15 +234,14 @@
                     .required_value=REQUIRED_KNOWN,                                                         \
                     .sequence_id=SEQUENCE_ID                                                                \
                 }}                                                                                          \
-            };                                                                                              \
+            );                                                                                              \
         }
 
 
     /// Creates a "hash patch" annotation with an INSERT_MURMUR data meta section.
     #define ANNOTATE_HASH_PATCH__INSERT_MURMUR(IVID, SEQUENCE_ID, SEEDING, REQUIRED_KNOWN)                  \
         {                                                                                                   \
-            static __attribute__( ( section(HASH_PATCH_PREFIX "." __FILE__ ":"  INDIRECT(__LINE__)) ) )     \
-            struct hash_patch_section_entry _ = {                                                           \
+            DECLARE_HASH_PATCH_ANNOTATION(                                                                  \
                 .start_of_entry = &&START_HASH_PATCH_ANNOTATION_NAME(IVID),                                 \
                 .end_of_entry = &&END_HASH_PATCH_ANNOTATION_NAME(IVID),                                     \
                 .hash_action = INSERT_MURMUR,                                                               \
@@ -195,7 +250,22 @@
                     .size_of_data=sizeof(REQUIRED_KNOWN) -1,                                                \
                     .buffer_value_and_sequence_id = REQUIRED_KNOWN SEQUENCE_ID                              \
                 }}                                                                                          \
-            };                                                                                              \
+            );                                                                                              \
+        }
+
+
+    /// Creates a "hash patch" annotation with a HASH_GENERATOR data meta section.
+    #define ANNOTATE_HASH_PATCH__GENERATOR(IVID, VOLATILE_QWORDS)                                          \
+        {                                                                                                   \
+            DECLARE_HASH_PATCH_ANNOTATION(                                                                  \
+                .start_of_entry = &&START_HASH_PATCH_ANNOTATION_NAME(IVID),                                 \
+                .end_of_entry = &&END_HASH_PATCH_ANNOTATION_NAME(IVID),                                     \
+                .hash_action = HASH_GENERATOR,                                                              \
+                .meta = { .hash_generator = {                                                               \
+                    .volatile_qwords=VOLATILE_QWORDS,                                                       \
+                    .hash_algorithm=INTEGRITY_HASH_ALGORITHM                                                \
+                }}                                                                                          \
+            );                                                                                              \
         }
 
 
@@ -227,7 +297,14 @@
     /// Macro that marks a piece of code that contains a "hash generator" the code that generates integrity hashes.
     //  A post build process tool will patch this to include information about memory and volatile qwords in the software.
     #define CONTAINS_INTEGRITY_GENERATOR(NUMBER_OF_VOLATILE_QWORDS, ...) \
-        INSERT_HASH_PATCH__RAW(__COUNTER__, HASH_GENERATOR, NUMBER_OF_VOLATILE_QWORDS, __VA_ARGS__)
+        INSERT_HASH_PATCH__GENERATOR(__COUNTER__, NUMBER_OF_VOLATILE_QWORDS, __VA_ARGS__)
+
+    /// Inserts a "hash generator" region.
+    //  This basically does all the work CONTAINS_INTEGRITY_GENERATOR says its going to do - the indirection is required to
+    //  allow propogation / multiple use of the __COUNTER__ value.
+    #define INSERT_HASH_PATCH__GENERATOR(IVID, VOLATILE_QWORDS, ...)        \
+        ANNOTATE_HASH_PATCH__GENERATOR(IVID, VOLATILE_QWORDS)           \
+        INSERT_MARKED_CODE_REGION(IVID, __VA_ARGS__)
         
 
     /// Inserts a "hash patch" region.
@@ -273,6 +350,14 @@
     //  @returns the state of the hash after the given data buffer has been consumed - either use or feed back in as state.
     unsigned long murmur_oaat64(const unsigned char * data_buffer, unsigned long length, unsigned long state);
 
+    /// MurmurOOAT64 method (ish), eight bytes at a time - calculates the hash of the given data buffer.
+    //  Mixes each little endian QWORD of the buffer into the state in one round, then any remaining bytes one at a time.
+    //  @param data_buffer a pointer to the data to caclulate a hash of.
+    //  @param length the amount of data to hash from @p data_buffer.
+    //  @param state the current state of the hash, or if the first buffer hashed can be used as a seed value.
+    //  @returns the state of the hash after the given data buffer has been consumed - either use or feed back in as state.
+    unsigned long murmur_oaat64_wordwise(const unsigned char * data_buffer, unsigned long length, unsigned long state);
+
     /// Calculates a hash of this binaries "predictable" contents.
     //  @param state the state (or seed) used to initialise the hashing algorithm.
     //  @param memory_pool the memory pool to use to allocate dynamic memory.
@@ -25,6 +25,8 @@
 // described behaviour with a simple `strcpy()` of the intended value instead.
 #ifndef WNOPROTECTED_STRINGS
 
+    #include "annotation-table.h"
+
     /// Calculates the length of a string.
     #define STRLEN(STR) (sizeof(STR) )
 
@@ -60,6 +62,31 @@
         char            expected_string[];
     };
 
+    /// Structure of a protected string annotation table record.
+    ///
+    /// Holds the same information as `protected_string_section_entry` when `ANNOTATION_TABLE` is defined; see
+    /// "annotation-table.h". The string is stored in a fixed size buffer so that every record is the same size.
+    struct protected_string_table_record
+    {
+        /// The type of annotation this record describes (always ANNOTATION_PROTECTED_STRING).
+        unsigned long   annotation_type;
+
+        /// The VMA where bytes have been reserved to build a string.
+        void*           reservation_virtual_memory_address;
+
+        /// The number of bytes that has been reserved build the string.
+        unsigned int    reservation_size;
+
+        /// The number of bytes of `expected_string` that are in use (including the NUL terminator).
+        unsigned int    expected_string_size;
+
+        /// The string that we wanted to be built at this location.
+        char            expected_string[ANNOTATION_TABLE_RECORD_SIZE - 24];
+    };
+
+    _Static_assert(sizeof(struct protected_string_table_record) == ANNOTATION_TABLE_RECORD_SIZE, 
+        "protected string table records must be ANNOTATION_TABLE_RECORD_SIZE bytes.");
+
     /// The number of bytes to reserve as general overhead for building a protected string.
     ///
     /// See `PROTECTED_STRING_RESERVE_SIZE` for more information.
@@ -92,6 +119,7 @@
     ///
     /// @note; the semi-colon after the label is important - its not an oversight. GCC doesn't allow labels in some locations; the
     ///   semi colon below creates an empty statement that GCC is always happy allow to be labelled.
+    #ifndef ANNOTATION_TABLE
     #define ANNOTATE_PROTECTED_STRING(PSID, STR)                                                                                \
         {                                                                                                                       \
             static __attribute__( ( section(PROTECTED_STRING_ANNOTATION_PREFIX "." __FILE__ ":"  INDIRECT(__LINE__)) ) )        \
@@ -103,6 +131,24 @@
             PROTECTED_STRING_ANNOTATION_NAME(PSID): ; /* do not remove semi-colon; see comment above */                         \
         }                                                                                                                       \
 
+    #else // ANNOTATION_TABLE - record the annotation in the annotation table instead; see "annotation-table.h".
+    #define ANNOTATE_PROTECTED_STRING(PSID, STR)                                                                                \
+        {                                                                                                                       \
+            _Static_assert(sizeof(STR) <= sizeof(((struct protected_string_table_record*) 0)->expected_string),                 \
+                "protected string is too long for an annotation table record.");                                                \
+            ANNOTATION_TABLE_RECORD                                                                                             \
+                struct protected_string_table_record _ = {                                                                      \
+                    .annotation_type                    = ANNOTATION_PROTECTED_STRING,                                          \
+                    .reservation_virtual_memory_address = &&PROTECTED_STRING_ANNOTATION_NAME(PSID),                             \
+                    .reservation_size                   = PROTECTED_STRING_RESERVE_SIZE(STR),                                   \
+                    .expected_string_size               = sizeof(STR),                                                          \
+                    .expected_string                    = STR                                                                   \
+                };                                                                                                              \
+            PROTECTED_STRING_ANNOTATION_NAME(PSID): ; /* do not remove semi-colon; see comment above */                         \
+        }                                                                                                                       \
+
+    #endif // ANNOTATION_TABLE
+
     /// Reserves space for assigning the specified `STR` into the memory pointed at by `VARNAME`.
     ///
     /// Uses inline ASM to achieve two things - it _"reserves"_ an appropriate amount of code space to inject the ASM later that
@@ -2,8 +2,7 @@
 
 
 /// The size of a word in bits
-//  @remarks could consider using 64 in future - see MT19937-64 on wikipedia.
-//     to relevant parameters - would also need to change internal data types.
+//  @remarks see `MersenneTwister64` for the MT19937-64 variant.
 #define WORD_SIZE           (32)
 
 /// Masks to ensure generated values fit in word size.
@@ -57,6 +56,44 @@
 
 
 
+/// MT19937-64 'a' component
+#define MT19937_64_A (0xB5026F5AA96619E9UL)
+
+/// MT19937-64 'b' component
+#define MT19937_64_B (0x71D67FFFEDA60000UL)
+
+/// MT19937-64 'c' component
+#define MT19937_64_C (0xFFF7EEE000000000UL)
+
+/// MT19937-64 'd' component
+#define MT19937_64_D (0x5555555555555555UL)
+
+/// MT19937-64 'f' component
+#define MT19937_64_F (0x5851F42D4C957F2DUL)
+
+/// MT19937-64 'l' component
+#define MT19937_64_L (43)
+
+/// MT19937-64 'm' component
+#define MT19937_64_M (156)
+
+/// MT19937-64 's' component
+#define MT19937_64_S (17)
+
+/// MT19937-64 't' component
+#define MT19937_64_T (37)
+
+/// MT19937-64 'u' component
+#define MT19937_64_U (29)
+
+/// The most signficant 33 bits of a MT19937-64 word.
+#define BITMASK_64B_UPPER   (0xFFFFFFFF80000000UL)
+
+/// The least signficant 31 bits of a MT19937-64 word.
+#define BITMASK_64B_LOWER   (0x000000007FFFFFFFUL)
+
+
+
 /// Creates a new PRNG state initialised from the given seed.
 //  @param seed the seed value to use to initialise the PRNG state.
 //  @returns a new PRNG state that can be used to generate random numbers.
@@ -128,4 +165,66 @@ unsigned int next_mersenne_twister_uint32(MersenneTwister* mersenne_twister)
   
   return y & WORD_MASK;
 
-}
\ No newline at end of file
+}
+
+
+
+/// Creates a new 64-bit PRNG state initialised from the given seed.
+//  Unlike @ref create_mersenne_twister_long the full 64-bits of the seed are used.
+//  @param seed the seed value to use to initialise the PRNG state.
+//  @returns a new PRNG state that can be used to generate random numbers.
+MersenneTwister64 create_mersenne_twister64(unsigned long seed) {
+
+  MersenneTwister64 mersenne_twister;
+
+  mersenne_twister.state[0] = seed;
+
+  for(mersenne_twister.index=1; mersenne_twister.index < MT19937_64_STATE_SIZE; mersenne_twister.index++) {
+    unsigned long v = mersenne_twister.state[mersenne_twister.index-1];
+    mersenne_twister.state[mersenne_twister.index] = MT19937_64_F * (v ^ (v >> 62)) + mersenne_twister.index;
+  }
+
+  return mersenne_twister;
+
+}
+
+
+/// "Twist" internal 64-bit state
+//  Progresses the internal state when all current values have been consumed.
+//  @param mersenne_twister the PRNG to advance the state of.
+void _twist64(MersenneTwister64* mersenne_twister)
+{  
+    for(unsigned int index=0; index < MT19937_64_STATE_SIZE; index++) 
+    {
+        unsigned int next_index = (index + 1) % MT19937_64_STATE_SIZE;
+        unsigned int take_index = (index + MT19937_64_M) % MT19937_64_STATE_SIZE;
+        
+        unsigned long x = (mersenne_twister->state[index] & BITMASK_64B_UPPER) | 
+                (mersenne_twister->state[next_index] & BITMASK_64B_LOWER);
+
+        unsigned long xA = x >> 1;
+        
+        mersenne_twister->state[index] = mersenne_twister->state[take_index] ^ ((x % 2) ? xA ^ MT19937_64_A : xA);
+    }
+
+    mersenne_twister->index = 0;
+}
+
+
+/// Generates the next unsigned 64bit number in the PRNGs sequence.
+//  @param mersenne_twister the state to use to generate the next number.
+//  @returns the next number from the PRNG's random sequence.
+unsigned long next_mersenne_twister_uint64(MersenneTwister64* mersenne_twister) 
+{
+  if(mersenne_twister->index >= MT19937_64_STATE_SIZE) 
+    _twist64(mersenne_twister);
+
+  unsigned long y = mersenne_twister->state[mersenne_twister->index++];
+  y ^= (y >> MT19937_64_U) & MT19937_64_D;
+  y ^= (y << MT19937_64_S) & MT19937_64_B;
+  y ^= (y << MT19937_64_T) & MT19937_64_C;
+  y ^= (y >> MT19937_64_L);
+  
+  return y;
+
+}
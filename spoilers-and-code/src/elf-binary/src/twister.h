@@ -30,6 +30,23 @@ typedef struct _MersenneTwister {
 } MersenneTwister;
 
 
+/// The size of the internal 64-bit PRNG's state 
+//  "n: degree of recurrence" in documentation (MT19937-64).
+#define MT19937_64_STATE_SIZE  312
+
+
+/// Mersenne twister PRNG state (MT19937-64)
+typedef struct _MersenneTwister64 {
+
+  /// Internal state
+  unsigned long state[MT19937_64_STATE_SIZE];
+
+  /// Offset/index into state.
+  signed int index;
+
+} MersenneTwister64;
+
+
 /// Creates a new PRNG state initialised from the given seed.
 //  @param seed the seed value to use to initialise the PRNG state.
 //  @returns a new PRNG state that can be used to generate random numbers.
@@ -50,4 +67,17 @@ MersenneTwister create_mersenne_twister_long(unsigned long seed);
 unsigned int next_mersenne_twister_uint32(MersenneTwister* mersenne_twister);
 
 
+/// Creates a new 64-bit PRNG state initialised from the given seed.
+//  Unlike @ref create_mersenne_twister_long the full 64-bits of the seed are used.
+//  @param seed the seed value to use to initialise the PRNG state.
+//  @returns a new PRNG state that can be used to generate random numbers.
+MersenneTwister64 create_mersenne_twister64(unsigned long seed);
+
+
+/// Generates the next unsigned 64bit number in the PRNGs sequence.
+//  @param mersenne_twister the state to use to generate the next number.
+//  @returns the next number from the PRNG's random sequence.
+unsigned long next_mersenne_twister_uint64(MersenneTwister64* mersenne_twister);
+
+
 #endif // CVCTF_TWISTER_H
\ No newline at end of file